@@ -1,11 +1,20 @@
 from flask import Flask
 from app.config import TestingConfig, DevelopmentConfig, ProductionConfig
 from app.utils.extensions import db, migrate
+from app.utils.identity_cache import identity_cache
+from app.utils.response_cache import response_cache
 from app.models import *  # noqa: F401,F403
 from app.routes.auth_routes import auth_bp
 from app.routes.user_routes import user_bp
 from app.routes.product_routes import product_bp
 from app.routes.category_routes import category_bp
+from app.routes.seller_routes import seller_bp
+from app.routes.cart_routes import cart_bp
+from app.routes.order_routes import order_bp
+from app.routes.wallet_routes import wallet_bp
+from app.services.job_service import job_worker
+from app.services.outbox_service import outbox_worker
+from app.cli import register_commands
 
 
 def create_app(config_class=ProductionConfig):
@@ -15,11 +24,22 @@ def create_app(config_class=ProductionConfig):
     # Initialize extensions
     db.init_app(app)
     migrate.init_app(app, db)
+    identity_cache.init_app(app)
+    response_cache.init_app(app)
+    outbox_worker.init_app(app)
+    job_worker.init_app(app)
 
     # Register blueprints
     app.register_blueprint(auth_bp)
     app.register_blueprint(user_bp)
     app.register_blueprint(product_bp)
     app.register_blueprint(category_bp)
+    app.register_blueprint(seller_bp)
+    app.register_blueprint(cart_bp)
+    app.register_blueprint(order_bp)
+    app.register_blueprint(wallet_bp)
+
+    # Register CLI commands
+    register_commands(app)
 
     return app
@@ -0,0 +1,216 @@
+import json
+import logging
+import time
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.services.category_service import CategoryService
+from app.services.job_service import JobService, job_worker
+from app.services.outbox_service import OutboxService
+from app.services.rating_service import RatingService
+from app.services.reservation_service import ReservationService
+from app.services.sales_service import SalesService
+from app.services.search_service import SearchService
+from app.services.wallet_service import WalletService
+from app.utils.extensions import db
+from app.utils.query_plans import check_query_plans
+
+logger = logging.getLogger(__name__)
+
+outbox_cli = AppGroup("outbox", help="Kelola outbox event (kompensasi Supabase, dll.)")
+
+
+@outbox_cli.command("process")
+@click.option("--limit", default=100, help="Jumlah maksimum event yang diproses")
+def process_outbox(limit):
+    """Memproses event outbox yang sudah jatuh tempo satu kali"""
+    processed = OutboxService.process_due(limit=limit)
+    click.echo(f"{processed} event diproses")
+
+
+@outbox_cli.command("worker")
+@click.option("--interval", default=5, help="Jeda polling (detik)")
+def run_outbox_worker(interval):
+    """Menjalankan worker outbox di foreground"""
+    while True:
+        try:
+            while OutboxService.process_due() > 0:
+                pass
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            logger.warning("Gagal memproses outbox: %s", e)
+        time.sleep(interval)
+
+
+@outbox_cli.command("stats")
+def outbox_stats():
+    """Menampilkan jumlah event per status"""
+    click.echo(json.dumps(OutboxService.stats(), indent=2))
+
+
+jobs_cli = AppGroup("jobs", help="Kelola antrian job background")
+
+
+@jobs_cli.command("process")
+@click.option("--limit", default=100, help="Jumlah maksimum job yang dijalankan")
+def process_jobs(limit):
+    """Menjalankan job yang sudah jatuh tempo satu kali"""
+    processed = JobService.process_due(limit=limit)
+    click.echo(f"{processed} job dijalankan")
+
+
+@jobs_cli.command("worker")
+@click.option("--threads", default=None, type=int, help="Jumlah thread (default JOB_WORKER_THREADS)")
+@click.option("--interval", default=None, type=float, help="Jeda polling (detik)")
+def run_job_worker(threads, interval):
+    """Menjalankan worker job di foreground"""
+    job_worker.run(threads=threads, poll_seconds=interval)
+
+
+@jobs_cli.command("stats")
+def job_stats():
+    """Menampilkan kedalaman antrian dan latensi job"""
+    click.echo(json.dumps(JobService.stats(), indent=2))
+
+
+@jobs_cli.command("purge")
+@click.option("--days", default=7, help="Hapus job selesai yang lebih lama dari ini (hari)")
+def purge_jobs(days):
+    """Menghapus job done/failed yang sudah lama"""
+    deleted = JobService.purge(days=days)
+    click.echo(f"{deleted} job dihapus")
+
+
+search_cli = AppGroup("search", help="Kelola index pencarian produk")
+
+
+@search_cli.command("rebuild")
+@click.option("--batch-size", default=1000, help="Jumlah produk per batch")
+def rebuild_search_index(batch_size):
+    """Membuat index pencarian (jika belum ada) dan mengindeks ulang semua produk"""
+    indexed = SearchService.rebuild_index(batch_size=batch_size)
+    click.echo(f"{indexed} produk diindeks")
+
+
+category_cli = AppGroup("categories", help="Kelola data kategori")
+
+
+@category_cli.command("recount")
+def recount_category_products():
+    """Menghitung ulang product_count semua kategori dari tabel produk"""
+    updated = CategoryService.recount_products()
+    db.session.commit()
+    click.echo(f"{updated} kategori dihitung ulang")
+
+
+rating_cli = AppGroup("ratings", help="Kelola agregat rating produk")
+
+
+@rating_cli.command("recompute")
+@click.option("--batch-size", default=1000, help="Jumlah produk per batch")
+def recompute_rating_aggregates(batch_size):
+    """Menghitung ulang rata-rata, jumlah, dan histogram rating semua produk"""
+    updated = RatingService.recompute_aggregates(batch_size=batch_size)
+    click.echo(f"{updated} produk dihitung ulang")
+
+
+stock_cli = AppGroup("stock", help="Kelola hold stok produk")
+
+
+@stock_cli.command("sweep")
+@click.option("--batch-size", default=500, help="Jumlah hold per transaksi")
+def sweep_stock_holds(batch_size):
+    """Melepas hold stok yang sudah kedaluwarsa satu kali"""
+    released = ReservationService.sweep_expired(batch_size=batch_size)
+    click.echo(f"{released} hold stok dilepas")
+
+
+@stock_cli.command("sweeper")
+@click.option("--interval", default=30, help="Jeda antar sweep (detik)")
+def run_stock_sweeper(interval):
+    """Menjalankan sweeper hold stok di foreground"""
+    while True:
+        try:
+            ReservationService.sweep_expired()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            logger.warning("Gagal melepas hold stok: %s", e)
+        time.sleep(interval)
+
+
+sales_cli = AppGroup("sales", help="Kelola rollup penjualan seller")
+
+
+@sales_cli.command("rebuild")
+@click.option("--seller-id", type=int, multiple=True, help="Hanya seller tertentu (bisa diulang)")
+@click.option("--batch-size", default=100, help="Jumlah seller per transaksi")
+def rebuild_sales_rollups(seller_id, batch_size):
+    """Menghitung ulang rollup penjualan harian seller dari tabel order"""
+    rebuilt = SalesService.rebuild(seller_ids=seller_id or None, batch_size=batch_size)
+    click.echo(f"{rebuilt} seller dihitung ulang")
+
+
+wallet_cli = AppGroup("wallets", help="Kelola ledger wallet")
+
+
+@wallet_cli.command("snapshot")
+@click.option("--batch-size", default=500, help="Jumlah wallet per transaksi")
+def snapshot_wallets(batch_size):
+    """Menyimpan snapshot saldo wallet yang berubah sejak snapshot terakhir"""
+    created = WalletService.take_snapshots(batch_size=batch_size)
+    click.echo(f"{created} snapshot wallet dibuat")
+
+
+@wallet_cli.command("rollup")
+@click.option("--batch-size", default=200, help="Jumlah wallet per transaksi")
+def rebuild_wallet_rollups(batch_size):
+    """Menghitung ulang rollup bulanan transaksi wallet dari riwayat transaksi"""
+    rebuilt = WalletService.rebuild_monthly_totals(batch_size=batch_size)
+    click.echo(f"{rebuilt} wallet dihitung ulang")
+
+
+@wallet_cli.command("audit")
+@click.argument("user_id", type=int)
+def audit_wallet(user_id):
+    """Memeriksa saldo wallet user terhadap ledger sejak snapshot terakhir"""
+    result = WalletService.audit(user_id)
+    if result is None:
+        raise click.ClickException(f"User {user_id} tidak punya wallet")
+    click.echo(json.dumps(result, indent=2))
+    if not result["ok"]:
+        raise click.ClickException("Saldo wallet tidak cocok dengan ledger")
+
+
+query_plan_cli = AppGroup("query-plans", help="Periksa query plan untuk query panas")
+
+
+@query_plan_cli.command("check")
+@click.option("--verbose", is_flag=True, help="Tampilkan plan lengkap setiap query")
+def check_plans(verbose):
+    """Menjalankan EXPLAIN untuk query panas, gagal jika ada sequential scan"""
+    results = check_query_plans()
+    for result in results:
+        click.echo(f"[{'OK' if result.ok else 'SEQ SCAN'}] {result.name}")
+        for line in result.plan if verbose else result.sequential_scans:
+            click.echo(f"    {line}")
+
+    failed = [result.name for result in results if not result.ok]
+    if failed:
+        raise click.ClickException(
+            f"{len(failed)} query memakai sequential scan: {', '.join(failed)}"
+        )
+    click.echo(f"{len(results)} query plan OK")
+
+
+def register_commands(app):
+    app.cli.add_command(outbox_cli)
+    app.cli.add_command(jobs_cli)
+    app.cli.add_command(search_cli)
+    app.cli.add_command(category_cli)
+    app.cli.add_command(rating_cli)
+    app.cli.add_command(stock_cli)
+    app.cli.add_command(sales_cli)
+    app.cli.add_command(wallet_cli)
+    app.cli.add_command(query_plan_cli)
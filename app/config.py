@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -8,6 +9,58 @@ class Config:
     SECRET_KEY = os.environ.get("SECRET_KEY") or "hard-to-guess-string"
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # Verifikasi access token Supabase: "local" (JWT diverifikasi di server ini)
+    # atau "remote" (selalu memanggil auth.get_user ke Supabase)
+    SUPABASE_JWT_VERIFICATION = os.environ.get("SUPABASE_JWT_VERIFICATION") or "local"
+    SUPABASE_JWT_SECRET = os.environ.get("SUPABASE_JWT_SECRET")
+    SUPABASE_JWT_AUDIENCE = os.environ.get("SUPABASE_JWT_AUDIENCE") or "authenticated"
+    SUPABASE_JWKS_URL = os.environ.get("SUPABASE_JWKS_URL")
+    SUPABASE_JWKS_REFRESH_SECONDS = int(
+        os.environ.get("SUPABASE_JWKS_REFRESH_SECONDS") or 600
+    )
+
+    # Cache identitas user per worker (lihat app/utils/identity_cache.py)
+    IDENTITY_CACHE_MAX_SIZE = int(os.environ.get("IDENTITY_CACHE_MAX_SIZE") or 10000)
+    IDENTITY_CACHE_TTL_SECONDS = int(
+        os.environ.get("IDENTITY_CACHE_TTL_SECONDS") or 300
+    )
+
+    # Admin API Supabase Auth: "supabase" atau "local" (stand-in untuk testing)
+    AUTH_ADMIN_BACKEND = os.environ.get("AUTH_ADMIN_BACKEND") or "supabase"
+
+    # Worker outbox di dalam proses web (alternatif: `flask outbox worker`)
+    OUTBOX_WORKER_ENABLED = (os.environ.get("OUTBOX_WORKER_ENABLED") or "true") == "true"
+    OUTBOX_POLL_SECONDS = int(os.environ.get("OUTBOX_POLL_SECONDS") or 5)
+
+    # Worker job background di dalam proses web (alternatif: `flask jobs worker`)
+    JOB_WORKER_ENABLED = (os.environ.get("JOB_WORKER_ENABLED") or "true") == "true"
+    # Thread yang menjalankan job per proses
+    JOB_WORKER_THREADS = int(os.environ.get("JOB_WORKER_THREADS") or 2)
+    JOB_POLL_SECONDS = float(os.environ.get("JOB_POLL_SECONDS") or 1)
+
+    # Konfigurasi text search Postgres untuk pencarian produk
+    SEARCH_TS_CONFIG = os.environ.get("SEARCH_TS_CONFIG") or "simple"
+
+    # Cache response katalog publik per worker (lihat app/utils/response_cache.py)
+    RESPONSE_CACHE_ENABLED = (os.environ.get("RESPONSE_CACHE_ENABLED") or "true") == "true"
+    RESPONSE_CACHE_MAX_SIZE = int(os.environ.get("RESPONSE_CACHE_MAX_SIZE") or 2000)
+    RESPONSE_CACHE_TTL_SECONDS = int(os.environ.get("RESPONSE_CACHE_TTL_SECONDS") or 30)
+    # max-age pada header Cache-Control untuk client
+    RESPONSE_CACHE_MAX_AGE = int(os.environ.get("RESPONSE_CACHE_MAX_AGE") or 30)
+
+    # Penyimpanan varian gambar produk: "supabase" atau "local" (stand-in untuk testing)
+    IMAGE_STORAGE_BACKEND = os.environ.get("IMAGE_STORAGE_BACKEND") or "supabase"
+    IMAGE_STORAGE_BUCKET = os.environ.get("IMAGE_STORAGE_BUCKET") or "product-images"
+    IMAGE_LOCAL_STORAGE_DIR = os.environ.get("IMAGE_LOCAL_STORAGE_DIR") or os.path.join(
+        tempfile.gettempdir(), "sayur-lokal-images"
+    )
+    IMAGE_LOCAL_BASE_URL = os.environ.get("IMAGE_LOCAL_BASE_URL") or "/media"
+    # File upload menunggu diproses (harus bisa dibaca worker job)
+    IMAGE_SPOOL_DIR = os.environ.get("IMAGE_SPOOL_DIR") or os.path.join(
+        tempfile.gettempdir(), "sayur-lokal-uploads"
+    )
+    IMAGE_MAX_UPLOAD_BYTES = int(os.environ.get("IMAGE_MAX_UPLOAD_BYTES") or 10 * 1024 * 1024)
+
 
 class DevelopmentConfig(Config):
     DEBUG = True
@@ -16,6 +69,10 @@ class DevelopmentConfig(Config):
 
 class TestingConfig(Config):
     TESTING = True
+    AUTH_ADMIN_BACKEND = "local"
+    OUTBOX_WORKER_ENABLED = False
+    JOB_WORKER_ENABLED = False
+    IMAGE_STORAGE_BACKEND = "local"
     SQLALCHEMY_DATABASE_URI = os.environ.get("TEST_DATABASE_URL") or "sqlite:///test.db"
 
 
@@ -1,23 +1,41 @@
 from .buyer import BuyerProfile # noqa: F401
+from .cart import Cart # noqa: F401
+from .cart_item import CartItem # noqa: F401
 from .category import Category # noqa: F401
+from .job import Job # noqa: F401
 from .order import Order # noqa: F401
 from .order_item import OrderItem # noqa: F401
+from .outbox_event import OutboxEvent # noqa: F401
 from .product import Product # noqa: F401
 from .seller import SellerProfile # noqa: F401
+from .seller_daily_sales import SellerDailySales # noqa: F401
+from .seller_product_daily_sales import SellerProductDailySales # noqa: F401
 from .rating import Rating # noqa: F401
+from .stock_reservation import StockReservation # noqa: F401
 from .user import User # noqa: F401
 from .wallet import Wallet # noqa: F401
+from .wallet_monthly_total import WalletMonthlyTotal # noqa: F401
+from .wallet_snapshot import WalletSnapshot # noqa: F401
 from .wallet_transaction import WalletTransaction # noqa: F401
 
 __all__ = [
     "BuyerProfile",
+    "Cart",
+    "CartItem",
     "Category",
+    "Job",
     "Order",
     "OrderItem",
+    "OutboxEvent",
     "Product",
     "SellerProfile",
+    "SellerDailySales",
+    "SellerProductDailySales",
     "Rating",
+    "StockReservation",
     "User",
     "Wallet",
+    "WalletMonthlyTotal",
+    "WalletSnapshot",
     "WalletTransaction"
 ]
\ No newline at end of file
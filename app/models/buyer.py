@@ -7,7 +7,7 @@ class BuyerProfile(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), unique=True)
 
-    username = db.Column(db.String(255))
+    username = db.Column(db.String(255), unique=True, index=True)
     address = db.Column(db.String(255))
     phone_number = db.Column(db.String(20))
     location_lat = db.Column(db.Float)
@@ -4,12 +4,12 @@ from app.utils import chrono
 class Cart(db.Model):
     __tablename__ = 'carts'
     id = db.Column(db.Integer, primary_key=True)
-    buyer_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    buyer_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, unique=True)  # satu keranjang per buyer
     
-    total_amount = db.Column(db.Numeric(12, 2), default=0.00)
+    total_amount = db.Column(db.Numeric(12, 2), default=0.00)  # jumlah subtotal item, diperbarui oleh CartService
     created_at = db.Column(db.DateTime, default=chrono.now)
     updated_at = db.Column(db.DateTime, default=chrono.now, onupdate=chrono.now)
 
     # relationships
     buyer = db.relationship('User', backref='cart', uselist=False)
-    cart_items = db.relationship('CartItem', back_populates='cart', cascade='all, delete-orphan')
\ No newline at end of file
+    cart_items = db.relationship('CartItem', back_populates='cart', cascade='all, delete-orphan', order_by='CartItem.id')
\ No newline at end of file
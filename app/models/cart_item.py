@@ -16,4 +16,9 @@ class CartItem(db.Model):
 
     # relationships
     cart = db.relationship('Cart', back_populates='cart_items')
-    product = db.relationship('Product')
\ No newline at end of file
+    product = db.relationship('Product')
+
+    # Satu baris per produk di setiap keranjang
+    __table_args__ = (
+        db.Index('ix_cart_items_cart_id_product_id', 'cart_id', 'product_id', unique=True),
+    )
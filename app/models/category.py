@@ -5,7 +5,9 @@ class Category(db.Model):
     __tablename__ = 'categories'
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), unique=True)
+    # Dijaga oleh ProductService dalam transaksi yang sama dengan perubahan produk
+    product_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     created_at = db.Column(db.DateTime, default=chrono.now)
     
     # Relationship
-    products = db.relationship('Product', back_populates='category')
\ No newline at end of file
+    products = db.relationship('Product', back_populates='category')
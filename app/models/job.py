@@ -0,0 +1,32 @@
+from app.utils import chrono
+from app.utils.extensions import db
+
+
+class Job(db.Model):
+    __tablename__ = "jobs"
+    id = db.Column(db.Integer, primary_key=True)
+
+    name = db.Column(db.String(100), nullable=False)  # auth.resend_verification, ...
+    payload = db.Column(db.JSON, nullable=False)  # argumen keyword fungsi job
+    priority = db.Column(db.Integer, nullable=False, default=0)  # lebih besar lebih dulu
+    status = db.Column(db.String(20), nullable=False, default="queued")  # queued, running, done, failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=5)
+    # Visibility timeout: job running yang melewati run_at boleh diambil worker lain
+    timeout_seconds = db.Column(db.Integer, nullable=False, default=300)
+    # queued: waktu paling cepat dijalankan; running: batas visibility timeout
+    run_at = db.Column(db.DateTime, nullable=False, default=chrono.now)
+    locked_by = db.Column(db.String(100))
+    last_error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=chrono.now)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+
+    __table_args__ = (
+        # Antrian: job jatuh tempo per status, prioritas tertinggi dulu
+        db.Index(
+            "ix_jobs_status_priority_run_at", "status", db.text("priority DESC"), "run_at"
+        ),
+        # Pembersihan job selesai
+        db.Index("ix_jobs_status_finished_at", "status", "finished_at"),
+    )
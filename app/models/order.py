@@ -13,8 +13,18 @@ class Order(db.Model):
     is_paid = db.Column(db.Boolean, default=False)
     payment_proof_url = db.Column(db.String(255), nullable=True)
     created_at = db.Column(db.DateTime, default=chrono.now)
+    # Waktu order masuk ke rollup penjualan seller (saat pertama kali paid/done)
+    sales_recorded_at = db.Column(db.DateTime, nullable=True)
 
     # relationships
     buyer = db.relationship('User', back_populates='orders', foreign_keys=[buyer_id])
     seller = db.relationship('SellerProfile', back_populates='orders', foreign_keys=[seller_id])
-    order_items = db.relationship('OrderItem', back_populates='order', cascade='all, delete-orphan')
+    order_items = db.relationship('OrderItem', back_populates='order', cascade='all, delete-orphan', order_by='OrderItem.id')
+
+    # Riwayat order buyer/seller diurutkan dari yang terbaru, dengan atau tanpa filter status
+    __table_args__ = (
+        db.Index('ix_orders_buyer_id_created_at_id', 'buyer_id', 'created_at', 'id'),
+        db.Index('ix_orders_seller_id_created_at_id', 'seller_id', 'created_at', 'id'),
+        db.Index('ix_orders_buyer_id_status_created_at_id', 'buyer_id', 'status', 'created_at', 'id'),
+        db.Index('ix_orders_seller_id_status_created_at_id', 'seller_id', 'status', 'created_at', 'id'),
+    )
@@ -0,0 +1,21 @@
+from app.utils import chrono
+from app.utils.extensions import db
+
+
+class OutboxEvent(db.Model):
+    __tablename__ = "outbox_events"
+    id = db.Column(db.Integer, primary_key=True)
+
+    event_type = db.Column(db.String(100), nullable=False)  # supabase.delete_user, ...
+    payload = db.Column(db.JSON, nullable=False)
+    status = db.Column(db.String(20), default="pending")  # pending, processing, done, failed
+    attempts = db.Column(db.Integer, default=0)
+    max_attempts = db.Column(db.Integer, default=10)
+    next_attempt_at = db.Column(db.DateTime, default=chrono.now)
+    last_error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=chrono.now)
+    processed_at = db.Column(db.DateTime)
+
+    __table_args__ = (
+        db.Index("ix_outbox_events_status_next_attempt_at", "status", "next_attempt_at"),
+    )
@@ -8,18 +8,53 @@ class Product(db.Model):
     seller_id = db.Column(db.Integer, db.ForeignKey("seller_profiles.id"))
     category_id = db.Column(db.Integer, db.ForeignKey("categories.id"))
 
+    sku = db.Column(db.String(64))  # kode produk dari seller, unik per seller
     name = db.Column(db.String(100))
     description = db.Column(db.Text)
     price = db.Column(db.Float)
     stock = db.Column(db.Integer)
     image_url = db.Column(db.String(255))
+    # Varian gambar hasil ImageService: status pending/ready, hash konten
+    # file asli (dedup), dan URL per varian {"large": ..., "thumb": ...}
+    image_status = db.Column(db.String(20))
+    image_hash = db.Column(db.String(64), index=True)
+    image_variants = db.Column(db.JSON)
     # image_url = db.Column(db.JSON)  # Array of image URLs
     # discount = db.Column(db.Float, default=0)  # Persentase diskon (0-100)
     created_at = db.Column(db.DateTime, default=chrono.now)
     updated_at = db.Column(db.DateTime, default=chrono.now, onupdate=chrono.now)
 
+    # Agregat rating, diperbarui bersama perubahan rating (RatingService)
+    rating_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    rating_sum = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    rating_avg = db.Column(db.Float, nullable=False, default=0, server_default="0")
+    # Histogram jumlah rating per bintang
+    rating_1 = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    rating_2 = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    rating_3 = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    rating_4 = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    rating_5 = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+
     # Relationships
     seller = db.relationship("SellerProfile", back_populates="products")
     category = db.relationship("Category", back_populates="products")
     ratings = db.relationship("Rating", back_populates="product")
     order_items = db.relationship("OrderItem", back_populates="product")
+
+    # Index komposit untuk keyset pagination listing produk
+    __table_args__ = (
+        db.Index("ix_products_created_at_id", "created_at", "id"),
+        db.Index("ix_products_price_id", "price", "id"),
+        db.Index("ix_products_category_id_created_at_id", "category_id", "created_at", "id"),
+        db.Index("ix_products_category_id_price_id", "category_id", "price", "id"),
+        db.Index("ix_products_seller_id_created_at_id", "seller_id", "created_at", "id"),
+        db.Index("ix_products_rating_avg_id", "rating_avg", "id"),
+        db.Index("ix_products_category_id_rating_avg_id", "category_id", "rating_avg", "id"),
+        # Kunci upsert import produk
+        db.Index("ix_products_seller_id_sku", "seller_id", "sku", unique=True),
+    )
+
+    @property
+    def rating_histogram(self):
+        """Jumlah rating per bintang, {1: n, ..., 5: n}"""
+        return {star: getattr(self, f"rating_{star}") for star in range(1, 6)}
@@ -6,11 +6,20 @@ class Rating(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     product_id = db.Column(db.Integer, db.ForeignKey('products.id'))
     buyer_id = db.Column(db.Integer, db.ForeignKey('users.id'))
+    order_id = db.Column(db.Integer, db.ForeignKey('orders.id'), nullable=True)
     
     rating = db.Column(db.Integer)
     comment = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=chrono.now)
+    updated_at = db.Column(db.DateTime, default=chrono.now, onupdate=chrono.now)
 
     # relationships
     product = db.relationship('Product', back_populates='ratings')
-    buyer = db.relationship('User', back_populates='ratings')
\ No newline at end of file
+    buyer = db.relationship('User', back_populates='ratings')
+
+    # Daftar rating per produk (terbaru dulu), rating milik buyer, dan
+    # satu rating per buyer per produk
+    __table_args__ = (
+        db.Index('ix_ratings_product_id_created_at_id', 'product_id', 'created_at', 'id'),
+        db.Index('ix_ratings_buyer_id_product_id', 'buyer_id', 'product_id', unique=True),
+    )
\ No newline at end of file
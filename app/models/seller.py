@@ -1,11 +1,14 @@
+from sqlalchemy import event
+
 from app.utils.extensions import db
+from app.utils.geo import geohash_for
 
 class SellerProfile(db.Model):
     __tablename__ = 'seller_profiles'
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), unique=True)
 
-    shop_name = db.Column(db.String(100), nullable=False)
+    shop_name = db.Column(db.String(100), nullable=False, unique=True, index=True)
     
     description = db.Column(db.Text)
     logo_url = db.Column(db.String(255))
@@ -13,6 +16,8 @@ class SellerProfile(db.Model):
     location_address = db.Column(db.String(255))
     location_lat = db.Column(db.Float)
     location_lng = db.Column(db.Float)
+    # Dihitung otomatis dari location_lat/lng, untuk pencarian seller terdekat
+    geohash = db.Column(db.String(12), index=True)
     
     is_verified = db.Column(db.Boolean, default=False)  # by admin
     is_eco_friendly = db.Column(db.Boolean, default=False)
@@ -25,4 +30,11 @@ class SellerProfile(db.Model):
     # Relationships
     products = db.relationship('Product', back_populates='seller')
     user = db.relationship("User", back_populates="seller_profile")
-    orders = db.relationship("Order", back_populates="seller", foreign_keys="Order.seller_id")
\ No newline at end of file
+    # Dynamic: riwayat order di-query per halaman lewat OrderService
+    orders = db.relationship("Order", back_populates="seller", foreign_keys="Order.seller_id", lazy="dynamic")
+
+
+@event.listens_for(SellerProfile, "before_insert")
+@event.listens_for(SellerProfile, "before_update")
+def _update_geohash(mapper, connection, target):
+    target.geohash = geohash_for(target.location_lat, target.location_lng)
@@ -0,0 +1,19 @@
+from app.utils import chrono
+from app.utils.extensions import db
+
+
+class SellerDailySales(db.Model):
+    __tablename__ = "seller_daily_sales"
+    id = db.Column(db.Integer, primary_key=True)
+    seller_id = db.Column(db.Integer, db.ForeignKey("seller_profiles.id"), nullable=False)
+
+    day = db.Column(db.Date, nullable=False)  # tanggal order tercatat terjual (UTC)
+    order_count = db.Column(db.Integer, nullable=False, default=0)
+    units_sold = db.Column(db.Integer, nullable=False, default=0)
+    revenue = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=chrono.now, onupdate=chrono.now)
+
+    # Satu baris per seller per hari; juga untuk rentang tanggal dashboard
+    __table_args__ = (
+        db.Index("ix_seller_daily_sales_seller_id_day", "seller_id", "day", unique=True),
+    )
@@ -0,0 +1,27 @@
+from app.utils import chrono
+from app.utils.extensions import db
+
+
+class SellerProductDailySales(db.Model):
+    __tablename__ = "seller_product_daily_sales"
+    id = db.Column(db.Integer, primary_key=True)
+    seller_id = db.Column(db.Integer, db.ForeignKey("seller_profiles.id"), nullable=False)
+    product_id = db.Column(db.Integer, db.ForeignKey("products.id"), nullable=False)
+
+    day = db.Column(db.Date, nullable=False)  # tanggal order tercatat terjual (UTC)
+    units_sold = db.Column(db.Integer, nullable=False, default=0)
+    revenue = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=chrono.now, onupdate=chrono.now)
+
+    product = db.relationship("Product")
+
+    # Satu baris per seller, hari, dan produk; rentang tanggal per seller
+    __table_args__ = (
+        db.Index(
+            "ix_seller_product_daily_sales_seller_id_day_product_id",
+            "seller_id",
+            "day",
+            "product_id",
+            unique=True,
+        ),
+    )
@@ -0,0 +1,24 @@
+from app.utils import chrono
+from app.utils.extensions import db
+
+
+class StockReservation(db.Model):
+    __tablename__ = "stock_reservations"
+    id = db.Column(db.Integer, primary_key=True)
+    product_id = db.Column(db.Integer, db.ForeignKey("products.id"), nullable=False, index=True)
+    buyer_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=True)
+
+    # Kunci pengelompokan hold, misalnya satu checkout
+    reference = db.Column(db.String(64), nullable=False, index=True)
+    quantity = db.Column(db.Integer, nullable=False)
+    status = db.Column(db.String(20), nullable=False, default="held")  # held, committed, released, expired
+    expires_at = db.Column(db.DateTime, nullable=False)
+    created_at = db.Column(db.DateTime, default=chrono.now)
+    resolved_at = db.Column(db.DateTime)
+
+    product = db.relationship("Product")
+
+    # Sweeper mengambil hold yang sudah kedaluwarsa
+    __table_args__ = (
+        db.Index("ix_stock_reservations_status_expires_at", "status", "expires_at"),
+    )
@@ -26,5 +26,6 @@ class User(db.Model):
     buyer_profile = db.relationship("BuyerProfile", back_populates="user", uselist=False)
     seller_profile = db.relationship("SellerProfile", back_populates="user", uselist=False)
     wallet = db.relationship("Wallet", back_populates="user", uselist=False)
-    orders = db.relationship("Order", back_populates="buyer", foreign_keys="Order.buyer_id")
+    # Dynamic: riwayat order di-query per halaman lewat OrderService
+    orders = db.relationship("Order", back_populates="buyer", foreign_keys="Order.buyer_id", lazy="dynamic")
     ratings = db.relationship("Rating", back_populates="buyer")
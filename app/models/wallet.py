@@ -5,7 +5,14 @@ class Wallet(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), unique=True)
     balance = db.Column(db.Numeric(12, 2), default=0.00)
+    # Naik setiap kali saldo berubah, dipakai untuk optimistic locking oleh WalletService
+    version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     
     # Relationships
     user = db.relationship("User", back_populates="wallet")
-    transactions = db.relationship("WalletTransaction", back_populates="wallet")
\ No newline at end of file
+    # Dynamic: riwayat bisa sangat panjang, selalu di-query dengan filter/limit
+    transactions = db.relationship("WalletTransaction", back_populates="wallet", lazy="dynamic")
+
+    __table_args__ = (
+        db.CheckConstraint('balance >= 0', name='ck_wallets_balance_non_negative'),
+    )
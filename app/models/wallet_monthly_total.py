@@ -0,0 +1,27 @@
+from app.utils import chrono
+from app.utils.extensions import db
+
+
+class WalletMonthlyTotal(db.Model):
+    __tablename__ = "wallet_monthly_totals"
+    id = db.Column(db.Integer, primary_key=True)
+    wallet_id = db.Column(db.Integer, db.ForeignKey("wallets.id"), nullable=False)
+
+    month = db.Column(db.Date, nullable=False)  # tanggal 1 bulan tersebut (UTC)
+    transaction_type = db.Column(db.String(50), nullable=False)
+    transaction_count = db.Column(db.Integer, nullable=False, default=0)
+    total_amount = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=chrono.now, onupdate=chrono.now)
+
+    wallet = db.relationship("Wallet")
+
+    # Satu baris per wallet, bulan, dan jenis transaksi; juga untuk rentang bulan
+    __table_args__ = (
+        db.Index(
+            "ix_wallet_monthly_totals_wallet_id_month_type",
+            "wallet_id",
+            "month",
+            "transaction_type",
+            unique=True,
+        ),
+    )
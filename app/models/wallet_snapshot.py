@@ -0,0 +1,23 @@
+from app.utils import chrono
+from app.utils.extensions import db
+
+
+class WalletSnapshot(db.Model):
+    __tablename__ = "wallet_snapshots"
+    id = db.Column(db.Integer, primary_key=True)
+    wallet_id = db.Column(db.Integer, db.ForeignKey("wallets.id"), nullable=False)
+
+    # Transaksi terakhir yang sudah termasuk dalam saldo snapshot
+    transaction_id = db.Column(db.Integer, db.ForeignKey("wallet_transactions.id"), nullable=True)
+    balance = db.Column(db.Numeric(12, 2), nullable=False)
+    version = db.Column(db.Integer, nullable=False)
+    # Waktu saldo ini berlaku (created_at transaksi terakhir)
+    as_of = db.Column(db.DateTime, nullable=False)
+    created_at = db.Column(db.DateTime, default=chrono.now)
+
+    wallet = db.relationship("Wallet")
+
+    # Snapshot terakhir sebelum suatu waktu per wallet
+    __table_args__ = (
+        db.Index("ix_wallet_snapshots_wallet_id_as_of", "wallet_id", "as_of"),
+    )
@@ -10,7 +10,26 @@ class WalletTransaction(db.Model):
     transaction_type = db.Column(db.String(50))  # topup, withdraw, payment, refund
     amount = db.Column(db.Numeric(12, 2), nullable=False)
     status = db.Column(db.String(50))  # pending, verified, rejected
+    # Saldo wallet setelah transaksi ini, diisi WalletService (kosong untuk transaksi lama)
+    balance_after = db.Column(db.Numeric(12, 2), nullable=True)
     # proof_url = db.Column(db.String(255), nullable=True)  # URL bukti transfer, pembayaran, dll.
     created_at = db.Column(db.DateTime, default=chrono.now)
 
     wallet = db.relationship("Wallet", back_populates="transactions")
+
+    # Riwayat transaksi per wallet diurutkan dari yang terbaru
+    __table_args__ = (
+        db.Index(
+            "ix_wallet_transactions_wallet_id_created_at_id",
+            "wallet_id",
+            "created_at",
+            "id",
+        ),
+        db.Index(
+            "ix_wallet_transactions_wallet_id_type_created_at_id",
+            "wallet_id",
+            "transaction_type",
+            "created_at",
+            "id",
+        ),
+    )
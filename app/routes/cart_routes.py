@@ -0,0 +1,133 @@
+from flask import Blueprint, request, jsonify
+from app.schemas.cart_schema import CartItemCreate, CartItemsCreate, CartItemUpdate
+from app.services.cart_service import CartService
+from app.services.reservation_service import ReservationService
+from app.utils.auth_middleware import token_required, role_required
+from app.utils.helpers import handle_errors
+
+cart_bp = Blueprint("cart", __name__, url_prefix="/cart")
+
+
+def _cart_response(cart, message, status_code=200):
+    return (
+        jsonify({"success": True, "message": message, "data": cart.model_dump()}),
+        status_code,
+    )
+
+
+def _not_in_cart(product_id):
+    return (
+        jsonify(
+            {
+                "success": False,
+                "message": f"Produk dengan ID {product_id} tidak ada di keranjang",
+            }
+        ),
+        404,
+    )
+
+
+@cart_bp.route("", methods=["GET"])
+@token_required
+@role_required("buyer")
+@handle_errors
+def get_cart(current_user):
+    """
+    Endpoint untuk melihat keranjang buyer yang sedang login
+    """
+    cart = CartService.get_cart(current_user.id)
+    return _cart_response(cart, "Keranjang berhasil diambil")
+
+
+@cart_bp.route("/items", methods=["POST"])
+@token_required
+@role_required("buyer")
+@handle_errors
+def add_cart_items(current_user):
+    """
+    Endpoint untuk menambahkan produk ke keranjang.
+    Body berupa satu item {"product_id", "quantity"} atau
+    beberapa item sekaligus {"items": [...]}.
+    """
+    data = request.json
+    if "items" in data:
+        items = CartItemsCreate(**data).items
+    else:
+        items = [CartItemCreate(**data)]
+
+    cart = CartService.add_items(
+        current_user.id, [(item.product_id, item.quantity) for item in items]
+    )
+    return _cart_response(cart, "Produk berhasil ditambahkan ke keranjang")
+
+
+@cart_bp.route("/items/<int:product_id>", methods=["PUT"])
+@token_required
+@role_required("buyer")
+@handle_errors
+def update_cart_item(current_user, product_id):
+    """
+    Endpoint untuk mengubah jumlah produk di keranjang
+    """
+    item_data = CartItemUpdate(**request.json)
+
+    cart = CartService.update_item(current_user.id, product_id, item_data.quantity)
+    if cart is None:
+        return _not_in_cart(product_id)
+    return _cart_response(cart, "Keranjang berhasil diperbarui")
+
+
+@cart_bp.route("/items/<int:product_id>", methods=["DELETE"])
+@token_required
+@role_required("buyer")
+@handle_errors
+def remove_cart_item(current_user, product_id):
+    """
+    Endpoint untuk menghapus produk dari keranjang
+    """
+    cart = CartService.remove_item(current_user.id, product_id)
+    if cart is None:
+        return _not_in_cart(product_id)
+    return _cart_response(cart, "Produk berhasil dihapus dari keranjang")
+
+
+@cart_bp.route("", methods=["DELETE"])
+@token_required
+@role_required("buyer")
+@handle_errors
+def clear_cart(current_user):
+    """
+    Endpoint untuk mengosongkan keranjang
+    """
+    CartService.clear(current_user.id)
+    return jsonify({"success": True, "message": "Keranjang berhasil dikosongkan"}), 200
+
+
+@cart_bp.route("/hold", methods=["POST"])
+@token_required
+@role_required("buyer")
+@handle_errors
+def hold_cart(current_user):
+    """
+    Endpoint untuk menahan stok produk di keranjang selama checkout.
+    Reference yang dikembalikan dikirim sebagai hold_reference saat checkout;
+    hold yang tidak dipakai dilepas otomatis setelah kedaluwarsa.
+    """
+    hold = CartService.hold(current_user.id)
+    return jsonify({"success": True, "message": "Stok berhasil ditahan", "data": hold}), 201
+
+
+@cart_bp.route("/hold/<reference>", methods=["DELETE"])
+@token_required
+@role_required("buyer")
+@handle_errors
+def release_hold(current_user, reference):
+    """
+    Endpoint untuk melepas hold stok yang belum dipakai checkout
+    """
+    if not ReservationService.release(reference, buyer_id=current_user.id):
+        return (
+            jsonify({"success": False, "message": "Hold stok tidak ditemukan"}),
+            404,
+        )
+    return jsonify({"success": True, "message": "Hold stok berhasil dilepas"}), 200
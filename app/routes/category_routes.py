@@ -3,12 +3,14 @@ from app.services.category_service import CategoryService
 from app.schemas.category_schema import CategoryCreate, CategoryUpdate
 from app.utils.auth_middleware import token_required, role_required
 from app.utils.helpers import handle_errors
+from app.utils.response_cache import cached_response
 from pydantic import ValidationError
 
 category_bp = Blueprint("category", __name__, url_prefix="/categories")
 
 
 @category_bp.route("", methods=["GET"])
+@cached_response
 @handle_errors
 def get_all_categories():
     """
@@ -19,6 +21,7 @@ def get_all_categories():
 
 
 @category_bp.route("/<int:category_id>", methods=["GET"])
+@cached_response
 @handle_errors
 def get_category_by_id(category_id):
     """
@@ -29,6 +32,7 @@ def get_category_by_id(category_id):
 
 
 @category_bp.route("/<int:category_id>/products", methods=["GET"])
+@cached_response
 @handle_errors
 def get_category_with_products(category_id):
     """
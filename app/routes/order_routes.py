@@ -0,0 +1,156 @@
+from flask import Blueprint, request, jsonify
+from app.schemas.order_schema import CheckoutRequest, OrderStatusUpdate
+from app.services.order_service import OrderService
+from app.utils.auth_middleware import token_required, role_required
+from app.utils.helpers import handle_errors
+
+order_bp = Blueprint("order", __name__, url_prefix="/orders")
+
+
+@order_bp.route("", methods=["POST"])
+@token_required
+@role_required("buyer")
+@handle_errors
+def checkout(current_user):
+    """
+    Endpoint untuk checkout keranjang buyer. Keranjang berisi produk dari
+    beberapa seller dipecah menjadi satu order per seller. hold_reference
+    (dari POST /cart/hold) dipakai jika stok sudah ditahan sebelumnya.
+    """
+    checkout_data = CheckoutRequest(**(request.get_json(silent=True) or {}))
+
+    orders = OrderService.checkout(
+        current_user.id, checkout_data.payment_method, checkout_data.hold_reference
+    )
+    return (
+        jsonify(
+            {
+                "success": True,
+                "message": f"{len(orders)} order berhasil dibuat",
+                "data": [order.model_dump() for order in orders],
+            }
+        ),
+        201,
+    )
+
+
+def _orders_response(page, message):
+    return (
+        jsonify(
+            {
+                "success": True,
+                "message": message,
+                "count": len(page["items"]),
+                "next_cursor": page["next_cursor"],
+                "data": [order.model_dump() for order in page["items"]],
+            }
+        ),
+        200,
+    )
+
+
+@order_bp.route("/buyer", methods=["GET"])
+@token_required
+@role_required("buyer")
+@handle_errors
+def get_buyer_orders(current_user):
+    """
+    Endpoint untuk melihat riwayat order buyer (terbaru dulu).
+    Hasil dipaginasi dengan cursor (parameter limit, cursor) dan dapat
+    difilter dengan status.
+    """
+    page = OrderService.get_buyer_orders(
+        current_user.id,
+        limit=request.args.get("limit", type=int),
+        cursor=request.args.get("cursor", type=str),
+        status=request.args.get("status", type=str),
+    )
+    return _orders_response(page, "Daftar order berhasil diambil")
+
+
+@order_bp.route("/seller", methods=["GET"])
+@token_required
+@role_required("seller")
+@handle_errors
+def get_seller_orders(current_user):
+    """
+    Endpoint untuk melihat order yang masuk ke seller (terbaru dulu).
+    Hasil dipaginasi dengan cursor (parameter limit, cursor) dan dapat
+    difilter dengan status.
+    """
+    seller_profile_id = current_user.seller_profile_id
+    if not seller_profile_id:
+        return (
+            jsonify({"success": False, "message": "Profil seller tidak ditemukan"}),
+            400,
+        )
+
+    page = OrderService.get_seller_orders(
+        seller_profile_id,
+        limit=request.args.get("limit", type=int),
+        cursor=request.args.get("cursor", type=str),
+        status=request.args.get("status", type=str),
+    )
+    return _orders_response(page, "Daftar order seller berhasil diambil")
+
+
+@order_bp.route("/<int:order_id>", methods=["GET"])
+@token_required
+@handle_errors
+def get_order(current_user, order_id):
+    """
+    Endpoint untuk melihat detail order milik buyer atau seller yang login
+    """
+    order = OrderService.get_order(
+        order_id, buyer_id=current_user.id, seller_id=current_user.seller_profile_id
+    )
+    if order is None:
+        return (
+            jsonify(
+                {"success": False, "message": f"Order dengan ID {order_id} tidak ditemukan"}
+            ),
+            404,
+        )
+    return (
+        jsonify(
+            {
+                "success": True,
+                "message": "Detail order berhasil diambil",
+                "data": order.model_dump(),
+            }
+        ),
+        200,
+    )
+
+
+@order_bp.route("/<int:order_id>/status", methods=["PUT"])
+@token_required
+@role_required("seller")
+@handle_errors
+def update_order_status(current_user, order_id):
+    """
+    Endpoint untuk mengubah status order (seller only):
+    pending -> paid/shipped, paid -> shipped, shipped -> done
+    """
+    status_data = OrderStatusUpdate(**request.json)
+
+    order = OrderService.update_status(
+        order_id, current_user.seller_profile_id, status_data.status
+    )
+    if order is None:
+        return (
+            jsonify(
+                {"success": False, "message": f"Order dengan ID {order_id} tidak ditemukan"}
+            ),
+            404,
+        )
+    return (
+        jsonify(
+            {
+                "success": True,
+                "message": "Status order berhasil diperbarui",
+                "data": order.model_dump(),
+            }
+        ),
+        200,
+    )
@@ -1,8 +1,24 @@
 from flask import Blueprint, request, jsonify
+from app.services.image_service import ImageService
+from app.services.nearby_service import NearbyService
+from app.services.product_import_service import ProductImportService
 from app.services.product_service import ProductService
-from app.schemas.product_schema import ProductCreate, ProductUpdate
+from app.services.rating_service import RatingService
+from app.services.search_service import SearchService
+from app.schemas.product_schema import (
+    DEFAULT_PRODUCT_LIST_FIELDS,
+    PRODUCT_LIST_FIELDS,
+    ProductCreate,
+    ProductUpdate,
+    product_list_adapter,
+)
+from app.schemas.rating_schema import RatingCreate, RatingUpdate
 from app.utils.auth_middleware import token_required, role_required
 from app.utils.helpers import handle_errors
+from app.utils.pagination import parse_bool
+from app.utils.response_cache import cached_response
+from app.utils.serialization import dump_list_json, json_envelope_response, parse_fields
+from app.utils.streaming import STREAM_FORMATS, stream_response
 
 # Membuat blueprint untuk produk
 product_bp = Blueprint("product", __name__, url_prefix="/products")
@@ -20,12 +36,10 @@ def create_product(current_user):
     # Mendapatkan data dari request
     data = request.json
 
-    # Mendapatkan seller_profile_id dari user yang login
-    from app.models.seller import SellerProfile
+    # Mendapatkan seller_profile_id dari user yang login (tanpa query tambahan)
+    seller_profile_id = current_user.seller_profile_id
 
-    seller_profile = SellerProfile.query.filter_by(user_id=current_user.id).first()
-
-    if not seller_profile:
+    if not seller_profile_id:
         return (
             jsonify(
                 {
@@ -37,7 +51,7 @@ def create_product(current_user):
         )
 
     # Menambahkan seller_id ke data (menggunakan ID dari seller_profile)
-    data["seller_id"] = seller_profile.id
+    data["seller_id"] = seller_profile_id
 
     # Validasi data menggunakan schema
     product_data = ProductCreate(**data)
@@ -57,12 +71,144 @@ def create_product(current_user):
     )
 
 
+# Content-Type / ekstensi file yang dikenali endpoint import
+_IMPORT_MIMETYPES = {
+    "text/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+_IMPORT_EXTENSIONS = {"csv": "csv", "ndjson": "ndjson", "jsonl": "ndjson"}
+
+
+@product_bp.route("/import", methods=["POST"])
+@token_required
+@role_required("seller")
+@handle_errors
+def import_products(current_user):
+    """
+    Endpoint untuk mengimpor banyak produk sekaligus dari file CSV atau NDJSON.
+    Produk dengan SKU yang sudah ada diperbarui, SKU baru dibuat.
+    File dikirim sebagai body request (Content-Type text/csv atau
+    application/x-ndjson) atau sebagai field "file" pada multipart form.
+    """
+    seller_profile_id = current_user.seller_profile_id
+    if not seller_profile_id:
+        return (
+            jsonify(
+                {
+                    "success": False,
+                    "message": "Profil seller tidak ditemukan. Pastikan Anda telah melengkapi profil seller.",
+                }
+            ),
+            400,
+        )
+
+    file_format = request.args.get("format", type=str)
+    if request.mimetype == "multipart/form-data":
+        upload = request.files.get("file")
+        if upload is None:
+            raise ValueError("File import tidak ditemukan pada field 'file'")
+        extension = (upload.filename or "").rsplit(".", 1)[-1].lower()
+        file_format = file_format or _IMPORT_EXTENSIONS.get(extension)
+        stream = upload.stream
+    else:
+        file_format = file_format or _IMPORT_MIMETYPES.get(request.mimetype)
+        stream = request.stream
+
+    if not file_format:
+        raise ValueError("Format file tidak dikenali, gunakan parameter format=csv atau format=ndjson")
+
+    result = ProductImportService.import_products(
+        seller_id=seller_profile_id, stream=stream, file_format=file_format
+    )
+
+    return (
+        jsonify(
+            {
+                "success": True,
+                "message": (
+                    f"Import selesai: {result['created']} produk dibuat, "
+                    f"{result['updated']} diperbarui, {result['failed']} gagal"
+                ),
+                "data": result,
+            }
+        ),
+        200,
+    )
+
+
+def _pagination_args():
+    """
+    Membaca parameter pagination dan fields (kolom yang dikembalikan)
+    dari query string
+    """
+    return {
+        "fields": parse_fields(
+            request.args.get("fields"), PRODUCT_LIST_FIELDS, DEFAULT_PRODUCT_LIST_FIELDS
+        ),
+        "sort": request.args.get("sort", "newest", type=str),
+        "limit": request.args.get("limit", type=int),
+        "cursor": request.args.get("cursor", type=str),
+        "include_total": parse_bool(request.args.get("include_total")),
+    }
+
+
+def _product_list(message, empty_message=None, **filters):
+    """
+    Menyusun response listing produk: satu halaman JSON (default), atau
+    seluruh hasil secara streaming jika format=ndjson / format=json-stream
+    """
+    pagination = _pagination_args()
+    output_format = request.args.get("format", "json", type=str)
+
+    if output_format in STREAM_FORMATS:
+        items = ProductService.iter_products(
+            sort=pagination["sort"],
+            cursor=pagination["cursor"],
+            fields=pagination["fields"],
+            **filters,
+        )
+        return stream_response(items, output_format, message)
+
+    if output_format != "json":
+        raise ValueError(
+            f"Parameter format tidak valid, pilih salah satu: json, {', '.join(STREAM_FORMATS)}"
+        )
+
+    page = ProductService.get_products_page(**filters, **pagination)
+    return _page_response(page, pagination["fields"], message, empty_message)
+
+
+def _page_response(page, fields, message, empty_message=None):
+    """
+    Menyusun response JSON untuk satu halaman produk
+    """
+    items = page["items"]
+    if not items and empty_message and not request.args.get("cursor"):
+        message = empty_message
+
+    # Seluruh halaman diserialisasi sekaligus ke JSON bytes
+    return json_envelope_response(
+        {
+            "success": True,
+            "message": message,
+            "total": page["total"],
+            "count": len(items),
+            "next_cursor": page["next_cursor"],
+        },
+        dump_list_json(product_list_adapter(fields), items),
+    )
+
+
 @product_bp.route("", methods=["GET"])
+@cached_response
 @handle_errors
 def get_all_products():
     """
     Endpoint untuk mendapatkan daftar semua produk.
     Dapat difilter berdasarkan kategori, seller, dan rentang harga.
+    Hasil dipaginasi dengan cursor (parameter limit, cursor, sort, include_total).
     """
     # Mendapatkan parameter query
     category_id = request.args.get("category_id", type=int)
@@ -70,30 +216,22 @@ def get_all_products():
     price_min = request.args.get("price_min", type=float)
     price_max = request.args.get("price_max", type=float)
     name = request.args.get("name", type=str)
+    rating_min = request.args.get("rating_min", type=float)
 
-    # Mendapatkan daftar produk
-    products = ProductService.get_all_products(
+    # Mendapatkan satu halaman produk (atau seluruhnya jika streaming)
+    return _product_list(
+        "Daftar produk berhasil diambil",
         category_id=category_id,
         seller_id=seller_id,
         price_min=price_min,
         price_max=price_max,
         name=name,
-    )
-
-    return (
-        jsonify(
-            {
-                "success": True,
-                "message": "Daftar produk berhasil diambil",
-                "total": len(products),
-                "data": [product.model_dump() for product in products],
-            }
-        ),
-        200,
+        rating_min=rating_min,
     )
 
 
 @product_bp.route("/<int:product_id>", methods=["GET"])
+@cached_response
 @handle_errors
 def get_product(product_id):
     """
@@ -126,6 +264,7 @@ def get_product(product_id):
 
 
 @product_bp.route("/category/<int:category_id>", methods=["GET"])
+@cached_response
 @handle_errors
 def get_products_by_category(category_id):
     """
@@ -136,38 +275,21 @@ def get_products_by_category(category_id):
     price_min = request.args.get("price_min", type=float)
     price_max = request.args.get("price_max", type=float)
     name = request.args.get("name", type=str)
+    rating_min = request.args.get("rating_min", type=float)
 
-    products = ProductService.get_all_products(
-        category_id=category_id, price_min=price_min, price_max=price_max, name=name
-    )
-
-    if not products:
-        return (
-            jsonify(
-                {
-                    "success": True,
-                    "message": f"Tidak ada produk dalam kategori dengan ID {category_id}",
-                    "total": 0,
-                    "data": [],
-                }
-            ),
-            200,
-        )
-
-    return (
-        jsonify(
-            {
-                "success": True,
-                "message": f"Daftar produk untuk kategori ID {category_id} berhasil diambil",
-                "total": len(products),
-                "data": [product.model_dump() for product in products],
-            }
-        ),
-        200,
+    return _product_list(
+        f"Daftar produk untuk kategori ID {category_id} berhasil diambil",
+        f"Tidak ada produk dalam kategori dengan ID {category_id}",
+        category_id=category_id,
+        price_min=price_min,
+        price_max=price_max,
+        name=name,
+        rating_min=rating_min,
     )
 
 
 @product_bp.route("/seller/<int:seller_id>", methods=["GET"])
+@cached_response
 @handle_errors
 def get_products_by_seller(seller_id):
     """
@@ -179,37 +301,18 @@ def get_products_by_seller(seller_id):
     price_max = request.args.get("price_max", type=float)
     name = request.args.get("name", type=str)
 
-    products = ProductService.get_all_products(
-        seller_id=seller_id, price_min=price_min, price_max=price_max, name=name
-    )
-
-    if not products:
-        return (
-            jsonify(
-                {
-                    "success": True,
-                    "message": f"Tidak ada produk dari seller dengan ID {seller_id}",
-                    "total": 0,
-                    "data": [],
-                }
-            ),
-            200,
-        )
-
-    return (
-        jsonify(
-            {
-                "success": True,
-                "message": f"Daftar produk untuk seller ID {seller_id} berhasil diambil",
-                "total": len(products),
-                "data": [product.model_dump() for product in products],
-            }
-        ),
-        200,
+    return _product_list(
+        f"Daftar produk untuk seller ID {seller_id} berhasil diambil",
+        f"Tidak ada produk dari seller dengan ID {seller_id}",
+        seller_id=seller_id,
+        price_min=price_min,
+        price_max=price_max,
+        name=name,
     )
 
 
 @product_bp.route("/price-range", methods=["GET"])
+@cached_response
 @handle_errors
 def get_products_by_price_range():
     """
@@ -231,41 +334,21 @@ def get_products_by_price_range():
             400,
         )
 
-    products = ProductService.get_all_products(
-        price_min=price_min, price_max=price_max, name=name
-    )
-
-    if not products:
-        return (
-            jsonify(
-                {
-                    "success": True,
-                    "message": "Tidak ada produk dalam rentang harga yang ditentukan",
-                    "total": 0,
-                    "data": [],
-                }
-            ),
-            200,
-        )
-
-    return (
-        jsonify(
-            {
-                "success": True,
-                "message": "Daftar produk berdasarkan rentang harga berhasil diambil",
-                "total": len(products),
-                "data": [product.model_dump() for product in products],
-            }
-        ),
-        200,
+    return _product_list(
+        "Daftar produk berdasarkan rentang harga berhasil diambil",
+        "Tidak ada produk dalam rentang harga yang ditentukan",
+        price_min=price_min,
+        price_max=price_max,
+        name=name,
     )
 
 
 @product_bp.route("/search", methods=["GET"])
+@cached_response
 @handle_errors
 def search_products():
     """
-    Endpoint untuk mencari produk berdasarkan nama
+    Endpoint untuk mencari produk berdasarkan nama dan deskripsi (full-text)
     """
     name = request.args.get("q", type=str)
     price_min = request.args.get("price_min", type=float)
@@ -283,29 +366,48 @@ def search_products():
             400,
         )
 
-    products = ProductService.get_all_products(
-        name=name, price_min=price_min, price_max=price_max, category_id=category_id
+    # Hasil diurutkan berdasarkan relevansi, parameter sort diabaikan
+    pagination = _pagination_args()
+    pagination.pop("sort")
+
+    page = SearchService.search_products(
+        name,
+        price_min=price_min,
+        price_max=price_max,
+        category_id=category_id,
+        **pagination,
     )
 
-    if not products:
-        return (
-            jsonify(
-                {
-                    "success": True,
-                    "message": f"Tidak ada produk yang cocok dengan pencarian '{name}'",
-                    "total": 0,
-                    "data": [],
-                }
-            ),
-            200,
-        )
+    return _page_response(
+        page,
+        pagination["fields"],
+        f"Hasil pencarian untuk '{name}'",
+        f"Tidak ada produk yang cocok dengan pencarian '{name}'",
+    )
+
+
+@product_bp.route("/nearby", methods=["GET"])
+@cached_response
+@handle_errors
+def get_nearby_products():
+    """
+    Endpoint untuk mencari produk dari seller terdekat, diurutkan berdasarkan jarak.
+    Parameter: lat, lng, radius_km (default 10, maksimum 50), category_id, limit.
+    """
+    products = NearbyService.find_products(
+        lat=request.args.get("lat", type=float),
+        lng=request.args.get("lng", type=float),
+        radius_km=request.args.get("radius_km", type=float),
+        category_id=request.args.get("category_id", type=int),
+        limit=request.args.get("limit", type=int),
+    )
 
     return (
         jsonify(
             {
                 "success": True,
-                "message": f"Hasil pencarian untuk '{name}'",
-                "total": len(products),
+                "message": "Daftar produk terdekat berhasil diambil",
+                "count": len(products),
                 "data": [product.model_dump() for product in products],
             }
         ),
@@ -336,7 +438,7 @@ def update_product(current_user, product_id):
             404,
         )
 
-    if product.seller_id != current_user.id:
+    if product.seller_id != current_user.seller_profile_id:
         return (
             jsonify(
                 {
@@ -391,7 +493,7 @@ def delete_product(current_user, product_id):
             404,
         )
 
-    if product.seller_id != current_user.id:
+    if product.seller_id != current_user.seller_profile_id:
         return (
             jsonify(
                 {
@@ -409,3 +511,201 @@ def delete_product(current_user, product_id):
         return jsonify({"success": False, "message": "Gagal menghapus produk"}), 500
 
     return jsonify({"success": True, "message": "Produk berhasil dihapus"}), 200
+
+
+@product_bp.route("/<int:product_id>/image", methods=["POST"])
+@token_required
+@role_required("seller")
+@handle_errors
+def upload_product_image(current_user, product_id):
+    """
+    Endpoint untuk mengunggah gambar produk (field "file" pada multipart form).
+    Varian gambar dibuat di background: response 202 dengan image_status
+    "pending", URL varian muncul di produk setelah selesai diproses.
+    """
+    product = ProductService.get_product_by_id(product_id)
+
+    if not product:
+        return (
+            jsonify(
+                {
+                    "success": False,
+                    "message": f"Produk dengan ID {product_id} tidak ditemukan",
+                }
+            ),
+            404,
+        )
+
+    if product.seller_id != current_user.seller_profile_id:
+        return (
+            jsonify(
+                {
+                    "success": False,
+                    "message": "Anda tidak memiliki izin untuk memperbarui produk ini",
+                }
+            ),
+            403,
+        )
+
+    upload = request.files.get("file")
+    if not upload:
+        return (
+            jsonify({"success": False, "message": "File gambar (file) harus diisi"}),
+            400,
+        )
+
+    result = ImageService.submit_product_image(product_id, upload.read())
+    ready = result["image_status"] == "ready"
+
+    return (
+        jsonify(
+            {
+                "success": True,
+                "message": (
+                    "Gambar produk berhasil diperbarui"
+                    if ready
+                    else "Gambar produk sedang diproses"
+                ),
+                "data": result,
+            }
+        ),
+        200 if ready else 202,
+    )
+
+
+@product_bp.route("/<int:product_id>/ratings", methods=["GET"])
+@cached_response
+@handle_errors
+def get_product_ratings(product_id):
+    """
+    Endpoint untuk mendapatkan rating sebuah produk (terbaru dulu).
+    Hasil dipaginasi dengan cursor (parameter limit, cursor).
+    """
+    page = RatingService.get_product_ratings(
+        product_id,
+        limit=request.args.get("limit", type=int),
+        cursor=request.args.get("cursor", type=str),
+    )
+
+    return (
+        jsonify(
+            {
+                "success": True,
+                "message": f"Daftar rating untuk produk ID {product_id} berhasil diambil",
+                "count": len(page["items"]),
+                "next_cursor": page["next_cursor"],
+                "data": [rating.model_dump() for rating in page["items"]],
+            }
+        ),
+        200,
+    )
+
+
+@product_bp.route("/<int:product_id>/ratings", methods=["POST"])
+@token_required
+@role_required("buyer")
+@handle_errors
+def create_product_rating(current_user, product_id):
+    """
+    Endpoint untuk memberi rating produk.
+    Hanya buyer yang dapat memberi rating, satu rating per produk.
+    """
+    data = request.json
+    data["product_id"] = product_id
+
+    # Validasi data menggunakan schema
+    rating_data = RatingCreate(**data)
+
+    rating = RatingService.create_rating(current_user.id, rating_data)
+
+    return (
+        jsonify(
+            {
+                "success": True,
+                "message": "Rating berhasil dibuat",
+                "data": rating.model_dump(),
+            }
+        ),
+        201,
+    )
+
+
+def _own_rating(current_user, product_id, rating_id, action):
+    """
+    Memeriksa rating ada pada produk tersebut dan milik buyer yang sedang
+    login. Mengembalikan response error, atau None jika valid.
+    """
+    rating = RatingService.get_rating(rating_id)
+
+    if not rating or rating.product_id != product_id:
+        return (
+            jsonify(
+                {
+                    "success": False,
+                    "message": f"Rating dengan ID {rating_id} tidak ditemukan",
+                }
+            ),
+            404,
+        )
+
+    if rating.buyer_id != current_user.id:
+        return (
+            jsonify(
+                {
+                    "success": False,
+                    "message": f"Anda tidak memiliki izin untuk {action} rating ini",
+                }
+            ),
+            403,
+        )
+
+    return None
+
+
+@product_bp.route("/<int:product_id>/ratings/<int:rating_id>", methods=["PUT"])
+@token_required
+@role_required("buyer")
+@handle_errors
+def update_product_rating(current_user, product_id, rating_id):
+    """
+    Endpoint untuk memperbarui rating.
+    Hanya buyer pemilik rating yang dapat memperbarui.
+    """
+    error = _own_rating(current_user, product_id, rating_id, "memperbarui")
+    if error:
+        return error
+
+    # Validasi data menggunakan schema
+    rating_data = RatingUpdate(**request.json)
+
+    rating = RatingService.update_rating(rating_id, rating_data)
+
+    return (
+        jsonify(
+            {
+                "success": True,
+                "message": "Rating berhasil diperbarui",
+                "data": rating.model_dump(),
+            }
+        ),
+        200,
+    )
+
+
+@product_bp.route("/<int:product_id>/ratings/<int:rating_id>", methods=["DELETE"])
+@token_required
+@role_required("buyer")
+@handle_errors
+def delete_product_rating(current_user, product_id, rating_id):
+    """
+    Endpoint untuk menghapus rating.
+    Hanya buyer pemilik rating yang dapat menghapus.
+    """
+    error = _own_rating(current_user, product_id, rating_id, "menghapus")
+    if error:
+        return error
+
+    if not RatingService.delete_rating(rating_id):
+        return jsonify({"success": False, "message": "Gagal menghapus rating"}), 500
+
+    return jsonify({"success": True, "message": "Rating berhasil dihapus"}), 200
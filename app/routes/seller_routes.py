@@ -0,0 +1,123 @@
+from datetime import date, timedelta
+from flask import Blueprint, request, jsonify
+from app.services.nearby_service import NearbyService
+from app.services.sales_service import SalesService
+from app.utils import chrono
+from app.utils.auth_middleware import token_required, role_required
+from app.utils.helpers import handle_errors
+from app.utils.response_cache import cached_response
+
+seller_bp = Blueprint("seller", __name__, url_prefix="/sellers")
+
+
+@seller_bp.route("/nearby", methods=["GET"])
+@cached_response
+@handle_errors
+def get_nearby_sellers():
+    """
+    Endpoint untuk mencari seller terdekat dari sebuah titik.
+    Parameter: lat, lng, radius_km (default 10, maksimum 50), limit.
+    """
+    sellers = NearbyService.find_sellers(
+        lat=request.args.get("lat", type=float),
+        lng=request.args.get("lng", type=float),
+        radius_km=request.args.get("radius_km", type=float),
+        limit=request.args.get("limit", type=int),
+    )
+
+    return (
+        jsonify(
+            {
+                "success": True,
+                "message": "Daftar seller terdekat berhasil diambil",
+                "count": len(sellers),
+                "data": [seller.model_dump() for seller in sellers],
+            }
+        ),
+        200,
+    )
+
+
+def _sales_range():
+    # Default 30 hari terakhir (UTC), format YYYY-MM-DD
+    today = chrono.now().date()
+    try:
+        end = date.fromisoformat(request.args.get("to", today.isoformat()))
+        start = date.fromisoformat(
+            request.args.get("from", (end - timedelta(days=29)).isoformat())
+        )
+    except ValueError:
+        raise ValueError("Parameter from dan to harus berformat YYYY-MM-DD")
+    return start, end
+
+
+def _no_seller_profile():
+    return (
+        jsonify({"success": False, "message": "Profil seller tidak ditemukan"}),
+        400,
+    )
+
+
+@seller_bp.route("/me/sales/daily", methods=["GET"])
+@token_required
+@role_required("seller")
+@handle_errors
+def get_daily_sales(current_user):
+    """
+    Endpoint dashboard: pendapatan, jumlah order, dan unit terjual per hari.
+    Parameter: from, to (YYYY-MM-DD, default 30 hari terakhir).
+    """
+    if not current_user.seller_profile_id:
+        return _no_seller_profile()
+
+    start, end = _sales_range()
+    days = SalesService.get_daily_sales(current_user.seller_profile_id, start, end)
+    return (
+        jsonify(
+            {
+                "success": True,
+                "message": "Penjualan harian berhasil diambil",
+                "summary": {
+                    "order_count": sum(day.order_count for day in days),
+                    "units_sold": sum(day.units_sold for day in days),
+                    "revenue": round(sum(day.revenue for day in days), 2),
+                },
+                "data": [day.model_dump(mode="json") for day in days],
+            }
+        ),
+        200,
+    )
+
+
+@seller_bp.route("/me/sales/products", methods=["GET"])
+@token_required
+@role_required("seller")
+@handle_errors
+def get_product_sales(current_user):
+    """
+    Endpoint dashboard: unit terjual dan pendapatan per produk, terlaris dulu.
+    Parameter: from, to (YYYY-MM-DD, default 30 hari terakhir),
+    sort (revenue/units, default revenue), limit (produk teratas).
+    """
+    if not current_user.seller_profile_id:
+        return _no_seller_profile()
+
+    start, end = _sales_range()
+    products = SalesService.get_product_sales(
+        current_user.seller_profile_id,
+        start,
+        end,
+        sort=request.args.get("sort", "revenue", type=str),
+        limit=request.args.get("limit", type=int),
+    )
+    return (
+        jsonify(
+            {
+                "success": True,
+                "message": "Penjualan per produk berhasil diambil",
+                "count": len(products),
+                "data": [product.model_dump() for product in products],
+            }
+        ),
+        200,
+    )
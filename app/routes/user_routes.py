@@ -1,7 +1,10 @@
 from flask import Blueprint, jsonify
 from app.utils.auth_middleware import token_required, role_required
+from app.services.job_service import JobService
 from app.services.user_service import UserService
 from app.utils.helpers import handle_errors
+from app.utils.identity_cache import identity_cache
+from app.utils.response_cache import response_cache
 
 user_bp = Blueprint("user", __name__, url_prefix="/users")
 
@@ -15,3 +18,36 @@ def get_current_user(current_user):
     """
     result, status_code = UserService.get_current_user_data(current_user)
     return jsonify(result), status_code
+
+
+@user_bp.route("/identity-cache/stats", methods=["GET"])
+@token_required
+@role_required("admin")
+@handle_errors
+def get_identity_cache_stats(current_user):
+    """
+    Endpoint untuk melihat statistik cache identitas worker ini (hanya admin)
+    """
+    return jsonify({"success": True, "data": identity_cache.stats()}), 200
+
+
+@user_bp.route("/response-cache/stats", methods=["GET"])
+@token_required
+@role_required("admin")
+@handle_errors
+def get_response_cache_stats(current_user):
+    """
+    Endpoint untuk melihat statistik cache response katalog worker ini (hanya admin)
+    """
+    return jsonify({"success": True, "data": response_cache.stats()}), 200
+
+
+@user_bp.route("/jobs/stats", methods=["GET"])
+@token_required
+@role_required("admin")
+@handle_errors
+def get_job_stats(current_user):
+    """
+    Endpoint untuk melihat kedalaman antrian dan latensi job background (hanya admin)
+    """
+    return jsonify({"success": True, "data": JobService.stats()}), 200
@@ -0,0 +1,113 @@
+from datetime import date, datetime
+from flask import Blueprint, request, jsonify
+from app.services.wallet_service import WalletService
+from app.utils import chrono
+from app.utils.auth_middleware import token_required, role_required
+from app.utils.helpers import handle_errors
+
+wallet_bp = Blueprint("wallet", __name__, url_prefix="/wallet")
+
+
+@wallet_bp.route("", methods=["GET"])
+@token_required
+@handle_errors
+def get_wallet(current_user):
+    """
+    Endpoint untuk melihat saldo wallet user yang sedang login.
+    Query param `at` (ISO 8601) untuk saldo pada waktu tertentu.
+    """
+    at = request.args.get("at")
+    if at:
+        try:
+            at = datetime.fromisoformat(at)
+        except ValueError:
+            raise ValueError("Format waktu tidak valid, gunakan ISO 8601")
+
+    wallet = WalletService.get_wallet(current_user.id, at=at or None)
+    return (
+        jsonify(
+            {
+                "success": True,
+                "message": "Saldo wallet berhasil diambil",
+                "data": wallet.model_dump(),
+            }
+        ),
+        200,
+    )
+
+
+@wallet_bp.route("/transactions", methods=["GET"])
+@token_required
+@handle_errors
+def get_wallet_transactions(current_user):
+    """
+    Endpoint untuk melihat riwayat transaksi wallet (terbaru dulu).
+    Hasil dipaginasi dengan cursor (parameter limit, cursor) dan dapat
+    difilter dengan transaction_type dan status.
+    """
+    page = WalletService.get_transactions(
+        current_user.id,
+        limit=request.args.get("limit", type=int),
+        cursor=request.args.get("cursor", type=str),
+        transaction_type=request.args.get("transaction_type", type=str),
+        status=request.args.get("status", type=str),
+    )
+    return (
+        jsonify(
+            {
+                "success": True,
+                "message": "Riwayat transaksi wallet berhasil diambil",
+                "count": len(page["items"]),
+                "next_cursor": page["next_cursor"],
+                "data": [transaction.model_dump() for transaction in page["items"]],
+            }
+        ),
+        200,
+    )
+
+
+def _parse_month(value, name):
+    try:
+        year, month = value.split("-")
+        return date(int(year), int(month), 1)
+    except (AttributeError, ValueError):
+        raise ValueError(f"Parameter {name} harus berformat YYYY-MM")
+
+
+@wallet_bp.route("/statement", methods=["GET"])
+@token_required
+@handle_errors
+def get_wallet_statement(current_user):
+    """
+    Endpoint untuk ringkasan statement wallet per bulan.
+    Query param `from` dan `to` berformat YYYY-MM (default bulan ini).
+    """
+    this_month = chrono.now().strftime("%Y-%m")
+    start_month = _parse_month(request.args.get("from", this_month), "from")
+    end_month = _parse_month(request.args.get("to", this_month), "to")
+
+    statement = WalletService.get_statement(current_user.id, start_month, end_month)
+    return (
+        jsonify(
+            {
+                "success": True,
+                "message": "Statement wallet berhasil diambil",
+                "data": statement.model_dump(mode="json"),
+            }
+        ),
+        200,
+    )
+
+
+@wallet_bp.route("/<int:user_id>/audit", methods=["GET"])
+@token_required
+@role_required("admin")
+@handle_errors
+def audit_wallet(current_user, user_id):
+    """
+    Endpoint untuk memeriksa saldo wallet terhadap ledger (hanya admin)
+    """
+    result = WalletService.audit(user_id)
+    if result is None:
+        return jsonify({"success": False, "message": "Wallet tidak ditemukan"}), 404
+    return jsonify({"success": True, "data": result}), 200
@@ -19,7 +19,7 @@ from app.schemas.rating_schema import (
     RatingUpdate,
     RatingResponse,
 )
-from app.schemas.profile_schema import BuyerProfileCreate, SellerProfileCreate
+# from app.schemas.profile_schema import BuyerProfileCreate, SellerProfileCreate
 
 # from app.schemas.auth_schema import UserCreate
 from app.schemas.user_schema import UserResponse, UserCreate
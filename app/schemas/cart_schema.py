@@ -0,0 +1,37 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime
+
+
+class CartItemCreate(BaseModel):
+    product_id: int
+    quantity: int = Field(default=1, ge=1)
+
+
+class CartItemsCreate(BaseModel):
+    items: List[CartItemCreate] = Field(min_length=1, max_length=100)
+
+
+class CartItemUpdate(BaseModel):
+    quantity: int = Field(ge=1)
+
+
+class CartItemResponse(BaseModel):
+    product_id: int
+    product_name: Optional[str] = None
+    image_url: Optional[str] = None
+    seller_id: Optional[int] = None
+    quantity: int
+    price: float
+    subtotal: float
+
+    class Config:
+        from_attributes = True
+
+
+class CartResponse(BaseModel):
+    buyer_id: int
+    total_amount: float = 0
+    item_count: int = 0
+    items: List[CartItemResponse] = []
+    updated_at: Optional[datetime] = None
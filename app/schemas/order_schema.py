@@ -1,3 +1,7 @@
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
+from datetime import datetime
+
 # from pydantic import BaseModel, Field
 # from typing import Optional, List
 # from datetime import datetime
@@ -47,3 +51,42 @@
 
 #     class Config:
 #         from_attributes = True
+
+
+PaymentMethod = Literal["cod", "qris", "transfer", "wallet"]
+
+
+class CheckoutRequest(BaseModel):
+    payment_method: PaymentMethod = "cod"
+    # Reference dari POST /cart/hold, jika stok sudah ditahan sebelumnya
+    hold_reference: Optional[str] = Field(default=None, max_length=64)
+
+
+class OrderStatusUpdate(BaseModel):
+    status: Literal["paid", "shipped", "done"]
+
+
+class OrderItemResponse(BaseModel):
+    product_id: int
+    product_name: Optional[str] = None
+    image_url: Optional[str] = None
+    quantity: int = Field(gt=0)
+    price: float
+
+    class Config:
+        from_attributes = True
+
+
+class OrderResponse(BaseModel):
+    id: int
+    buyer_id: int
+    seller_id: int
+    total_price: float
+    status: str
+    payment_method: str
+    is_paid: bool = False
+    created_at: datetime
+    items: List[OrderItemResponse] = []
+
+    class Config:
+        from_attributes = True
@@ -1,7 +1,15 @@
-from pydantic import BaseModel, Field, HttpUrl
-from typing import Optional, List
+from functools import lru_cache
+from pydantic import BaseModel, Field, HttpUrl, PlainSerializer, TypeAdapter, create_model
+from typing import Annotated, Dict, Optional, List, Tuple, Type
 from datetime import datetime
 
+from app.utils.chrono import http_date
+
+# Datetime dengan format yang sama seperti jsonify Flask (RFC 822)
+HttpDateTime = Annotated[
+    datetime, PlainSerializer(http_date, return_type=str, when_used="json")
+]
+
 
 class ProductBase(BaseModel):
     name: str
@@ -13,9 +21,19 @@ class ProductBase(BaseModel):
 
 class ProductCreate(ProductBase):
     seller_id: int
+    sku: Optional[str] = Field(default=None, min_length=1, max_length=64)
     image_url: Optional[List[str]] = None
 
 
+class ProductImportRow(ProductBase):
+    """
+    Satu baris file import produk (CSV/NDJSON), diidentifikasi dengan SKU seller
+    """
+
+    sku: str = Field(min_length=1, max_length=64)
+    image_url: Optional[str] = Field(default=None, max_length=255)
+
+
 class ProductUpdate(BaseModel):
     name: Optional[str] = None
     description: Optional[str] = None
@@ -29,10 +47,70 @@ class ProductUpdate(BaseModel):
 class ProductResponse(ProductBase):
     id: int
     seller_id: int
+    sku: Optional[str] = None
     # image_url: Optional[List[str]] = None
     # is_active: bool
     created_at: datetime
     updated_at: datetime
+    rating_avg: float = 0
+    rating_count: int = 0
+    # Hanya terisi jika dibaca dari objek Product
+    rating_histogram: Optional[Dict[int, int]] = None
+    image_status: Optional[str] = None
+    image_variants: Optional[Dict[str, str]] = None
 
     class Config:
         from_attributes = True
+
+
+class ProductListItem(ProductResponse):
+    """
+    Semua field yang bisa dipilih pada listing produk (parameter fields),
+    dengan format tanggal sama seperti jsonify
+    """
+
+    image_url: Optional[str] = None
+    created_at: HttpDateTime
+    updated_at: HttpDateTime
+
+
+PRODUCT_LIST_FIELDS = (
+    "id",
+    "name",
+    "description",
+    "price",
+    "stock",
+    "image_url",
+    "image_variants",
+    "category_id",
+    "seller_id",
+    "sku",
+    "rating_avg",
+    "rating_count",
+    "created_at",
+    "updated_at",
+)
+# Field default listing: cukup untuk kartu katalog
+DEFAULT_PRODUCT_LIST_FIELDS = ("id", "name", "price", "image_url", "seller_id")
+
+
+@lru_cache(maxsize=128)
+def product_list_model(fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """Model item listing yang hanya berisi field terpilih"""
+    definitions = {
+        name: (ProductListItem.model_fields[name].annotation, ProductListItem.model_fields[name])
+        for name in fields
+    }
+    return create_model("ProductListFields", **definitions)
+
+
+@lru_cache(maxsize=128)
+def product_list_adapter(fields: Tuple[str, ...]) -> TypeAdapter:
+    """
+    TypeAdapter untuk serialisasi batch satu halaman listing ke JSON bytes
+    """
+    return TypeAdapter(List[product_list_model(fields)])
+
+
+class NearbyProductResponse(ProductResponse):
+    distance_km: float
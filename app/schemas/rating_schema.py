@@ -3,9 +3,8 @@ from typing import Optional
 from datetime import datetime
 
 class RatingBase(BaseModel):
-    buyer_id: int
     product_id: int
-    order_id: int
+    order_id: Optional[int] = None
     rating: int = Field(ge=1, le=5)
     comment: Optional[str] = None
     
@@ -18,6 +17,7 @@ class RatingUpdate(BaseModel):
     
 class RatingResponse(RatingBase):
     id: int
+    buyer_id: int
     created_at: datetime
     updated_at: datetime
     
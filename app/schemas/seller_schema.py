@@ -0,0 +1,33 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import date
+
+
+class NearbySellerResponse(BaseModel):
+    id: int
+    shop_name: str
+    logo_url: Optional[str] = None
+    location_address: Optional[str] = None
+    location_lat: float
+    location_lng: float
+    is_verified: Optional[bool] = None
+    is_eco_friendly: Optional[bool] = None
+    is_supports_cod: Optional[bool] = None
+    distance_km: float
+
+    class Config:
+        from_attributes = True
+
+
+class DailySalesResponse(BaseModel):
+    day: date
+    order_count: int = 0
+    units_sold: int = 0
+    revenue: float = 0
+
+
+class ProductSalesResponse(BaseModel):
+    product_id: int
+    product_name: Optional[str] = None
+    units_sold: int
+    revenue: float
@@ -1,3 +1,7 @@
+from pydantic import BaseModel
+from typing import Dict, List, Literal, Optional
+from datetime import date, datetime
+
 # from pydantic import BaseModel, Field
 # from typing import Optional
 # from datetime import datetime
@@ -42,3 +46,47 @@
 
 #     class Config:
 #         from_attributes = True
+
+
+TransactionType = Literal["topup", "withdraw", "payment", "refund"]
+
+
+class WalletResponse(BaseModel):
+    user_id: int
+    balance: float
+    version: int
+    as_of: Optional[datetime] = None
+
+
+class WalletTransactionResponse(BaseModel):
+    id: int
+    wallet_id: int
+    transaction_type: TransactionType
+    amount: float
+    status: Optional[str] = None
+    balance_after: Optional[float] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class WalletTypeTotal(BaseModel):
+    transaction_count: int = 0
+    total_amount: float = 0
+
+
+class WalletMonthlySummary(BaseModel):
+    month: date
+    credit: float = 0
+    debit: float = 0
+    by_type: Dict[str, WalletTypeTotal] = {}
+
+
+class WalletStatementResponse(BaseModel):
+    user_id: int
+    start_month: date
+    end_month: date
+    opening_balance: float
+    closing_balance: float
+    months: List[WalletMonthlySummary]
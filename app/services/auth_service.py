@@ -1,12 +1,58 @@
-from app.utils.supabase_client import supabase_client
+import logging
+from app.utils.supabase_client import supabase_client, SupabaseUnavailableError
+from app.utils.auth_admin import get_auth_admin
 from app.utils.extensions import db
 from app.models.user import User, UserRole
 from app.models.buyer import BuyerProfile
 from app.models.seller import SellerProfile
-from app.utils.validators import UserValidator  # validasi data user
+from app.utils.validators import UserValidator, DUPLICATE_MESSAGES  # validasi data user
+from app.services.job_service import JobService
+from app.services.outbox_service import OutboxService
+from sqlalchemy.exc import IntegrityError
+
+logger = logging.getLogger(__name__)
+
+# Event outbox untuk menghapus user Supabase yang gagal dibuat di database lokal
+DELETE_SUPABASE_USER = "supabase.delete_user"
+# Job background untuk mengirim ulang email verifikasi
+RESEND_VERIFICATION_EMAIL = "auth.resend_verification"
+
+
+@OutboxService.handler(DELETE_SUPABASE_USER)
+def delete_supabase_user(payload):
+    """
+    Kompensasi registrasi gagal: hapus user dari Supabase Auth
+    """
+    get_auth_admin().delete_user(payload["supabase_uid"])
+
+
+# Prioritas di atas job lain: user sedang menunggu emailnya
+@JobService.job(RESEND_VERIFICATION_EMAIL, priority=10, timeout_seconds=60)
+def resend_verification(email):
+    """
+    Mengirim ulang email verifikasi melalui Supabase
+    """
+    supabase_client.auth.resend({"email": email, "type": "signup"})
 
 
 class AuthService:
+    def schedule_supabase_user_deletion(supabase_uid):
+        """
+        Menjadwalkan penghapusan user Supabase lewat outbox, supaya request
+        tidak menunggu admin API Supabase
+        """
+        try:
+            OutboxService.enqueue(
+                DELETE_SUPABASE_USER, {"supabase_uid": str(supabase_uid)}
+            )
+        except Exception as e:
+            db.session.rollback()
+            logger.error(
+                "Gagal menjadwalkan penghapusan user Supabase %s: %s",
+                supabase_uid,
+                e,
+            )
+
     def register_buyer(data):
         """
         Fungsi untuk registrasi buyer
@@ -35,30 +81,23 @@ class AuthService:
                 # Simpan UID untuk digunakan nanti
                 supabase_uid = auth_response.user.id
 
+            except SupabaseUnavailableError:
+                raise
             except Exception as supabase_error:
                 return {
                     "success": False,
                     "message": f"Error saat mendaftar di Supabase: {str(supabase_error)}",
                 }, 500
 
-            # 2. Buat user di database lokal
+            # 2. Buat user dan profil buyer di database lokal (satu flush)
             try:
-                # Mulai transaksi
-                db.session.begin_nested()
-
                 new_user = User(
                     email=data.get("email"),
                     supabase_uid=supabase_uid,
                     full_name=data.get("full_name"),
                     role=UserRole.BUYER,
                 )
-
-                db.session.add(new_user)
-                db.session.flush()  # Flush untuk mendapatkan ID
-
-                # 3. Buat profil buyer
-                buyer_profile = BuyerProfile(
-                    user_id=new_user.id,
+                new_user.buyer_profile = BuyerProfile(
                     username=data.get("username"),
                     address=data.get("address"),
                     phone_number=data.get("phone_number"),
@@ -66,28 +105,25 @@ class AuthService:
                     location_lng=data.get("location_lng"),
                 )
 
-                db.session.add(buyer_profile)
+                db.session.add(new_user)
                 db.session.commit()
 
             except Exception as e:
                 db.session.rollback()
 
                 # PENTING: Hapus user dari Supabase jika terjadi error
+                # (asinkron lewat outbox, dengan retry)
                 if supabase_uid:
-                    try:
-                        # Gunakan admin API untuk menghapus user
-                        supabase_client.auth.admin.delete_user(supabase_uid)
-                    except Exception as delete_error:
-                        # Log error penghapusan, tapi tetap lanjutkan untuk mengembalikan error utama
-                        print(
-                            f"Error saat menghapus user dari Supabase: {str(delete_error)}"
-                        )
-
-                # Jika error terjadi karena duplikasi
-                if "duplicate key" in str(e) or "unique constraint" in str(e):
+                    AuthService.schedule_supabase_user_deletion(supabase_uid)
+
+                # Jika error terjadi karena duplikasi (registrasi bersamaan)
+                if isinstance(e, IntegrityError):
+                    field = UserValidator.duplicate_field_from_error(e)
                     return {
                         "success": False,
-                        "message": "Email atau username sudah terdaftar di sistem",
+                        "message": DUPLICATE_MESSAGES.get(
+                            field, "Email atau username sudah terdaftar di sistem"
+                        ),
                     }, 400
 
                 return {
@@ -102,6 +138,8 @@ class AuthService:
                 "supabase_uid": str(supabase_uid),
             }, 201
 
+        except SupabaseUnavailableError:
+            raise
         except Exception as e:
             return {"success": False, "message": f"Terjadi kesalahan: {str(e)}"}, 500
 
@@ -133,30 +171,23 @@ class AuthService:
                 # Simpan UID untuk digunakan nanti
                 supabase_uid = auth_response.user.id
 
+            except SupabaseUnavailableError:
+                raise
             except Exception as supabase_error:
                 return {
                     "success": False,
                     "message": f"Error saat mendaftar di Supabase: {str(supabase_error)}",
                 }, 500
 
-            # 2. Buat user di database lokal
+            # 2. Buat user dan profil seller di database lokal (satu flush)
             try:
-                # Mulai transaksi
-                db.session.begin_nested()
-
                 new_user = User(
                     email=data.get("email"),
                     supabase_uid=supabase_uid,
                     full_name=data.get("full_name"),
                     role=UserRole.SELLER,
                 )
-
-                db.session.add(new_user)
-                db.session.flush()  # Flush untuk mendapatkan ID
-
-                # 3. Buat profil seller
-                seller_profile = SellerProfile(
-                    user_id=new_user.id,
+                new_user.seller_profile = SellerProfile(
                     shop_name=data.get("shop_name"),
                     description=data.get("description"),
                     logo_url=data.get("logo_url"),
@@ -170,28 +201,25 @@ class AuthService:
                     phone_number=data.get("phone_number"),
                 )
 
-                db.session.add(seller_profile)
+                db.session.add(new_user)
                 db.session.commit()
 
             except Exception as e:
                 db.session.rollback()
 
                 # PENTING: Hapus user dari Supabase jika terjadi error
+                # (asinkron lewat outbox, dengan retry)
                 if supabase_uid:
-                    try:
-                        # Gunakan admin API untuk menghapus user
-                        supabase_client.auth.admin.delete_user(supabase_uid)
-                    except Exception as delete_error:
-                        # Log error penghapusan, tapi tetap lanjutkan untuk mengembalikan error utama
-                        print(
-                            f"Error saat menghapus user dari Supabase: {str(delete_error)}"
-                        )
-
-                # Jika error terjadi karena duplikasi
-                if "duplicate key" in str(e) or "unique constraint" in str(e):
+                    AuthService.schedule_supabase_user_deletion(supabase_uid)
+
+                # Jika error terjadi karena duplikasi (registrasi bersamaan)
+                if isinstance(e, IntegrityError):
+                    field = UserValidator.duplicate_field_from_error(e)
                     return {
                         "success": False,
-                        "message": "Email sudah terdaftar di sistem",
+                        "message": DUPLICATE_MESSAGES.get(
+                            field, "Email sudah terdaftar di sistem"
+                        ),
                     }, 400
 
                 return {
@@ -206,9 +234,14 @@ class AuthService:
                 "supabase_uid": str(supabase_uid),
             }, 201
 
+        except SupabaseUnavailableError:
+            raise
         except Exception as e:
             return {"success": False, "message": f"Terjadi kesalahan: {str(e)}"}, 500
 
+    def _user_by_email(email):
+        return User.query.filter_by(email=email)
+
     def login_user(email, password):
         """
         Fungsi untuk login user
@@ -230,7 +263,7 @@ class AuthService:
                 }, 401
 
             # Ambil data user dari database lokal
-            user = User.query.filter_by(email=email).first()
+            user = AuthService._user_by_email(email).first()
 
             if not user:
                 return {
@@ -243,6 +276,8 @@ class AuthService:
 
             return response_data, 200
 
+        except SupabaseUnavailableError:
+            raise
         except Exception as e:
             return {"success": False, "message": f"Terjadi kesalahan: {str(e)}"}, 500
 
@@ -258,15 +293,16 @@ class AuthService:
             if not email:
                 return {"success": False, "message": "Email harus diisi"}, 400
 
-            # Kirim ulang email verifikasi melalui Supabase
-            supabase_client.auth.resend({"email": email, "type": "signup"})
+            # Pengiriman lewat Supabase dijalankan worker job, request tidak menunggu
+            resend_verification.delay(email=email)
 
             return {
                 "success": True,
-                "message": "Email verifikasi telah dikirim ulang. Silakan periksa kotak masuk Anda.",
-            }, 200
+                "message": "Email verifikasi akan segera dikirim ulang. Silakan periksa kotak masuk Anda.",
+            }, 202
 
         except Exception as e:
+            db.session.rollback()
             return {"success": False, "message": f"Terjadi kesalahan: {str(e)}"}, 500
 
     def logout_user():
@@ -284,6 +320,8 @@ class AuthService:
                 }
 
             return {"success": True, "message": "Logout berhasil"}
+        except SupabaseUnavailableError:
+            raise
         except Exception as e:
             return {
                 "success": False,
@@ -0,0 +1,314 @@
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import case, delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import contains_eager
+
+from app.models.cart import Cart
+from app.models.cart_item import CartItem
+from app.models.product import Product
+from app.schemas.cart_schema import CartItemResponse, CartResponse
+from app.services.reservation_service import ReservationService
+from app.utils.extensions import db
+from app.utils.money import to_money
+
+# Jumlah maksimum produk berbeda dalam satu keranjang
+MAX_CART_ITEMS = 100
+
+
+class CartService:
+    @staticmethod
+    def get_cart(buyer_id: int) -> CartResponse:
+        """
+        Mendapatkan keranjang buyer beserta item dan produknya dengan satu
+        query (JOIN), berapa pun jumlah itemnya. Buyer tanpa keranjang
+        mendapat keranjang kosong.
+        """
+        cart = (
+            db.session.execute(
+                select(Cart)
+                .outerjoin(Cart.cart_items)
+                .outerjoin(CartItem.product)
+                .options(
+                    contains_eager(Cart.cart_items)
+                    .contains_eager(CartItem.product)
+                    .load_only(
+                        Product.name, Product.image_url, Product.seller_id, raiseload=True
+                    )
+                )
+                .where(Cart.buyer_id == buyer_id)
+                .order_by(CartItem.id)
+            )
+            .unique()
+            .scalar_one_or_none()
+        )
+        if cart is None:
+            return CartResponse(buyer_id=buyer_id)
+
+        items = [
+            CartItemResponse(
+                product_id=item.product_id,
+                product_name=item.product.name,
+                image_url=item.product.image_url,
+                seller_id=item.product.seller_id,
+                quantity=item.quantity,
+                price=item.price,
+                subtotal=item.subtotal,
+            )
+            for item in cart.cart_items
+        ]
+        return CartResponse(
+            buyer_id=buyer_id,
+            total_amount=cart.total_amount or 0,
+            item_count=len(items),
+            items=items,
+            updated_at=cart.updated_at,
+        )
+
+    @staticmethod
+    def add_items(buyer_id: int, items: Iterable[Tuple[int, int]]) -> CartResponse:
+        """
+        Menambahkan item (product_id, quantity) ke keranjang. Produk yang
+        sudah ada di keranjang ditambah jumlahnya dengan harga yang tercatat
+        saat pertama kali ditambahkan. Harga semua produk diambil dengan satu
+        query IN, dan total keranjang ditambah selisihnya saja.
+        """
+        quantities: Dict[int, int] = {}
+        for product_id, quantity in items:
+            if quantity < 1:
+                raise ValueError("Jumlah produk minimal 1")
+            quantities[product_id] = quantities.get(product_id, 0) + quantity
+
+        try:
+            cart_id = CartService._lock_cart(buyer_id, create=True)
+
+            products = {
+                row.id: row
+                for row in db.session.execute(
+                    select(Product.id, Product.price, Product.stock).where(
+                        Product.id.in_(list(quantities))
+                    )
+                )
+            }
+            missing = sorted(set(quantities) - set(products))
+            if missing:
+                raise ValueError(
+                    f"Produk dengan ID {', '.join(map(str, missing))} tidak ditemukan"
+                )
+
+            existing = {
+                row.product_id: row
+                for row in db.session.execute(
+                    select(CartItem.product_id, CartItem.price, CartItem.quantity).where(
+                        CartItem.cart_id == cart_id,
+                        CartItem.product_id.in_(list(quantities)),
+                    )
+                )
+            }
+            item_count = db.session.scalar(
+                select(func.count(CartItem.id)).where(CartItem.cart_id == cart_id)
+            )
+            if item_count + len(set(quantities) - set(existing)) > MAX_CART_ITEMS:
+                raise ValueError(f"Keranjang maksimal berisi {MAX_CART_ITEMS} produk")
+
+            short = sorted(
+                product_id
+                for product_id, quantity in quantities.items()
+                if quantity + (existing[product_id].quantity if product_id in existing else 0)
+                > (products[product_id].stock or 0)
+            )
+            if short:
+                raise ValueError(
+                    f"Stok tidak mencukupi untuk produk ID {', '.join(map(str, short))}"
+                )
+
+            delta = Decimal("0")
+            if existing:
+                added = case(
+                    {product_id: quantities[product_id] for product_id in existing},
+                    value=CartItem.product_id,
+                )
+                db.session.execute(
+                    update(CartItem)
+                    .where(
+                        CartItem.cart_id == cart_id,
+                        CartItem.product_id.in_(list(existing)),
+                    )
+                    .values(
+                        quantity=CartItem.quantity + added,
+                        subtotal=CartItem.subtotal + CartItem.price * added,
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                delta += sum(
+                    to_money(row.price) * quantities[product_id]
+                    for product_id, row in existing.items()
+                )
+
+            new_rows = []
+            for product_id, quantity in quantities.items():
+                if product_id in existing:
+                    continue
+                price = to_money(products[product_id].price)
+                new_rows.append(
+                    {
+                        "cart_id": cart_id,
+                        "product_id": product_id,
+                        "quantity": quantity,
+                        "price": price,
+                        "subtotal": price * quantity,
+                    }
+                )
+                delta += price * quantity
+            if new_rows:
+                db.session.execute(insert(CartItem), new_rows)
+
+            CartService._adjust_total(cart_id, delta)
+            db.session.commit()
+        except ValueError:
+            db.session.rollback()
+            raise
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise Exception(f"Gagal menambahkan produk ke keranjang: {str(e)}")
+
+        return CartService.get_cart(buyer_id)
+
+    @staticmethod
+    def update_item(buyer_id: int, product_id: int, quantity: int) -> Optional[CartResponse]:
+        """
+        Mengubah jumlah satu produk di keranjang. Mengembalikan None jika
+        produk tidak ada di keranjang.
+        """
+        try:
+            cart_id = CartService._lock_cart(buyer_id)
+            item = None
+            if cart_id is not None:
+                item = db.session.execute(
+                    select(CartItem.price, CartItem.subtotal).where(
+                        CartItem.cart_id == cart_id, CartItem.product_id == product_id
+                    )
+                ).one_or_none()
+            if item is None:
+                db.session.rollback()
+                return None
+
+            stock = db.session.scalar(select(Product.stock).where(Product.id == product_id))
+            if quantity > (stock or 0):
+                raise ValueError(f"Stok tidak mencukupi untuk produk ID {product_id}")
+
+            db.session.execute(
+                update(CartItem)
+                .where(CartItem.cart_id == cart_id, CartItem.product_id == product_id)
+                .values(quantity=quantity, subtotal=CartItem.price * quantity)
+                .execution_options(synchronize_session=False)
+            )
+            CartService._adjust_total(
+                cart_id, to_money(item.price) * quantity - to_money(item.subtotal)
+            )
+            db.session.commit()
+        except ValueError:
+            db.session.rollback()
+            raise
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise Exception(f"Gagal memperbarui keranjang: {str(e)}")
+
+        return CartService.get_cart(buyer_id)
+
+    @staticmethod
+    def remove_item(buyer_id: int, product_id: int) -> Optional[CartResponse]:
+        """
+        Menghapus satu produk dari keranjang. Mengembalikan None jika
+        produk tidak ada di keranjang.
+        """
+        try:
+            cart_id = CartService._lock_cart(buyer_id)
+            subtotal = None
+            if cart_id is not None:
+                subtotal = db.session.scalar(
+                    delete(CartItem)
+                    .where(CartItem.cart_id == cart_id, CartItem.product_id == product_id)
+                    .returning(CartItem.subtotal)
+                    .execution_options(synchronize_session=False)
+                )
+            if subtotal is None:
+                db.session.rollback()
+                return None
+
+            CartService._adjust_total(cart_id, -to_money(subtotal))
+            db.session.commit()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise Exception(f"Gagal menghapus produk dari keranjang: {str(e)}")
+
+        return CartService.get_cart(buyer_id)
+
+    @staticmethod
+    def clear(buyer_id: int, commit: bool = True) -> None:
+        """
+        Mengosongkan keranjang buyer.
+        """
+        cart_id = db.session.scalar(select(Cart.id).where(Cart.buyer_id == buyer_id))
+        if cart_id is None:
+            return
+        db.session.execute(
+            delete(CartItem)
+            .where(CartItem.cart_id == cart_id)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.execute(
+            update(Cart)
+            .where(Cart.id == cart_id)
+            .values(total_amount=0)
+            .execution_options(synchronize_session=False)
+        )
+        if commit:
+            db.session.commit()
+
+    @staticmethod
+    def hold(buyer_id: int) -> Dict[str, Any]:
+        """
+        Menahan stok semua produk di keranjang buyer selama proses checkout
+        (lihat ReservationService.hold). Reference hold dikirim sebagai
+        hold_reference saat checkout.
+        """
+        items = db.session.execute(
+            select(CartItem.product_id, CartItem.quantity)
+            .join(Cart, Cart.id == CartItem.cart_id)
+            .where(Cart.buyer_id == buyer_id)
+        ).all()
+        if not items:
+            raise ValueError("Keranjang kosong")
+        return ReservationService.hold(items, buyer_id=buyer_id)
+
+    @staticmethod
+    def _lock_cart(buyer_id: int, create: bool = False) -> Optional[int]:
+        """
+        ID keranjang buyer, dikunci (FOR UPDATE) sampai akhir transaksi
+        supaya perubahan item dan total pada keranjang yang sama berurutan.
+        """
+        query = select(Cart.id).where(Cart.buyer_id == buyer_id).with_for_update()
+        cart_id = db.session.scalar(query)
+        if cart_id is not None or not create:
+            return cart_id
+
+        try:
+            with db.session.begin_nested():
+                cart = Cart(buyer_id=buyer_id, total_amount=0)
+                db.session.add(cart)
+            return cart.id
+        except IntegrityError:
+            # Keranjang dibuat bersamaan oleh request lain
+            return db.session.scalar(query)
+
+    @staticmethod
+    def _adjust_total(cart_id: int, delta: Decimal) -> None:
+        # Total diubah dengan selisih, tanpa menjumlahkan ulang semua item
+        db.session.execute(
+            update(Cart)
+            .where(Cart.id == cart_id)
+            .values(total_amount=Cart.total_amount + delta)
+            .execution_options(synchronize_session=False)
+        )
@@ -5,9 +5,11 @@ from app.schemas.category_schema import (
     CategoryResponse,
     CategoryWithProductsResponse,
 )
+from app.models.product import Product
 from app.utils.extensions import db
+from sqlalchemy import func, select, update
 from sqlalchemy.exc import SQLAlchemyError
-from typing import Dict, Any, Tuple, List
+from typing import Dict, Any, Iterable, Optional, Tuple, List
 import datetime
 
 
@@ -56,16 +58,12 @@ class CategoryService:
         Mendapatkan daftar semua kategori.
         """
         try:
-            categories = Category.query.all()
-
-            # Menambahkan jumlah produk untuk setiap kategori
-            result = []
-            for category in categories:
-                category_data = CategoryResponse.model_validate(category).model_dump()
-                category_data["product_count"] = (
-                    len(category.products) if hasattr(category, "products") else 0
-                )
-                result.append(category_data)
+            # product_count dibaca dari kolom counter, cukup satu query
+            categories = Category.query.order_by(Category.id).all()
+            result = [
+                CategoryResponse.model_validate(category).model_dump()
+                for category in categories
+            ]
 
             return {
                 "success": True,
@@ -89,11 +87,7 @@ class CategoryService:
                     "message": f"Kategori dengan ID {category_id} tidak ditemukan",
                 }, 404
 
-            # Menambahkan jumlah produk
             category_data = CategoryResponse.model_validate(category).model_dump()
-            category_data["product_count"] = (
-                len(category.products) if hasattr(category, "products") else 0
-            )
 
             return {
                 "success": True,
@@ -169,11 +163,7 @@ class CategoryService:
 
             db.session.commit()
 
-            # Menambahkan jumlah produk
             category_response = CategoryResponse.model_validate(category).model_dump()
-            category_response["product_count"] = (
-                len(category.products) if hasattr(category, "products") else 0
-            )
 
             return {
                 "success": True,
@@ -204,10 +194,10 @@ class CategoryService:
                 }, 404
 
             # Cek apakah kategori memiliki produk
-            if hasattr(category, "products") and len(category.products) > 0:
+            if category.product_count > 0:
                 return {
                     "success": False,
-                    "message": f"Kategori tidak dapat dihapus karena masih memiliki {len(category.products)} produk",
+                    "message": f"Kategori tidak dapat dihapus karena masih memiliki {category.product_count} produk",
                 }, 400
 
             # Hapus kategori
@@ -224,6 +214,41 @@ class CategoryService:
         except Exception as e:
             return {"success": False, "message": f"Terjadi kesalahan: {str(e)}"}, 500
 
+    @staticmethod
+    def adjust_product_counts(deltas: Dict[int, int]) -> None:
+        """
+        Menambah/mengurangi product_count beberapa kategori secara atomik
+        ({category_id: selisih}). Dipanggil sebelum commit oleh pemanggil,
+        dalam transaksi yang sama dengan perubahan produk.
+        """
+        for category_id, delta in deltas.items():
+            if category_id is None or not delta:
+                continue
+            db.session.execute(
+                update(Category)
+                .where(Category.id == category_id)
+                .values(product_count=Category.product_count + delta)
+                .execution_options(synchronize_session=False)
+            )
+
+    @staticmethod
+    def recount_products(category_ids: Optional[Iterable[int]] = None) -> int:
+        """
+        Menghitung ulang product_count dari tabel produk (semua kategori atau
+        kategori tertentu). Commit oleh pemanggil. Mengembalikan jumlah
+        kategori yang diperbarui.
+        """
+        count_query = (
+            select(func.count(Product.id))
+            .where(Product.category_id == Category.id)
+            .scalar_subquery()
+        )
+        stmt = update(Category).values(product_count=count_query)
+        if category_ids is not None:
+            stmt = stmt.where(Category.id.in_(list(category_ids)))
+        result = db.session.execute(stmt.execution_options(synchronize_session=False))
+        return result.rowcount
+
     # @staticmethod
     # def seed_categories() -> None:
     #     """
@@ -0,0 +1,175 @@
+import hashlib
+import io
+import os
+import tempfile
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from flask import current_app
+from PIL import Image, ImageOps, UnidentifiedImageError
+from sqlalchemy import select, update
+
+from app.models.product import Product
+from app.services.job_service import JobService
+from app.services.outbox_service import OutboxService
+from app.utils.extensions import db
+from app.utils.image_storage import get_image_storage
+from app.utils.response_cache import invalidate_after_commit
+
+# Job background untuk membuat varian gambar produk
+PROCESS_PRODUCT_IMAGE = "product.process_image"
+
+# Varian WebP yang dibuat: nama -> sisi terpanjang (pixel), dari besar ke kecil
+IMAGE_VARIANTS = (("large", 1200), ("medium", 600), ("thumb", 200))
+# Varian yang dipakai sebagai image_url produk
+PRIMARY_VARIANT = "large"
+WEBP_QUALITY = 80
+
+
+@JobService.job(PROCESS_PRODUCT_IMAGE, timeout_seconds=120)
+def process_product_image(content_hash):
+    """
+    Membuat varian gambar dari file upload dan memasangnya ke produk
+    """
+    ImageService.process_image(content_hash)
+
+
+@OutboxService.handler(PROCESS_PRODUCT_IMAGE)
+def process_product_image_event(payload):
+    """
+    Event outbox gambar yang dijadwalkan sebelum antrian job dipakai
+    """
+    ImageService.process_image(payload["content_hash"])
+
+
+def _variant_path(content_hash: str, name: str) -> str:
+    return f"products/{content_hash[:2]}/{content_hash}/{name}.webp"
+
+
+def _spool_path(content_hash: str) -> str:
+    return os.path.join(current_app.config["IMAGE_SPOOL_DIR"], content_hash)
+
+
+def _render_variants(data: bytes) -> Iterator[Tuple[str, bytes]]:
+    """
+    Menghasilkan (nama varian, bytes WebP) dari gambar asli. Setiap varian
+    diperkecil dari varian sebelumnya, bukan dari gambar asli.
+    """
+    largest = IMAGE_VARIANTS[0][1]
+    with Image.open(io.BytesIO(data)) as original:
+        # JPEG bisa langsung di-decode pada skala kecil (1/2, 1/4, 1/8)
+        original.draft("RGB", (largest, largest))
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ("RGB", "RGBA"):
+            has_alpha = image.mode in ("LA", "PA") or "transparency" in image.info
+            image = image.convert("RGBA" if has_alpha else "RGB")
+
+        for name, size in IMAGE_VARIANTS:
+            image.thumbnail((size, size), Image.Resampling.LANCZOS)
+            buffer = io.BytesIO()
+            image.save(buffer, "WEBP", quality=WEBP_QUALITY, method=4)
+            yield name, buffer.getvalue()
+
+
+class ImageService:
+    @staticmethod
+    def submit_product_image(product_id: int, file_data: bytes) -> Optional[Dict[str, Any]]:
+        """
+        Menerima upload gambar produk tanpa memprosesnya di dalam request:
+        file disimpan sementara di IMAGE_SPOOL_DIR, produk ditandai pending,
+        dan pembuatan varian dijadwalkan sebagai job background. Gambar dengan konten
+        yang sama dengan gambar yang sudah diproses langsung memakai varian
+        yang ada.
+
+        Returns:
+            Dictionary berisi image_status, image_hash, dan image_variants,
+            atau None jika produk tidak ditemukan
+        """
+        if len(file_data) > current_app.config["IMAGE_MAX_UPLOAD_BYTES"]:
+            raise ValueError("Ukuran gambar melebihi batas maksimum")
+        try:
+            # verify() hanya membaca header dan struktur file, tanpa decode pixel
+            with Image.open(io.BytesIO(file_data)) as image:
+                image.verify()
+        except (UnidentifiedImageError, OSError, SyntaxError):
+            raise ValueError("File bukan gambar yang valid")
+
+        product = db.session.get(Product, product_id)
+        if not product:
+            return None
+
+        content_hash = hashlib.sha256(file_data).hexdigest()
+
+        # Dedup: konten yang sama sudah pernah diproses
+        variants = db.session.scalar(
+            select(Product.image_variants)
+            .where(Product.image_hash == content_hash, Product.image_status == "ready")
+            .limit(1)
+        )
+        product.image_hash = content_hash
+        if variants:
+            product.image_variants = variants
+            product.image_url = variants[PRIMARY_VARIANT]
+            product.image_status = "ready"
+            db.session.commit()
+            return ImageService._status(product)
+
+        ImageService._spool(content_hash, file_data)
+        product.image_status = "pending"
+        # delay ikut meng-commit status pending produk
+        process_product_image.delay(content_hash=content_hash)
+        return ImageService._status(product)
+
+    @staticmethod
+    def process_image(content_hash: str) -> None:
+        """
+        Membuat dan menyimpan varian WebP untuk satu konten gambar, lalu
+        memasang URL-nya ke semua produk yang menunggu konten tersebut.
+        Commit oleh pemanggil (worker job).
+        """
+        storage = get_image_storage()
+        paths = {name: _variant_path(content_hash, name) for name, _ in IMAGE_VARIANTS}
+
+        # Varian terakhir ditulis paling akhir: jika ada, semua varian sudah ada
+        if not storage.exists(paths[IMAGE_VARIANTS[-1][0]]):
+            with open(_spool_path(content_hash), "rb") as f:
+                data = f.read()
+            for name, webp in _render_variants(data):
+                storage.put(paths[name], webp, "image/webp")
+
+        variants = {name: storage.public_url(path) for name, path in paths.items()}
+        db.session.execute(
+            update(Product)
+            .where(Product.image_hash == content_hash, Product.image_status == "pending")
+            .values(
+                image_variants=variants,
+                image_url=variants[PRIMARY_VARIANT],
+                image_status="ready",
+            )
+            .execution_options(synchronize_session=False)
+        )
+        invalidate_after_commit()
+
+        try:
+            os.remove(_spool_path(content_hash))
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def _spool(content_hash: str, data: bytes) -> None:
+        path = _spool_path(content_hash)
+        if os.path.exists(path):
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+    @staticmethod
+    def _status(product: Product) -> Dict[str, Any]:
+        return {
+            "image_status": product.image_status,
+            "image_hash": product.image_hash,
+            "image_variants": product.image_variants,
+        }
+
@@ -0,0 +1,397 @@
+import logging
+import os
+import random
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from sqlalchemy import case, delete, event, func, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.models.job import Job
+from app.utils import chrono
+from app.utils.extensions import db
+
+logger = logging.getLogger(__name__)
+
+RETRY_BASE_SECONDS = 5
+RETRY_MAX_SECONDS = 3600
+# Rentang job selesai yang dihitung untuk metrik latensi
+STATS_WINDOW_SECONDS = 3600
+STATS_SAMPLE_SIZE = 1000
+
+# Penanda sesi: ada job baru yang perlu dibangunkan worker setelah commit
+_PENDING_KEY = "jobs_enqueued"
+
+
+class _JobSpec(NamedTuple):
+    func: Callable[..., None]
+    priority: int
+    max_attempts: int
+    timeout_seconds: int
+
+
+def _seconds(later, earlier) -> float:
+    # SQLite mengembalikan datetime naive, Postgres aware
+    return (later.replace(tzinfo=None) - earlier.replace(tzinfo=None)).total_seconds()
+
+
+def _summary(values: List[float]) -> Dict[str, Optional[float]]:
+    if not values:
+        return {"avg": None, "p95": None, "max": None}
+    values = sorted(values)
+    return {
+        "avg": round(sum(values) / len(values), 3),
+        "p95": round(values[min(len(values) - 1, int(len(values) * 0.95))], 3),
+        "max": round(values[-1], 3),
+    }
+
+
+class JobService:
+    _jobs: Dict[str, _JobSpec] = {}
+
+    @staticmethod
+    def job(
+        name: str, priority: int = 0, max_attempts: int = 5, timeout_seconds: int = 300
+    ):
+        """
+        Decorator untuk mendaftarkan fungsi sebagai job background. Fungsi
+        dipanggil dengan payload sebagai argumen keyword, dan mendapat
+        atribut delay(**payload) untuk menjadwalkannya. Perubahan database
+        di dalam job di-commit oleh worker bersama status job.
+        """
+
+        def decorator(f):
+            JobService._jobs[name] = _JobSpec(f, priority, max_attempts, timeout_seconds)
+            f.delay = lambda **payload: JobService.enqueue(name, payload)
+            return f
+
+        return decorator
+
+    @staticmethod
+    def enqueue(
+        name: str,
+        payload: Dict[str, Any],
+        priority: Optional[int] = None,
+        delay_seconds: float = 0,
+        commit: bool = True,
+    ) -> Job:
+        """
+        Menyimpan job ke antrian. Dengan commit=False job ikut transaksi
+        pemanggil dan baru terlihat worker setelah transaksi itu di-commit.
+        """
+        spec = JobService._jobs.get(name)
+        if spec is None:
+            raise LookupError(f"Job {name} tidak terdaftar")
+
+        job = Job(
+            name=name,
+            payload=payload,
+            priority=spec.priority if priority is None else priority,
+            status="queued",
+            attempts=0,
+            max_attempts=spec.max_attempts,
+            timeout_seconds=spec.timeout_seconds,
+            run_at=chrono.now() + timedelta(seconds=delay_seconds),
+        )
+        db.session.add(job)
+        db.session.info[_PENDING_KEY] = True
+        if commit:
+            db.session.commit()
+        return job
+
+    @staticmethod
+    def _due_query(now, limit: int):
+        return (
+            select(Job.id, Job.timeout_seconds)
+            .where(Job.status == "queued", Job.run_at <= now)
+            .order_by(Job.priority.desc(), Job.run_at, Job.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+
+    @staticmethod
+    def _recent_done_query(now):
+        return (
+            select(Job.created_at, Job.started_at, Job.finished_at)
+            .where(
+                Job.status == "done",
+                Job.finished_at >= now - timedelta(seconds=STATS_WINDOW_SECONDS),
+            )
+            .order_by(Job.finished_at.desc())
+            .limit(STATS_SAMPLE_SIZE)
+        )
+
+    @staticmethod
+    def claim(worker_id: str, limit: int = 1) -> List[Dict[str, Any]]:
+        """
+        Mengambil sampai `limit` job jatuh tempo dengan prioritas tertinggi
+        dan menandainya running sampai visibility timeout. Job running yang
+        melewati timeout-nya (worker mati atau macet) dikembalikan ke
+        antrian, atau ditandai failed jika percobaannya sudah habis.
+        """
+        now = chrono.now()
+        exhausted = Job.attempts >= Job.max_attempts
+        db.session.execute(
+            update(Job)
+            .where(Job.status == "running", Job.run_at <= now)
+            .values(
+                status=case((exhausted, "failed"), else_="queued"),
+                finished_at=case((exhausted, now), else_=None),
+                last_error="Melewati batas waktu proses",
+                locked_by=None,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+        due = db.session.execute(JobService._due_query(now, limit)).all()
+        if not due:
+            db.session.commit()
+            return []
+
+        # UPDATE bersyarat: job yang sudah diambil worker lain terlewati
+        claimed = db.session.execute(
+            update(Job)
+            .where(Job.id.in_([row.id for row in due]), Job.status == "queued")
+            .values(
+                status="running",
+                attempts=Job.attempts + 1,
+                locked_by=worker_id,
+                started_at=now,
+                run_at=case(
+                    {
+                        row.id: now + timedelta(seconds=row.timeout_seconds)
+                        for row in due
+                    },
+                    value=Job.id,
+                ),
+            )
+            .returning(Job.id, Job.name, Job.payload, Job.attempts, Job.max_attempts)
+            .execution_options(synchronize_session=False)
+        ).all()
+        db.session.commit()
+        # RETURNING tidak menjamin urutan; kembalikan sesuai prioritas
+        position = {row.id: index for index, row in enumerate(due)}
+        return sorted((row._asdict() for row in claimed), key=lambda job: position[job["id"]])
+
+    @staticmethod
+    def run(job: Dict[str, Any], worker_id: str) -> bool:
+        """
+        Menjalankan satu job hasil claim. Job yang gagal dijadwalkan ulang
+        dengan exponential backoff sampai max_attempts, lalu ditandai
+        failed. Mengembalikan True jika job berhasil.
+        """
+        # Hanya pemegang job yang boleh mengubah statusnya; jika timeout
+        # terlewati dan job sudah diambil worker lain, hasilnya dibuang
+        owned = (
+            Job.id == job["id"],
+            Job.status == "running",
+            Job.locked_by == worker_id,
+            Job.attempts == job["attempts"],
+        )
+        spec = JobService._jobs.get(job["name"])
+        try:
+            if spec is None:
+                raise LookupError(f"Job {job['name']} tidak terdaftar")
+            spec.func(**job["payload"])
+            finished = db.session.execute(
+                update(Job)
+                .where(*owned)
+                .values(
+                    status="done", finished_at=chrono.now(), locked_by=None, last_error=None
+                )
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            if not finished:
+                db.session.rollback()
+                logger.warning("Job %s (%s) sudah diambil worker lain", job["id"], job["name"])
+                return False
+            db.session.commit()
+            return True
+        except Exception as e:
+            db.session.rollback()
+            values = {"locked_by": None, "last_error": str(e)}
+            if job["attempts"] >= job["max_attempts"]:
+                values.update(status="failed", finished_at=chrono.now())
+                logger.error("Job %s (%s) gagal permanen: %s", job["id"], job["name"], e)
+            else:
+                delay = min(RETRY_BASE_SECONDS * 2 ** (job["attempts"] - 1), RETRY_MAX_SECONDS)
+                delay = delay * random.uniform(0.8, 1.2)
+                values.update(status="queued", run_at=chrono.now() + timedelta(seconds=delay))
+                logger.warning(
+                    "Job %s (%s) gagal, dicoba lagi dalam %.0f detik: %s",
+                    job["id"],
+                    job["name"],
+                    delay,
+                    e,
+                )
+            db.session.execute(
+                update(Job)
+                .where(*owned)
+                .values(values)
+                .execution_options(synchronize_session=False)
+            )
+            db.session.commit()
+            return False
+
+    @staticmethod
+    def process_due(worker_id: Optional[str] = None, limit: int = 20) -> int:
+        """
+        Mengambil dan menjalankan job jatuh tempo secara berurutan di thread
+        ini. Mengembalikan jumlah job yang dijalankan (berhasil maupun gagal).
+        """
+        worker_id = worker_id or _worker_id()
+        jobs = JobService.claim(worker_id, limit)
+        for job in jobs:
+            JobService.run(job, worker_id)
+        return len(jobs)
+
+    @staticmethod
+    def stats() -> Dict[str, Any]:
+        """
+        Kedalaman antrian (per status dan per prioritas), jumlah dan umur
+        job jatuh tempo tertua, serta latensi job yang selesai dalam satu
+        jam terakhir: wait (dibuat sampai mulai, termasuk backoff retry)
+        dan run (lama proses), dalam detik.
+        """
+        now = chrono.now()
+        counts = dict(
+            db.session.execute(select(Job.status, func.count(Job.id)).group_by(Job.status)).all()
+        )
+        queued_by_priority = {
+            priority: count
+            for priority, count in db.session.execute(
+                select(Job.priority, func.count(Job.id))
+                .where(Job.status == "queued")
+                .group_by(Job.priority)
+                .order_by(Job.priority.desc())
+            )
+        }
+        due, oldest_due = db.session.execute(
+            select(func.count(Job.id), func.min(Job.run_at)).where(
+                Job.status == "queued", Job.run_at <= now
+            )
+        ).one()
+
+        recent = db.session.execute(JobService._recent_done_query(now)).all()
+
+        return {
+            "counts": counts,
+            "queued_by_priority": queued_by_priority,
+            "due": due,
+            "oldest_due_seconds": _seconds(now, oldest_due) if oldest_due else None,
+            "recent_done": len(recent),
+            "wait_seconds": _summary([_seconds(row.started_at, row.created_at) for row in recent]),
+            "run_seconds": _summary([_seconds(row.finished_at, row.started_at) for row in recent]),
+        }
+
+    @staticmethod
+    def purge(days: int = 7) -> int:
+        """
+        Menghapus job done/failed yang selesai lebih dari `days` hari lalu.
+        Mengembalikan jumlah job yang dihapus.
+        """
+        cutoff = chrono.now() - timedelta(days=days)
+        deleted = db.session.execute(
+            delete(Job)
+            .where(Job.status.in_(("done", "failed")), Job.finished_at < cutoff)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.session.commit()
+        return deleted
+
+
+def _worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class JobWorker:
+    """
+    Dispatcher job background: satu thread mengambil job dari tabel jobs
+    dan menjalankannya di thread pool. Dimulai saat request pertama di
+    setiap proses worker (JOB_WORKER_ENABLED), atau di foreground lewat
+    `flask jobs worker`. Job baru membangunkan dispatcher di proses yang
+    sama segera setelah commit, tanpa menunggu polling.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._in_flight = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        if app.config.get("JOB_WORKER_ENABLED"):
+            app.before_request(self.start)
+
+    def start(self) -> None:
+        # Thread tidak ikut ter-fork, mulai ulang per proses
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._lock:
+            if self._pid == pid:
+                return
+            self._pid = pid
+            thread = threading.Thread(target=self.run, name="job-dispatcher", daemon=True)
+            thread.start()
+
+    def notify(self) -> None:
+        self._wakeup.set()
+
+    def run(self, threads: Optional[int] = None, poll_seconds: Optional[float] = None) -> None:
+        threads = threads or self.app.config.get("JOB_WORKER_THREADS", 2)
+        interval = poll_seconds or self.app.config.get("JOB_POLL_SECONDS", 1)
+        worker_id = _worker_id()
+        executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="job-worker")
+
+        while True:
+            self._wakeup.clear()
+            free = threads - self._in_flight
+            jobs = []
+            if free > 0:
+                with self.app.app_context():
+                    try:
+                        jobs = JobService.claim(worker_id, free)
+                    except SQLAlchemyError as e:
+                        db.session.rollback()
+                        logger.warning("Gagal mengambil job: %s", e)
+            for job in jobs:
+                with self._lock:
+                    self._in_flight += 1
+                executor.submit(self._run, job, worker_id)
+            # Dibangunkan lebih awal oleh job baru atau slot yang kosong
+            self._wakeup.wait(interval)
+
+    def _run(self, job: Dict[str, Any], worker_id: str) -> None:
+        with self.app.app_context():
+            try:
+                JobService.run(job, worker_id)
+            except Exception as e:
+                db.session.rollback()
+                logger.warning("Gagal menjalankan job %s: %s", job["id"], e)
+        with self._lock:
+            self._in_flight -= 1
+        # Slot kosong: ambil job berikutnya
+        self._wakeup.set()
+
+
+job_worker = JobWorker()
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_job_worker(session):
+    if session.info.pop(_PENDING_KEY, False):
+        job_worker.notify()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_job_notification(session):
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,148 @@
+from typing import List, Optional, Tuple
+
+from sqlalchemy import case, or_, select
+
+from app.models.product import Product
+from app.models.seller import SellerProfile
+from app.schemas.product_schema import NearbyProductResponse
+from app.schemas.seller_schema import NearbySellerResponse
+from app.utils.extensions import db
+from app.utils.geo import bounding_box, covering_cells, haversine_km, prefix_range
+from app.utils.pagination import parse_limit
+
+DEFAULT_RADIUS_KM = 10.0
+MAX_RADIUS_KM = 50.0
+# Jumlah seller per query saat mengambil produk dari seller terdekat dulu
+SELLER_BATCH_SIZE = 200
+
+_SELLER_COLUMNS = (
+    SellerProfile.id,
+    SellerProfile.shop_name,
+    SellerProfile.logo_url,
+    SellerProfile.location_address,
+    SellerProfile.location_lat,
+    SellerProfile.location_lng,
+    SellerProfile.is_verified,
+    SellerProfile.is_eco_friendly,
+    SellerProfile.is_supports_cod,
+)
+
+
+def _validate_point(lat: Optional[float], lng: Optional[float], radius_km: Optional[float]):
+    if lat is None or lng is None:
+        raise ValueError("Parameter lat dan lng harus diisi")
+    if not -90 <= lat <= 90 or not -180 <= lng <= 180:
+        raise ValueError("Koordinat lat/lng tidak valid")
+
+    radius_km = DEFAULT_RADIUS_KM if radius_km is None else radius_km
+    if not 0 < radius_km <= MAX_RADIUS_KM:
+        raise ValueError(f"radius_km harus antara 0 dan {MAX_RADIUS_KM:g}")
+    return radius_km
+
+
+class NearbyService:
+    @staticmethod
+    def _candidates_query(lat: float, lng: float, radius_km: float):
+        """Kandidat seller di sel geohash dan bounding box sekitar titik"""
+        min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, radius_km)
+        cell_filters = [
+            SellerProfile.geohash.between(*prefix_range(cell))
+            for cell in covering_cells(lat, lng, radius_km)
+        ]
+        return select(*_SELLER_COLUMNS).where(
+            or_(*cell_filters),
+            SellerProfile.location_lat.between(min_lat, max_lat),
+            SellerProfile.location_lng.between(min_lng, max_lng),
+        )
+
+    @staticmethod
+    def _products_query(seller_ids: List[int], category_id: Optional[int], limit: int):
+        """Produk dari seller_ids, urut sesuai urutan seller (sudah urut jarak)"""
+        rank = case(
+            {seller_id: index for index, seller_id in enumerate(seller_ids)},
+            value=Product.seller_id,
+        )
+        query = (
+            select(*Product.__table__.columns)
+            .where(Product.seller_id.in_(seller_ids))
+            .order_by(rank, Product.id)
+            .limit(limit)
+        )
+        if category_id:
+            query = query.where(Product.category_id == category_id)
+        return query
+
+    @staticmethod
+    def _sellers_within(lat: float, lng: float, radius_km: float) -> List[Tuple]:
+        """
+        Seller dalam radius, urut dari yang terdekat: (row, distance_km).
+
+        Kandidat diambil dengan rentang geohash (index) dan bounding box,
+        lalu jarak persisnya dihitung dengan haversine.
+        """
+        rows = db.session.execute(NearbyService._candidates_query(lat, lng, radius_km)).all()
+
+        result = []
+        for row in rows:
+            distance = haversine_km(lat, lng, row.location_lat, row.location_lng)
+            if distance <= radius_km:
+                result.append((row, distance))
+        result.sort(key=lambda item: (item[1], item[0].id))
+        return result
+
+    @staticmethod
+    def find_sellers(
+        lat: Optional[float],
+        lng: Optional[float],
+        radius_km: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> List[NearbySellerResponse]:
+        """
+        Mencari seller dalam radius_km dari titik (lat, lng), diurutkan
+        berdasarkan jarak.
+        """
+        radius_km = _validate_point(lat, lng, radius_km)
+        limit = parse_limit(limit)
+
+        sellers = NearbyService._sellers_within(lat, lng, radius_km)[:limit]
+        return [
+            NearbySellerResponse(**row._asdict(), distance_km=round(distance, 3))
+            for row, distance in sellers
+        ]
+
+    @staticmethod
+    def find_products(
+        lat: Optional[float],
+        lng: Optional[float],
+        radius_km: Optional[float] = None,
+        category_id: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> List[NearbyProductResponse]:
+        """
+        Mencari produk dari seller dalam radius_km, diurutkan berdasarkan
+        jarak seller. Produk diambil per batch seller mulai dari yang
+        terdekat sampai limit terpenuhi.
+        """
+        radius_km = _validate_point(lat, lng, radius_km)
+        limit = parse_limit(limit)
+
+        sellers = NearbyService._sellers_within(lat, lng, radius_km)
+        results = []
+        for start in range(0, len(sellers), SELLER_BATCH_SIZE):
+            batch = sellers[start : start + SELLER_BATCH_SIZE]
+            distances = {row.id: distance for row, distance in batch}
+
+            query = NearbyService._products_query(
+                [row.id for row, _ in batch], category_id, limit - len(results)
+            )
+            for row in db.session.execute(query):
+                results.append((distances[row.seller_id], row))
+
+            # Batch berikutnya pasti lebih jauh, cukup jika limit sudah terpenuhi
+            if len(results) >= limit:
+                break
+
+        return [
+            NearbyProductResponse(**row._asdict(), distance_km=round(distance, 3))
+            for distance, row in results
+        ]
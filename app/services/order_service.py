@@ -0,0 +1,342 @@
+from collections import defaultdict
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert, or_, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import selectinload
+
+from app.models.cart_item import CartItem
+from app.models.order import Order
+from app.models.order_item import OrderItem
+from app.models.product import Product
+from app.schemas.order_schema import OrderItemResponse, OrderResponse
+from app.services.cart_service import CartService
+from app.services.reservation_service import InsufficientStockError, ReservationService
+from app.services.sales_service import SALES_STATUSES, SalesService
+from app.services.wallet_service import WalletConflictError, WalletService
+from app.utils import chrono
+from app.utils.extensions import db
+from app.utils.money import to_money
+from app.utils.pagination import (
+    decode_cursor,
+    encode_cursor,
+    keyset_condition,
+    keyset_order_by,
+    parse_limit,
+)
+from app.utils.response_cache import invalidate_after_commit
+
+ORDER_STATUSES = ("pending", "paid", "shipped", "done")
+# Perubahan status yang boleh dilakukan seller; order COD bisa langsung dikirim
+STATUS_TRANSITIONS = {
+    "pending": ("paid", "shipped"),
+    "paid": ("shipped",),
+    "shipped": ("done",),
+}
+
+ORDER_SORT = "newest"
+_ORDER_SORT_COLUMNS = (Order.created_at, Order.id)
+
+
+def _with_items(query):
+    # Item dan ringkasan produk untuk semua order di halaman dimuat dengan
+    # satu query tambahan (IN), berapa pun jumlah order dan itemnya
+    return query.options(
+        selectinload(Order.order_items)
+        .joinedload(OrderItem.product)
+        .load_only(Product.name, Product.image_url, raiseload=True)
+    )
+
+
+def _order_response(order: Order) -> OrderResponse:
+    return OrderResponse(
+        id=order.id,
+        buyer_id=order.buyer_id,
+        seller_id=order.seller_id,
+        total_price=order.total_price,
+        status=order.status,
+        payment_method=order.payment_method,
+        is_paid=order.is_paid or False,
+        created_at=order.created_at,
+        items=[
+            OrderItemResponse(
+                product_id=item.product_id,
+                product_name=item.product.name if item.product else None,
+                image_url=item.product.image_url if item.product else None,
+                quantity=item.quantity,
+                price=item.price,
+            )
+            for item in order.order_items
+        ],
+    )
+
+
+class OrderService:
+    @staticmethod
+    def get_buyer_orders(
+        buyer_id: int,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        status: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Mendapatkan riwayat order buyer (terbaru dulu) beserta item dan
+        produknya dengan cursor pagination.
+        """
+        return OrderService._orders_page(Order.buyer_id == buyer_id, limit, cursor, status)
+
+    @staticmethod
+    def get_seller_orders(
+        seller_id: int,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        status: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Mendapatkan order yang masuk ke seller (terbaru dulu) beserta item
+        dan produknya dengan cursor pagination.
+        """
+        return OrderService._orders_page(Order.seller_id == seller_id, limit, cursor, status)
+
+    @staticmethod
+    def get_order(
+        order_id: int, buyer_id: Optional[int] = None, seller_id: Optional[int] = None
+    ) -> Optional[OrderResponse]:
+        """
+        Mendapatkan detail order yang dimiliki buyer atau seller tersebut.
+        Mengembalikan None jika order tidak ditemukan atau bukan miliknya.
+        """
+        owners = []
+        if buyer_id is not None:
+            owners.append(Order.buyer_id == buyer_id)
+        if seller_id is not None:
+            owners.append(Order.seller_id == seller_id)
+        if not owners:
+            return None
+
+        order = db.session.scalar(
+            _with_items(select(Order).where(Order.id == order_id, or_(*owners)))
+        )
+        if order is None:
+            return None
+        return _order_response(order)
+
+    @staticmethod
+    def update_status(order_id: int, seller_id: int, status: str) -> Optional[OrderResponse]:
+        """
+        Mengubah status order milik seller sesuai STATUS_TRANSITIONS.
+        Order yang menjadi paid/done ditandai lunas dan dicatat ke rollup
+        penjualan seller dalam transaksi yang sama. Mengembalikan None jika
+        order tidak ditemukan atau bukan milik seller.
+        """
+        try:
+            current = db.session.scalar(
+                select(Order.status).where(Order.id == order_id, Order.seller_id == seller_id)
+            )
+            if current is None:
+                return None
+            if status not in STATUS_TRANSITIONS.get(current, ()):
+                raise ValueError(f"Status order tidak dapat diubah dari {current} ke {status}")
+
+            values = {"status": status}
+            if status in SALES_STATUSES:
+                values["is_paid"] = True
+            # Bersyarat pada status lama, supaya perubahan bersamaan tidak saling menimpa
+            updated = db.session.execute(
+                update(Order)
+                .where(Order.id == order_id, Order.status == current)
+                .values(values)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            if not updated:
+                raise ValueError("Status order sudah diubah, silakan muat ulang")
+
+            if status in SALES_STATUSES:
+                SalesService.record_orders([order_id])
+            db.session.commit()
+        except ValueError:
+            db.session.rollback()
+            raise
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise Exception(f"Gagal memperbarui status order: {str(e)}")
+
+        return OrderService.get_order(order_id, seller_id=seller_id)
+
+    @staticmethod
+    def _orders_query(
+        owner_condition, limit: int, cursor: Optional[str], status: Optional[str]
+    ):
+        """Query satu halaman order (limit + 1 baris), terbaru dulu"""
+        query = select(Order).where(owner_condition)
+        if status:
+            query = query.where(Order.status == status)
+        if cursor:
+            values = decode_cursor(cursor, ORDER_SORT, _ORDER_SORT_COLUMNS)
+            query = query.where(keyset_condition(_ORDER_SORT_COLUMNS, values, True))
+        return query.order_by(*keyset_order_by(_ORDER_SORT_COLUMNS, True)).limit(limit + 1)
+
+    @staticmethod
+    def _orders_page(
+        owner_condition, limit: Optional[int], cursor: Optional[str], status: Optional[str]
+    ) -> Dict[str, Any]:
+        # Selalu dua query: halaman order, lalu item + produk semua order tersebut
+        limit = parse_limit(limit)
+        if status and status not in ORDER_STATUSES:
+            raise ValueError(f"Status order {status} tidak dikenal")
+
+        query = OrderService._orders_query(owner_condition, limit, cursor, status)
+        orders = db.session.scalars(_with_items(query)).all()
+
+        next_cursor = None
+        if len(orders) > limit:
+            orders = orders[:limit]
+            last = orders[-1]
+            next_cursor = encode_cursor(ORDER_SORT, [last.created_at, last.id])
+
+        return {
+            "items": [_order_response(order) for order in orders],
+            "next_cursor": next_cursor,
+        }
+
+    @staticmethod
+    def checkout(
+        buyer_id: int, payment_method: str = "cod", hold_reference: Optional[str] = None
+    ) -> List[OrderResponse]:
+        """
+        Checkout keranjang buyer: item dikelompokkan per seller menjadi satu
+        order per seller. Stok semua produk dikurangi dengan satu UPDATE
+        bersyarat, order dan item order dibuat dengan bulk insert, lalu
+        keranjang dikosongkan, semuanya dalam satu transaksi. Harga yang
+        dipakai adalah harga produk saat checkout. Pembayaran "wallet"
+        langsung memotong saldo wallet buyer di transaksi yang sama, dan
+        order dibuat berstatus paid. Jika hold_reference diisi (dari
+        CartService.hold), stok yang sudah ditahan dikonfirmasi alih-alih
+        dikurangi lagi; hold yang kedaluwarsa menggagalkan checkout.
+
+        Returns:
+            Daftar order yang dibuat, urut berdasarkan seller_id
+        """
+        try:
+            # Checkout bersamaan untuk keranjang yang sama berurutan; yang
+            # kedua mendapati keranjang sudah kosong
+            cart_id = CartService._lock_cart(buyer_id)
+            lines = []
+            if cart_id is not None:
+                lines = db.session.execute(
+                    select(
+                        CartItem.product_id,
+                        CartItem.quantity,
+                        Product.price,
+                        Product.seller_id,
+                        Product.name,
+                        Product.image_url,
+                    )
+                    .join(Product, Product.id == CartItem.product_id)
+                    .where(CartItem.cart_id == cart_id)
+                    .order_by(CartItem.id)
+                ).all()
+            if not lines:
+                raise ValueError("Keranjang kosong")
+
+            unavailable = sorted(line.product_id for line in lines if line.seller_id is None)
+            if unavailable:
+                raise ValueError(
+                    f"Produk dengan ID {', '.join(map(str, unavailable))} tidak dapat dipesan"
+                )
+
+            quantities: Dict[int, int] = defaultdict(int)
+            for line in lines:
+                quantities[line.product_id] += line.quantity
+            if hold_reference:
+                ReservationService.confirm(
+                    hold_reference, buyer_id, dict(quantities), commit=False
+                )
+            else:
+                ReservationService.decrement_stock(dict(quantities))
+
+            lines_by_seller = defaultdict(list)
+            for line in lines:
+                lines_by_seller[line.seller_id].append(line)
+            seller_ids = sorted(lines_by_seller)
+
+            created_at = chrono.now()
+            paid = payment_method == "wallet"
+            status = "paid" if paid else "pending"
+            totals = {
+                seller_id: sum(
+                    (to_money(line.price) * line.quantity for line in lines_by_seller[seller_id]),
+                    Decimal("0"),
+                )
+                for seller_id in seller_ids
+            }
+            if paid:
+                WalletService.apply(buyer_id, "payment", sum(totals.values()), commit=False)
+
+            order_ids = db.session.scalars(
+                insert(Order).returning(Order.id, sort_by_parameter_order=True),
+                [
+                    {
+                        "buyer_id": buyer_id,
+                        "seller_id": seller_id,
+                        "total_price": totals[seller_id],
+                        "status": status,
+                        "payment_method": payment_method,
+                        "is_paid": paid,
+                        "created_at": created_at,
+                    }
+                    for seller_id in seller_ids
+                ],
+            ).all()
+            order_id_by_seller = dict(zip(seller_ids, order_ids))
+
+            db.session.execute(
+                insert(OrderItem),
+                [
+                    {
+                        "order_id": order_id_by_seller[line.seller_id],
+                        "product_id": line.product_id,
+                        "quantity": line.quantity,
+                        "price": to_money(line.price),
+                    }
+                    for line in lines
+                ],
+            )
+
+            if paid:
+                SalesService.record_orders(order_ids)
+            CartService.clear(buyer_id, commit=False)
+            # Stok produk berubah
+            invalidate_after_commit()
+            db.session.commit()
+        except (InsufficientStockError, ValueError, WalletConflictError):
+            db.session.rollback()
+            raise
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise Exception(f"Gagal membuat order: {str(e)}")
+
+        return [
+            OrderResponse(
+                id=order_id_by_seller[seller_id],
+                buyer_id=buyer_id,
+                seller_id=seller_id,
+                total_price=totals[seller_id],
+                status=status,
+                payment_method=payment_method,
+                is_paid=paid,
+                created_at=created_at,
+                items=[
+                    OrderItemResponse(
+                        product_id=line.product_id,
+                        product_name=line.name,
+                        image_url=line.image_url,
+                        quantity=line.quantity,
+                        price=to_money(line.price),
+                    )
+                    for line in lines_by_seller[seller_id]
+                ],
+            )
+            for seller_id in seller_ids
+        ]
@@ -0,0 +1,216 @@
+import logging
+import os
+import random
+import threading
+import time
+from datetime import timedelta
+from typing import Any, Callable, Dict
+
+from sqlalchemy import func, update
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.models.outbox_event import OutboxEvent
+from app.utils import chrono
+from app.utils.extensions import db
+
+logger = logging.getLogger(__name__)
+
+# Lama sebuah event "dipinjam" worker sebelum boleh diambil worker lain
+# (mis. jika worker mati di tengah proses)
+PROCESSING_LEASE_SECONDS = 120
+RETRY_BASE_SECONDS = 5
+RETRY_MAX_SECONDS = 3600
+
+
+class OutboxService:
+    _handlers: Dict[str, Callable[[Dict[str, Any]], None]] = {}
+
+    @staticmethod
+    def handler(event_type: str):
+        """
+        Decorator untuk mendaftarkan fungsi pemroses sebuah jenis event
+        """
+
+        def decorator(f):
+            OutboxService._handlers[event_type] = f
+            return f
+
+        return decorator
+
+    @staticmethod
+    def enqueue(event_type: str, payload: Dict[str, Any]) -> OutboxEvent:
+        """
+        Menyimpan event ke outbox dan commit, supaya tetap tercatat walaupun
+        transaksi utama request sudah di-rollback.
+        """
+        event = OutboxEvent(event_type=event_type, payload=payload, status="pending")
+        db.session.add(event)
+        db.session.commit()
+        return event
+
+    @staticmethod
+    def process_due(limit: int = 20) -> int:
+        """
+        Memproses event yang sudah jatuh tempo. Mengembalikan jumlah event
+        yang diproses (berhasil maupun gagal).
+        """
+        now = chrono.now()
+        due_ids = [
+            event_id
+            for (event_id,) in db.session.query(OutboxEvent.id)
+            .filter(
+                OutboxEvent.status.in_(["pending", "processing"]),
+                OutboxEvent.next_attempt_at <= now,
+            )
+            .order_by(OutboxEvent.next_attempt_at)
+            .limit(limit)
+            .all()
+        ]
+
+        processed = 0
+        for event_id in due_ids:
+            if OutboxService.process_event(event_id, now):
+                processed += 1
+        return processed
+
+    @staticmethod
+    def process_event(event_id: int, now=None) -> bool:
+        """
+        Memproses satu event jika belum diambil worker lain. Dipakai juga
+        untuk memproses event segera setelah dibuat, tanpa menunggu polling.
+        """
+        if not OutboxService._claim(event_id, now or chrono.now()):
+            return False
+        OutboxService._process(db.session.get(OutboxEvent, event_id))
+        return True
+
+    @staticmethod
+    def stats() -> Dict[str, Any]:
+        """
+        Jumlah event per status dan umur event pending tertua (detik)
+        """
+        counts = dict(
+            db.session.query(OutboxEvent.status, func.count(OutboxEvent.id))
+            .group_by(OutboxEvent.status)
+            .all()
+        )
+        oldest_pending = (
+            db.session.query(func.min(OutboxEvent.created_at))
+            .filter(OutboxEvent.status.in_(["pending", "processing"]))
+            .scalar()
+        )
+        oldest_age = None
+        if oldest_pending is not None:
+            oldest_age = (
+                chrono.now().replace(tzinfo=None) - oldest_pending.replace(tzinfo=None)
+            ).total_seconds()
+
+        return {"counts": counts, "oldest_pending_seconds": oldest_age}
+
+    @staticmethod
+    def _claim(event_id: int, now) -> bool:
+        # UPDATE bersyarat: hanya satu worker yang berhasil mengambil event
+        result = db.session.execute(
+            update(OutboxEvent)
+            .where(
+                OutboxEvent.id == event_id,
+                OutboxEvent.status.in_(["pending", "processing"]),
+                OutboxEvent.next_attempt_at <= now,
+            )
+            .values(
+                status="processing",
+                next_attempt_at=now + timedelta(seconds=PROCESSING_LEASE_SECONDS),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        return result.rowcount == 1
+
+    @staticmethod
+    def _process(event: OutboxEvent) -> None:
+        handler = OutboxService._handlers.get(event.event_type)
+        attempts = (event.attempts or 0) + 1
+        event.attempts = attempts
+
+        try:
+            if handler is None:
+                raise LookupError(f"Handler untuk event {event.event_type} tidak ada")
+            handler(event.payload)
+        except Exception as e:
+            # Handler bisa meninggalkan transaksi gagal; buang dulu sebelum
+            # mencatat percobaan
+            db.session.rollback()
+            event.attempts = attempts
+            event.last_error = str(e)
+            if event.attempts >= event.max_attempts:
+                event.status = "failed"
+                logger.error(
+                    "Outbox event %s (%s) gagal permanen: %s",
+                    event.id,
+                    event.event_type,
+                    e,
+                )
+            else:
+                delay = min(RETRY_BASE_SECONDS * 2 ** (event.attempts - 1), RETRY_MAX_SECONDS)
+                delay = delay * random.uniform(0.8, 1.2)
+                event.status = "pending"
+                event.next_attempt_at = chrono.now() + timedelta(seconds=delay)
+                logger.warning(
+                    "Outbox event %s (%s) gagal, dicoba lagi dalam %.0f detik: %s",
+                    event.id,
+                    event.event_type,
+                    delay,
+                    e,
+                )
+        else:
+            event.status = "done"
+            event.last_error = None
+            event.processed_at = chrono.now()
+
+        db.session.commit()
+
+
+class OutboxWorker:
+    """
+    Thread background yang memproses outbox secara berkala.
+    Dimulai saat request pertama di setiap proses worker.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._pid = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        if app.config.get("OUTBOX_WORKER_ENABLED"):
+            app.before_request(self.start)
+
+    def start(self) -> None:
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._lock:
+            if self._pid == pid:
+                return
+            self._pid = pid
+            thread = threading.Thread(target=self.run, name="outbox-worker", daemon=True)
+            thread.start()
+
+    def run(self) -> None:
+        interval = self.app.config.get("OUTBOX_POLL_SECONDS", 5)
+        while True:
+            with self.app.app_context():
+                try:
+                    # Kosongkan antrian yang sudah jatuh tempo sebelum tidur lagi
+                    while OutboxService.process_due() > 0:
+                        pass
+                except SQLAlchemyError as e:
+                    db.session.rollback()
+                    logger.warning("Gagal memproses outbox: %s", e)
+            time.sleep(interval)
+
+
+outbox_worker = OutboxWorker()
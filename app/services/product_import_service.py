@@ -0,0 +1,242 @@
+import codecs
+import csv
+import io
+import json
+from collections import defaultdict
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.models.category import Category
+from app.models.product import Product
+from app.schemas.product_schema import ProductImportRow
+from app.services.category_service import CategoryService
+from app.services.search_service import SearchService
+from app.utils import chrono
+from app.utils.extensions import db
+from app.utils.response_cache import invalidate_after_commit
+from app.utils.upsert import insert_for_dialect
+
+IMPORT_FORMATS = ("csv", "ndjson")
+IMPORT_CHUNK_SIZE = 500
+# Batas jumlah error per baris yang dikembalikan di response
+MAX_REPORTED_ERRORS = 500
+
+# Kolom yang ditimpa jika SKU sudah ada
+_UPSERT_COLUMNS = ("name", "description", "price", "stock", "category_id", "image_url")
+_NEW = object()
+
+
+def _read_csv(stream) -> Iterator[Tuple[int, Any]]:
+    # utf-8-sig supaya BOM dari Excel tidak ikut menjadi nama kolom
+    text_stream = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    reader = csv.DictReader(text_stream)
+    for row in reader:
+        # Baris 1 adalah header
+        yield reader.line_num, row
+
+
+def _read_ndjson(stream) -> Iterator[Tuple[int, Any]]:
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    line_number = 0
+    for chunk in iter(lambda: stream.read(64 * 1024), b""):
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                yield line_number, line
+    buffer += decoder.decode(b"", final=True)
+    if buffer.strip():
+        yield line_number + 1, buffer
+
+
+def _chunks(rows: Iterable, size: int) -> Iterator[List]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class ProductImportService:
+    @staticmethod
+    def import_products(
+        seller_id: int,
+        stream,
+        file_format: str,
+        chunk_size: int = IMPORT_CHUNK_SIZE,
+    ) -> Dict[str, Any]:
+        """
+        Mengimpor produk seller dari stream CSV/NDJSON. Baris diproses per
+        chunk: divalidasi dengan ProductImportRow lalu ditulis dengan satu
+        upsert multi-row (kunci seller_id + sku). Baris yang tidak valid
+        dilaporkan tanpa membatalkan baris lain.
+
+        Returns:
+            Dictionary berisi jumlah created, updated, failed, dan errors
+            per baris
+        """
+        if file_format not in IMPORT_FORMATS:
+            raise ValueError(
+                f"Format import tidak valid, pilih salah satu: {', '.join(IMPORT_FORMATS)}"
+            )
+
+        reader = _read_csv if file_format == "csv" else _read_ndjson
+        importer = _ProductImporter(seller_id)
+        for chunk in _chunks(reader(stream), chunk_size):
+            importer.import_chunk(chunk, parse_json=file_format == "ndjson")
+        return importer.summary()
+
+
+class _ProductImporter:
+    def __init__(self, seller_id: int):
+        self.seller_id = seller_id
+        self.insert = insert_for_dialect()
+        self.created = 0
+        self.updated = 0
+        self.failed = 0
+        self.errors: List[Dict[str, Any]] = []
+
+        self._seen_skus: Set[str] = set()
+        self._category_ids: Dict[int, bool] = {}
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "created": self.created,
+            "updated": self.updated,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+    def import_chunk(self, chunk: List[Tuple[int, Any]], parse_json: bool) -> None:
+        rows = []
+        for line, raw in chunk:
+            row = self._validate(line, raw, parse_json)
+            if row is not None:
+                rows.append((line, row))
+
+        self._check_categories(rows)
+        rows = [(line, row) for line, row in rows if self._category_ids[row.category_id]]
+        if not rows:
+            return
+
+        try:
+            updated = self._upsert(rows)
+            db.session.commit()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            for line, row in rows:
+                self._error(line, row.sku, f"Gagal menyimpan produk: {str(e)}")
+            return
+
+        self.updated += updated
+        self.created += len(rows) - updated
+
+    def _validate(self, line: int, raw: Any, parse_json: bool) -> Optional[ProductImportRow]:
+        sku = None
+        try:
+            if parse_json:
+                try:
+                    raw = json.loads(raw)
+                except json.JSONDecodeError:
+                    raise ValueError("Baris bukan JSON yang valid")
+            if not isinstance(raw, dict):
+                raise ValueError("Baris harus berupa object")
+
+            # Kolom kosong di CSV dianggap tidak diisi
+            data = {key: value for key, value in raw.items() if key and value != ""}
+            sku = data.get("sku")
+            row = ProductImportRow(**data)
+        except ValidationError as e:
+            self._error(line, sku, e.errors(include_url=False, include_context=False))
+            return None
+        except ValueError as e:
+            self._error(line, sku, str(e))
+            return None
+
+        if row.sku in self._seen_skus:
+            self._error(line, row.sku, "SKU duplikat di dalam file")
+            return None
+        self._seen_skus.add(row.sku)
+        return row
+
+    def _check_categories(self, rows: List[Tuple[int, ProductImportRow]]) -> None:
+        # Satu query per chunk untuk category_id yang belum pernah dicek
+        unknown = {row.category_id for _, row in rows} - set(self._category_ids)
+        if unknown:
+            found = set(
+                db.session.scalars(select(Category.id).where(Category.id.in_(unknown)))
+            )
+            for category_id in unknown:
+                self._category_ids[category_id] = category_id in found
+
+        for line, row in rows:
+            if not self._category_ids[row.category_id]:
+                self._error(
+                    line, row.sku, f"Kategori dengan ID {row.category_id} tidak ditemukan"
+                )
+
+    def _upsert(self, rows: List[Tuple[int, ProductImportRow]]) -> int:
+        """Menulis satu chunk, mengembalikan jumlah SKU yang sudah ada (update)"""
+        skus = [row.sku for _, row in rows]
+        existing = dict(
+            db.session.execute(
+                select(Product.sku, Product.category_id).where(
+                    Product.seller_id == self.seller_id, Product.sku.in_(skus)
+                )
+            ).all()
+        )
+
+        now = chrono.now()
+        values = [
+            {
+                "seller_id": self.seller_id,
+                "sku": row.sku,
+                "name": row.name,
+                "description": row.description,
+                "price": row.price,
+                "stock": row.stock,
+                "category_id": row.category_id,
+                "image_url": row.image_url,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for _, row in rows
+        ]
+        stmt = self.insert(Product).values(values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Product.seller_id, Product.sku],
+            set_={
+                **{column: stmt.excluded[column] for column in _UPSERT_COLUMNS},
+                "updated_at": now,
+            },
+        ).returning(Product.id)
+        product_ids = list(db.session.scalars(stmt))
+
+        # Produk baru menambah counter kategorinya, produk yang pindah
+        # kategori memindahkan counternya
+        deltas: Dict[int, int] = defaultdict(int)
+        for _, row in rows:
+            old_category_id = existing.get(row.sku, _NEW)
+            if old_category_id != row.category_id:
+                deltas[row.category_id] += 1
+                if old_category_id is not _NEW:
+                    deltas[old_category_id] -= 1
+        CategoryService.adjust_product_counts(deltas)
+        SearchService.index_products(product_ids)
+        invalidate_after_commit()
+
+        return len(existing)
+
+    def _error(self, line: int, sku: Optional[str], errors: Any) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "sku": sku, "errors": errors})
@@ -1,13 +1,42 @@
 from app.models.category import Category
 from app.models.product import Product
 from app.models.seller import SellerProfile
-from app.schemas.product_schema import ProductCreate, ProductUpdate, ProductResponse
-from app.utils.extensions import db, supabase
-from typing import List, Optional
+from app.schemas.product_schema import (
+    ProductCreate,
+    DEFAULT_PRODUCT_LIST_FIELDS,
+    ProductResponse,
+    ProductUpdate,
+    product_list_model,
+)
+from app.services.category_service import CategoryService
+from app.services.search_service import SearchService
+from app.utils.extensions import db
+from app.utils.pagination import (
+    decode_cursor,
+    encode_cursor,
+    keyset_condition,
+    keyset_order_by,
+    parse_limit,
+)
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from pydantic import BaseModel
+from sqlalchemy import func
 from sqlalchemy.exc import SQLAlchemyError
-import uuid
 import datetime
 
+# Jumlah baris per fetch saat streaming listing produk
+STREAM_BATCH_SIZE = 500
+
+# Urutan yang didukung listing produk: (kolom kunci urutan, menurun?)
+# Kolom terakhir selalu id supaya urutan stabil untuk cursor
+PRODUCT_SORTS = {
+    "newest": ((Product.created_at, Product.id), True),
+    "oldest": ((Product.created_at, Product.id), False),
+    "price_asc": ((Product.price, Product.id), False),
+    "price_desc": ((Product.price, Product.id), True),
+    "top_rated": ((Product.rating_avg, Product.id), True),
+}
+
 
 class ProductService:
     @staticmethod
@@ -38,12 +67,17 @@ class ProductService:
                 stock=product_data.stock,
                 category_id=product_data.category_id,
                 seller_id=product_data.seller_id,
+                sku=product_data.sku,
                 image_url=product_data.image_url,
                 # is_active=True,
             )
 
-            # Menyimpan ke database
+            # Menyimpan ke database (flush dulu untuk ID, index pencarian
+            # ikut dalam transaksi yang sama)
             db.session.add(new_product)
+            db.session.flush()
+            SearchService.index_products([new_product.id])
+            CategoryService.adjust_product_counts({new_product.category_id: 1})
             db.session.commit()
 
             # Mengembalikan data produk yang telah dibuat
@@ -63,16 +97,16 @@ class ProductService:
         return ProductResponse.model_validate(product)
 
     @staticmethod
-    def get_all_products(
+    def _filtered_query(
         category_id: Optional[int] = None,
         seller_id: Optional[int] = None,
         price_min: Optional[float] = None,
         price_max: Optional[float] = None,
         name: Optional[str] = None,
-        # is_active: bool = True,
-    ) -> List[ProductResponse]:
+        rating_min: Optional[float] = None,
+    ):
         """
-        Mendapatkan daftar produk dengan filter opsional.
+        Query produk dengan filter opsional (tanpa urutan dan limit).
         """
         query = Product.query
 
@@ -100,9 +134,169 @@ class ProductService:
         if name is not None:
             query = query.filter(Product.name.ilike(f"%{name}%"))
 
-        products = query.all()
+        # Filter berdasarkan rata-rata rating minimum
+        if rating_min is not None:
+            query = query.filter(Product.rating_avg >= rating_min)
+
+        return query
+
+    @staticmethod
+    def get_all_products(
+        category_id: Optional[int] = None,
+        seller_id: Optional[int] = None,
+        price_min: Optional[float] = None,
+        price_max: Optional[float] = None,
+        name: Optional[str] = None,
+        rating_min: Optional[float] = None,
+        # is_active: bool = True,
+    ) -> List[ProductResponse]:
+        """
+        Mendapatkan daftar produk dengan filter opsional.
+        """
+        products = ProductService._filtered_query(
+            category_id=category_id,
+            seller_id=seller_id,
+            price_min=price_min,
+            price_max=price_max,
+            name=name,
+            rating_min=rating_min,
+        ).all()
         return [ProductResponse.model_validate(product) for product in products]
 
+    @staticmethod
+    def get_products_page(
+        category_id: Optional[int] = None,
+        seller_id: Optional[int] = None,
+        price_min: Optional[float] = None,
+        price_max: Optional[float] = None,
+        name: Optional[str] = None,
+        rating_min: Optional[float] = None,
+        sort: str = "newest",
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        include_total: bool = False,
+        fields: Tuple[str, ...] = DEFAULT_PRODUCT_LIST_FIELDS,
+    ) -> Dict[str, Any]:
+        """
+        Mendapatkan satu halaman produk dengan keyset (cursor) pagination.
+        Hanya kolom pada fields (ditambah kolom urutan) yang di-SELECT.
+
+        Returns:
+            Dictionary berisi items (Core row, untuk product_list_adapter),
+            next_cursor (None jika halaman terakhir), dan total (hanya
+            dihitung jika include_total)
+        """
+        limit = parse_limit(limit)
+
+        query = ProductService._filtered_query(
+            category_id=category_id,
+            seller_id=seller_id,
+            price_min=price_min,
+            price_max=price_max,
+            name=name,
+            rating_min=rating_min,
+        )
+
+        total = None
+        if include_total:
+            total = query.with_entities(func.count(Product.id)).scalar()
+
+        page_query, columns = ProductService._page_query(query, sort, cursor, fields, limit)
+        rows = page_query.all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_cursor(
+                sort, [getattr(last, column.key) for column in columns]
+            )
+
+        return {
+            "items": rows,
+            "next_cursor": next_cursor,
+            "total": total,
+        }
+
+    @staticmethod
+    def iter_products(
+        category_id: Optional[int] = None,
+        seller_id: Optional[int] = None,
+        price_min: Optional[float] = None,
+        price_max: Optional[float] = None,
+        name: Optional[str] = None,
+        rating_min: Optional[float] = None,
+        sort: str = "newest",
+        cursor: Optional[str] = None,
+        fields: Tuple[str, ...] = DEFAULT_PRODUCT_LIST_FIELDS,
+        batch_size: int = STREAM_BATCH_SIZE,
+    ) -> Iterator[BaseModel]:
+        """
+        Mengiterasi semua produk yang cocok (mulai setelah cursor jika ada)
+        untuk response streaming. Baris diambil per batch lewat server-side
+        cursor, sehingga memori tidak bertambah sesuai jumlah produk.
+
+        Query dijalankan saat fungsi dipanggil, supaya error (sort/cursor
+        tidak valid) muncul sebelum response mulai dikirim.
+        """
+        query = ProductService._filtered_query(
+            category_id=category_id,
+            seller_id=seller_id,
+            price_min=price_min,
+            price_max=price_max,
+            name=name,
+            rating_min=rating_min,
+        )
+        query, _ = ProductService._sorted_query(query, sort, cursor)
+
+        # Baris kolom saja (tanpa objek ORM dan identity map)
+        model = product_list_model(fields)
+        rows = query.with_entities(*ProductService.list_columns(fields)).yield_per(
+            batch_size
+        )
+        return (model.model_validate(row._asdict()) for row in rows)
+
+    @staticmethod
+    def list_columns(fields: Tuple[str, ...], extra_columns=()) -> List[Any]:
+        """
+        Kolom produk untuk field listing terpilih, ditambah kolom lain yang
+        dibutuhkan query (misalnya kolom urutan untuk cursor)
+        """
+        columns = [getattr(Product, field) for field in fields]
+        columns += [column for column in extra_columns if column.key not in fields]
+        return columns
+
+    @staticmethod
+    def _page_query(
+        query, sort: str, cursor: Optional[str], fields: Tuple[str, ...], limit: int
+    ):
+        """
+        Query satu halaman listing (limit + 1 baris untuk mendeteksi halaman
+        berikutnya). Mengembalikan query dan kolom kunci urutannya.
+        """
+        query, columns = ProductService._sorted_query(query, sort, cursor)
+        # Hanya kolom yang dibutuhkan response, sebagai Core row tanpa objek ORM
+        query = query.with_entities(*ProductService.list_columns(fields, columns))
+        return query.limit(limit + 1), columns
+
+    @staticmethod
+    def _sorted_query(query, sort: str, cursor: Optional[str]):
+        """
+        Menambahkan urutan dan kondisi cursor ke query produk.
+        Mengembalikan query dan kolom kunci urutannya.
+        """
+        if sort not in PRODUCT_SORTS:
+            raise ValueError(
+                f"Parameter sort tidak valid, pilih salah satu: {', '.join(PRODUCT_SORTS)}"
+            )
+        columns, descending = PRODUCT_SORTS[sort]
+
+        if cursor:
+            values = decode_cursor(cursor, sort, columns)
+            query = query.filter(keyset_condition(columns, values, descending))
+
+        return query.order_by(*keyset_order_by(columns, descending)), columns
+
     @staticmethod
     def update_product(
         product_id: int, product_data: ProductUpdate
@@ -128,20 +322,36 @@ class ProductService:
             if product_data.stock is not None:
                 product.stock = product_data.stock
 
-            if product_data.category_id is not None:
+            if (
+                product_data.category_id is not None
+                and product_data.category_id != product.category_id
+            ):
+                if not db.session.get(Category, product_data.category_id):
+                    raise ValueError(
+                        f"Kategori dengan ID {product_data.category_id} tidak ditemukan"
+                    )
+                # Produk pindah kategori, counter keduanya ikut disesuaikan
+                CategoryService.adjust_product_counts(
+                    {product.category_id: -1, product_data.category_id: 1}
+                )
                 product.category_id = product_data.category_id
 
-            if product_data.image_url is not None:
-                product.image_url = product_data.image_url
-
             # if product_data.is_active is not None:
             #     product.is_active = product_data.is_active
 
             # Memperbarui waktu update
             product.updated_at = datetime.datetime.utcnow()
 
+            # Sinkronkan index pencarian jika teks produk berubah
+            if product_data.name is not None or product_data.description is not None:
+                db.session.flush()
+                SearchService.index_products([product.id])
+
             db.session.commit()
             return ProductResponse.model_validate(product)
+        except ValueError:
+            db.session.rollback()
+            raise
         except SQLAlchemyError as e:
             db.session.rollback()
             raise Exception(f"Gagal memperbarui produk: {str(e)}")
@@ -165,26 +375,3 @@ class ProductService:
         except SQLAlchemyError as e:
             db.session.rollback()
             raise Exception(f"Gagal menghapus produk: {str(e)}")
-
-    @staticmethod
-    def upload_product_image(file_data, file_name: str) -> str:
-        """
-        Mengunggah gambar produk ke Supabase Storage dan mengembalikan URL.
-        """
-        try:
-            # Membuat nama file unik
-            unique_filename = f"{uuid.uuid4()}_{file_name}"
-
-            # Mengunggah file ke Supabase
-            response = supabase.storage.from_("product-images").upload(
-                unique_filename, file_data
-            )
-
-            # Mendapatkan URL publik
-            image_url = supabase.storage.from_("product-images").get_public_url(
-                unique_filename
-            )
-
-            return image_url
-        except Exception as e:
-            raise Exception(f"Gagal mengunggah gambar: {str(e)}")
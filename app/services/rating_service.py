@@ -0,0 +1,277 @@
+from collections import defaultdict
+from typing import Any, Dict, Iterable, Optional
+
+from sqlalchemy import Float, bindparam, case, cast, func, select, update
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from app.models.order import Order
+from app.models.order_item import OrderItem
+from app.models.product import Product
+from app.models.rating import Rating
+from app.schemas.rating_schema import RatingCreate, RatingResponse, RatingUpdate
+from app.utils.extensions import db
+from app.utils.pagination import (
+    decode_cursor,
+    encode_cursor,
+    keyset_condition,
+    keyset_order_by,
+    parse_limit,
+)
+from app.utils.response_cache import invalidate_after_commit
+
+STARS = (1, 2, 3, 4, 5)
+# Jumlah produk per batch saat menghitung ulang agregat rating
+RECOMPUTE_BATCH_SIZE = 1000
+
+# Potongan nama index unik pada pesan error Postgres dan SQLite
+_DUPLICATE_RATING_CONSTRAINTS = (
+    "ix_ratings_buyer_id_product_id",
+    "ratings.buyer_id, ratings.product_id",
+)
+
+RATING_SORT = "newest"
+_RATING_SORT_COLUMNS = (Rating.created_at, Rating.id)
+
+
+class RatingService:
+    @staticmethod
+    def get_rating(rating_id: int) -> Optional[RatingResponse]:
+        """
+        Mendapatkan rating berdasarkan ID.
+        """
+        rating = db.session.get(Rating, rating_id)
+        if not rating:
+            return None
+        return RatingResponse.model_validate(rating)
+
+    @staticmethod
+    def _product_ratings_query(product_id: int, limit: int, cursor: Optional[str]):
+        """Query satu halaman rating produk (limit + 1 baris), terbaru dulu"""
+        query = select(Rating).where(Rating.product_id == product_id)
+        if cursor:
+            values = decode_cursor(cursor, RATING_SORT, _RATING_SORT_COLUMNS)
+            query = query.where(keyset_condition(_RATING_SORT_COLUMNS, values, True))
+        return query.order_by(*keyset_order_by(_RATING_SORT_COLUMNS, True)).limit(limit + 1)
+
+    @staticmethod
+    def get_product_ratings(
+        product_id: int, limit: Optional[int] = None, cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Mendapatkan rating sebuah produk (terbaru dulu) dengan cursor pagination.
+        """
+        limit = parse_limit(limit)
+        ratings = db.session.scalars(
+            RatingService._product_ratings_query(product_id, limit, cursor)
+        ).all()
+
+        next_cursor = None
+        if len(ratings) > limit:
+            ratings = ratings[:limit]
+            last = ratings[-1]
+            next_cursor = encode_cursor(RATING_SORT, [last.created_at, last.id])
+
+        return {
+            "items": [RatingResponse.model_validate(rating) for rating in ratings],
+            "next_cursor": next_cursor,
+        }
+
+    @staticmethod
+    def create_rating(buyer_id: int, rating_data: RatingCreate) -> RatingResponse:
+        """
+        Membuat rating produk oleh buyer. Satu buyer hanya dapat memberi satu
+        rating per produk (dijaga index unik), dan order_id jika diisi harus
+        order milik buyer yang berisi produk tersebut. Agregat rating produk
+        diperbarui dalam transaksi yang sama.
+        """
+        if not db.session.get(Product, rating_data.product_id):
+            raise ValueError(f"Produk dengan ID {rating_data.product_id} tidak ditemukan")
+
+        if rating_data.order_id is not None:
+            # Order harus milik buyer dan berisi produk yang dirating
+            ordered = db.session.scalar(
+                select(OrderItem.id)
+                .join(Order, Order.id == OrderItem.order_id)
+                .where(
+                    Order.id == rating_data.order_id,
+                    Order.buyer_id == buyer_id,
+                    OrderItem.product_id == rating_data.product_id,
+                )
+                .limit(1)
+            )
+            if ordered is None:
+                raise ValueError(
+                    f"Order dengan ID {rating_data.order_id} tidak ditemukan "
+                    f"atau tidak berisi produk ini"
+                )
+
+        try:
+            rating = Rating(buyer_id=buyer_id, **rating_data.model_dump())
+            db.session.add(rating)
+            RatingService._apply_aggregates(rating.product_id, {rating.rating: 1})
+            db.session.commit()
+            return RatingResponse.model_validate(rating)
+        except IntegrityError as e:
+            # Index unik (buyer_id, product_id): rating kedua untuk produk
+            # yang sama, termasuk yang dikirim bersamaan
+            db.session.rollback()
+            if any(name in str(e.orig) for name in _DUPLICATE_RATING_CONSTRAINTS):
+                raise ValueError("Anda sudah memberi rating untuk produk ini")
+            raise Exception(f"Gagal membuat rating: {str(e)}")
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise Exception(f"Gagal membuat rating: {str(e)}")
+
+    @staticmethod
+    def update_rating(rating_id: int, rating_data: RatingUpdate) -> Optional[RatingResponse]:
+        """
+        Memperbarui rating berdasarkan ID. Jika nilai bintang berubah,
+        histogram produk dipindahkan dari bintang lama ke bintang baru.
+        """
+        try:
+            rating = db.session.get(Rating, rating_id)
+            if not rating:
+                return None
+
+            if rating_data.rating is not None and rating_data.rating != rating.rating:
+                star_deltas = {rating_data.rating: 1}
+                # Rating lama yang kosong/di luar 1-5 tidak pernah masuk agregat
+                if rating.rating in STARS:
+                    star_deltas[rating.rating] = -1
+                RatingService._apply_aggregates(rating.product_id, star_deltas)
+                rating.rating = rating_data.rating
+
+            if rating_data.comment is not None:
+                rating.comment = rating_data.comment
+
+            db.session.commit()
+            return RatingResponse.model_validate(rating)
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise Exception(f"Gagal memperbarui rating: {str(e)}")
+
+    @staticmethod
+    def delete_rating(rating_id: int) -> bool:
+        """
+        Menghapus rating berdasarkan ID dan mengurangi agregat produknya.
+        """
+        try:
+            rating = db.session.get(Rating, rating_id)
+            if not rating:
+                return False
+
+            if rating.rating in STARS:
+                RatingService._apply_aggregates(rating.product_id, {rating.rating: -1})
+            db.session.delete(rating)
+            db.session.commit()
+            return True
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise Exception(f"Gagal menghapus rating: {str(e)}")
+
+    @staticmethod
+    def _apply_aggregates(product_id: int, star_deltas: Dict[int, int]) -> None:
+        """
+        Menambah/mengurangi agregat rating satu produk secara atomik
+        ({bintang: selisih jumlah}). Rata-rata dihitung ulang dari nilai
+        kolom di database, bukan dari objek di memori, sehingga aman untuk
+        rating yang masuk bersamaan. Commit oleh pemanggil.
+        """
+        count_delta = sum(star_deltas.values())
+        sum_delta = sum(star * delta for star, delta in star_deltas.items())
+        new_count = Product.rating_count + count_delta
+        new_sum = Product.rating_sum + sum_delta
+
+        values = {
+            "rating_count": new_count,
+            "rating_sum": new_sum,
+            "rating_avg": case(
+                (new_count > 0, cast(new_sum, Float) / new_count), else_=0.0
+            ),
+            # Perubahan rating bukan perubahan data produk
+            "updated_at": Product.updated_at,
+        }
+        for star, delta in star_deltas.items():
+            if delta:
+                column = getattr(Product, f"rating_{star}")
+                values[column.key] = column + delta
+
+        db.session.execute(
+            update(Product)
+            .where(Product.id == product_id)
+            .values(values)
+            .execution_options(synchronize_session=False)
+        )
+        invalidate_after_commit()
+
+    @staticmethod
+    def recompute_aggregates(
+        product_ids: Optional[Iterable[int]] = None,
+        batch_size: int = RECOMPUTE_BATCH_SIZE,
+    ) -> int:
+        """
+        Menghitung ulang agregat rating dari tabel ratings per batch produk
+        (semua produk atau produk tertentu), commit per batch. Mengembalikan
+        jumlah produk yang dihitung ulang.
+        """
+        products = Product.__table__
+        stmt = (
+            products.update()
+            .where(products.c.id == bindparam("product_id"))
+            .values(
+                rating_count=bindparam("count"),
+                rating_sum=bindparam("total"),
+                rating_avg=bindparam("average"),
+                updated_at=products.c.updated_at,
+                **{f"rating_{star}": bindparam(f"star_{star}") for star in STARS},
+            )
+        )
+
+        processed = 0
+        last_id = 0
+        selected = sorted(set(product_ids)) if product_ids is not None else None
+        while True:
+            if selected is not None:
+                ids = selected[processed : processed + batch_size]
+            else:
+                ids = db.session.scalars(
+                    select(Product.id)
+                    .where(Product.id > last_id)
+                    .order_by(Product.id)
+                    .limit(batch_size)
+                ).all()
+            if not ids:
+                break
+
+            # Satu query agregat untuk seluruh batch
+            histograms = defaultdict(dict)
+            rows = db.session.execute(
+                select(Rating.product_id, Rating.rating, func.count(Rating.id))
+                .where(Rating.product_id.in_(ids), Rating.rating.in_(STARS))
+                .group_by(Rating.product_id, Rating.rating)
+            )
+            for product_id, star, count in rows:
+                histograms[product_id][star] = count
+
+            params = []
+            for product_id in ids:
+                histogram = histograms.get(product_id, {})
+                count = sum(histogram.values())
+                total = sum(star * n for star, n in histogram.items())
+                params.append(
+                    {
+                        "product_id": product_id,
+                        "count": count,
+                        "total": total,
+                        "average": total / count if count else 0.0,
+                        **{f"star_{star}": histogram.get(star, 0) for star in STARS},
+                    }
+                )
+            db.session.execute(stmt, params)
+            invalidate_after_commit()
+            db.session.commit()
+
+            processed += len(ids)
+            last_id = ids[-1]
+
+        return processed
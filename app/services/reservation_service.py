@@ -0,0 +1,260 @@
+import uuid
+from collections import defaultdict
+from datetime import timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, case, insert, select, update
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.models.product import Product
+from app.models.stock_reservation import StockReservation
+from app.utils import chrono
+from app.utils.extensions import db
+from app.utils.response_cache import invalidate_after_commit
+
+# Lama hold stok sebelum dilepas sweeper
+HOLD_SECONDS = 15 * 60
+# Jumlah hold kedaluwarsa yang dilepas per transaksi sweeper
+SWEEP_BATCH_SIZE = 500
+
+
+class InsufficientStockError(ValueError):
+    """Stok satu atau beberapa produk tidak cukup untuk jumlah yang diminta"""
+
+    def __init__(self, product_ids: List[int]):
+        super().__init__(
+            f"Stok tidak mencukupi untuk produk ID {', '.join(map(str, product_ids))}"
+        )
+        self.product_ids = product_ids
+
+
+class HoldExpiredError(ValueError):
+    """Hold stok tidak ditemukan, sudah kedaluwarsa, atau sudah dilepas"""
+
+    def __init__(self, reference: str):
+        super().__init__(f"Hold stok {reference} tidak ditemukan atau sudah kedaluwarsa")
+        self.reference = reference
+
+
+def _merge_quantities(items: Iterable[Tuple[int, int]]) -> Dict[int, int]:
+    # Produk yang sama di beberapa baris digabung jadi satu jumlah
+    quantities: Dict[int, int] = defaultdict(int)
+    for product_id, quantity in items:
+        if quantity < 1:
+            raise ValueError("Jumlah produk minimal 1")
+        quantities[product_id] += quantity
+    if not quantities:
+        raise ValueError("Tidak ada produk yang dipesan")
+    return dict(quantities)
+
+
+def _per_product(quantities: Dict[int, int]):
+    # Nilai jumlah per baris produk di dalam satu statement
+    return case(quantities, value=Product.id)
+
+
+class ReservationService:
+    @staticmethod
+    def decrement_stock(quantities: Dict[int, int]) -> None:
+        """
+        Mengurangi stok beberapa produk dengan satu UPDATE bersyarat
+        (stock >= jumlah) untuk semua baris. Jika ada produk yang stoknya
+        tidak cukup, InsufficientStockError dilempar dan pemanggil harus
+        rollback. Commit oleh pemanggil; cache katalog dikosongkan setelah
+        commit.
+        """
+        invalidate_after_commit()
+        quantity = _per_product(quantities)
+        updated = set(
+            db.session.scalars(
+                update(Product)
+                .where(Product.id.in_(list(quantities)), Product.stock >= quantity)
+                .values(stock=Product.stock - quantity, updated_at=Product.updated_at)
+                .returning(Product.id)
+                .execution_options(synchronize_session=False)
+            )
+        )
+        missing = sorted(set(quantities) - updated)
+        if missing:
+            raise InsufficientStockError(missing)
+
+    @staticmethod
+    def restore_stock(quantities: Dict[int, int]) -> None:
+        """
+        Mengembalikan stok beberapa produk dengan satu UPDATE. Commit oleh
+        pemanggil; cache katalog dikosongkan setelah commit.
+        """
+        invalidate_after_commit()
+        quantity = _per_product(quantities)
+        db.session.execute(
+            update(Product)
+            .where(Product.id.in_(list(quantities)))
+            .values(stock=Product.stock + quantity, updated_at=Product.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def hold(
+        items: Iterable[Tuple[int, int]],
+        buyer_id: Optional[int] = None,
+        reference: Optional[str] = None,
+        hold_seconds: int = HOLD_SECONDS,
+        commit: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Menahan stok untuk item (product_id, quantity) selama hold_seconds.
+        Semua item berhasil ditahan atau tidak sama sekali. Stok langsung
+        dikurangi, sehingga produk tidak pernah terjual melebihi stok;
+        hold yang tidak dikonfirmasi dikembalikan oleh sweep_expired.
+
+        Returns:
+            Dictionary berisi reference, expires_at, dan items
+        """
+        quantities = _merge_quantities(items)
+        reference = reference or uuid.uuid4().hex
+        expires_at = chrono.now() + timedelta(seconds=hold_seconds)
+
+        try:
+            ReservationService.decrement_stock(quantities)
+            db.session.execute(
+                insert(StockReservation),
+                [
+                    {
+                        "product_id": product_id,
+                        "buyer_id": buyer_id,
+                        "reference": reference,
+                        "quantity": quantity,
+                        "status": "held",
+                        "expires_at": expires_at,
+                    }
+                    for product_id, quantity in quantities.items()
+                ],
+            )
+            if commit:
+                db.session.commit()
+        except InsufficientStockError:
+            db.session.rollback()
+            raise
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise Exception(f"Gagal menahan stok: {str(e)}")
+
+        return {
+            "reference": reference,
+            "expires_at": expires_at,
+            "items": [
+                {"product_id": product_id, "quantity": quantity}
+                for product_id, quantity in quantities.items()
+            ],
+        }
+
+    @staticmethod
+    def confirm(
+        reference: str,
+        buyer_id: Optional[int] = None,
+        quantities: Optional[Dict[int, int]] = None,
+        commit: bool = True,
+    ) -> int:
+        """
+        Mengonfirmasi hold yang masih berlaku (misalnya saat order dibuat):
+        stok tetap berkurang dan hold tidak lagi dilepas sweeper.
+        HoldExpiredError dilempar jika hold tidak ditemukan, bukan milik
+        buyer_id, sudah kedaluwarsa, atau sudah dilepas; ValueError jika
+        isinya tidak sama dengan quantities. Mengembalikan jumlah hold yang
+        dikonfirmasi.
+        """
+        now = chrono.now()
+        condition = [StockReservation.reference == reference, StockReservation.expires_at > now]
+        if buyer_id is not None:
+            condition.append(StockReservation.buyer_id == buyer_id)
+
+        try:
+            # UPDATE bersyarat: hold yang sudah diambil sweeper tidak ikut terkonfirmasi
+            rows = db.session.execute(
+                update(StockReservation)
+                .where(*condition, StockReservation.status == "held")
+                .values(status="committed", resolved_at=now)
+                .returning(StockReservation.product_id, StockReservation.quantity)
+                .execution_options(synchronize_session=False)
+            ).all()
+            if not rows:
+                raise HoldExpiredError(reference)
+            if quantities is not None and _merge_quantities(rows) != quantities:
+                raise ValueError("Isi hold stok tidak sama dengan pesanan")
+            if commit:
+                db.session.commit()
+        except ValueError:
+            db.session.rollback()
+            raise
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise Exception(f"Gagal mengonfirmasi hold stok: {str(e)}")
+        return len(rows)
+
+    @staticmethod
+    def release(reference: str, buyer_id: Optional[int] = None) -> int:
+        """
+        Melepas hold yang belum dikonfirmasi (hanya milik buyer_id jika
+        diisi) dan mengembalikan stoknya. Mengembalikan jumlah hold yang
+        dilepas.
+        """
+        condition = StockReservation.reference == reference
+        if buyer_id is not None:
+            condition = and_(condition, StockReservation.buyer_id == buyer_id)
+        try:
+            released = ReservationService._release(condition, "released")
+            db.session.commit()
+            return released
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise Exception(f"Gagal melepas stok: {str(e)}")
+
+    @staticmethod
+    def sweep_expired(batch_size: int = SWEEP_BATCH_SIZE) -> int:
+        """
+        Melepas semua hold yang sudah kedaluwarsa per batch, commit per
+        batch. Aman dijalankan bersamaan di beberapa worker. Mengembalikan
+        jumlah hold yang dilepas.
+        """
+        total = 0
+        while True:
+            expired_ids = db.session.scalars(
+                ReservationService._expired_query(chrono.now(), batch_size)
+            ).all()
+            if not expired_ids:
+                return total
+
+            total += ReservationService._release(
+                StockReservation.id.in_(expired_ids), "expired"
+            )
+            db.session.commit()
+
+    @staticmethod
+    def _release(condition, status: str) -> int:
+        # Status hold diubah dengan UPDATE bersyarat, hanya hold yang benar-benar
+        # berpindah dari "held" yang stoknya dikembalikan (tidak pernah dobel)
+        rows = db.session.execute(
+            ReservationService._release_statement(condition, status)
+            .execution_options(synchronize_session=False)
+        ).all()
+        if rows:
+            ReservationService.restore_stock(_merge_quantities(rows))
+        return len(rows)
+
+    @staticmethod
+    def _expired_query(now, batch_size: int):
+        return (
+            select(StockReservation.id)
+            .where(StockReservation.status == "held", StockReservation.expires_at <= now)
+            .order_by(StockReservation.expires_at)
+            .limit(batch_size)
+        )
+
+    @staticmethod
+    def _release_statement(condition, status: str):
+        return (
+            update(StockReservation)
+            .where(condition, StockReservation.status == "held")
+            .values(status=status, resolved_at=chrono.now())
+            .returning(StockReservation.product_id, StockReservation.quantity)
+        )
@@ -0,0 +1,365 @@
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import delete, func, insert, select, update
+
+from app.models.order import Order
+from app.models.order_item import OrderItem
+from app.models.product import Product
+from app.models.seller import SellerProfile
+from app.models.seller_daily_sales import SellerDailySales
+from app.models.seller_product_daily_sales import SellerProductDailySales
+from app.schemas.seller_schema import DailySalesResponse, ProductSalesResponse
+from app.utils import chrono
+from app.utils.extensions import db
+from app.utils.money import to_money
+from app.utils.upsert import insert_for_dialect
+
+# Status order yang dihitung sebagai penjualan
+SALES_STATUSES = ("paid", "done")
+# Rentang maksimum dashboard penjualan
+MAX_SALES_DAYS = 366
+# Jumlah seller per transaksi saat menghitung ulang rollup
+REBUILD_BATCH_SIZE = 100
+
+PRODUCT_SALES_SORTS = ("revenue", "units")
+
+
+def _as_date(value) -> date:
+    # func.date() mengembalikan string di SQLite dan date di Postgres
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+def _check_range(start: date, end: date) -> None:
+    if start > end:
+        raise ValueError("Tanggal awal harus sebelum tanggal akhir")
+    if (end - start).days + 1 > MAX_SALES_DAYS:
+        raise ValueError(f"Rentang tanggal maksimal {MAX_SALES_DAYS} hari")
+
+
+class SalesService:
+    @staticmethod
+    def record_orders(order_ids: Iterable[int]) -> int:
+        """
+        Menambahkan order yang sudah paid/done ke rollup penjualan harian
+        seller. Setiap order hanya tercatat sekali (sales_recorded_at diisi
+        dengan UPDATE bersyarat), sehingga aman dipanggil berulang atau
+        bersamaan. Commit oleh pemanggil. Mengembalikan jumlah order yang
+        baru dicatat.
+        """
+        now = chrono.now()
+        recorded = db.session.execute(
+            update(Order)
+            .where(
+                Order.id.in_(list(order_ids)),
+                Order.status.in_(SALES_STATUSES),
+                Order.sales_recorded_at.is_(None),
+            )
+            .values(sales_recorded_at=now)
+            .returning(Order.id, Order.seller_id)
+            .execution_options(synchronize_session=False)
+        ).all()
+        if not recorded:
+            return 0
+
+        seller_ids = sorted({row.seller_id for row in recorded})
+        # Rebuild mengunci seller dengan FOR UPDATE; tunggu sampai selesai
+        db.session.execute(
+            select(SellerProfile.id)
+            .where(SellerProfile.id.in_(seller_ids))
+            .with_for_update(read=True)
+        ).all()
+
+        today = date(now.year, now.month, now.day)
+        items = db.session.execute(
+            select(
+                Order.seller_id,
+                OrderItem.product_id,
+                func.sum(OrderItem.quantity),
+                func.sum(OrderItem.quantity * OrderItem.price),
+            )
+            .join(OrderItem, OrderItem.order_id == Order.id)
+            .where(Order.id.in_([row.id for row in recorded]))
+            .group_by(Order.seller_id, OrderItem.product_id)
+        ).all()
+
+        orders_per_seller: Dict[int, int] = defaultdict(int)
+        for row in recorded:
+            orders_per_seller[row.seller_id] += 1
+        seller_totals: Dict[int, List] = defaultdict(lambda: [0, 0])
+        for seller_id, _, units, revenue in items:
+            seller_totals[seller_id][0] += units
+            seller_totals[seller_id][1] += to_money(revenue)
+
+        SalesService._upsert_seller_days(
+            [
+                {
+                    "seller_id": seller_id,
+                    "day": today,
+                    "order_count": orders_per_seller[seller_id],
+                    "units_sold": seller_totals[seller_id][0],
+                    "revenue": seller_totals[seller_id][1],
+                    "updated_at": now,
+                }
+                for seller_id in seller_ids
+            ]
+        )
+        SalesService._upsert_product_days(
+            [
+                {
+                    "seller_id": seller_id,
+                    "product_id": product_id,
+                    "day": today,
+                    "units_sold": units,
+                    "revenue": to_money(revenue),
+                    "updated_at": now,
+                }
+                for seller_id, product_id, units, revenue in items
+            ]
+        )
+        return len(recorded)
+
+    @staticmethod
+    def _upsert_seller_days(rows: List[dict]) -> None:
+        stmt = insert_for_dialect()(SellerDailySales).values(rows)
+        db.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[SellerDailySales.seller_id, SellerDailySales.day],
+                set_={
+                    "order_count": SellerDailySales.order_count + stmt.excluded.order_count,
+                    "units_sold": SellerDailySales.units_sold + stmt.excluded.units_sold,
+                    "revenue": SellerDailySales.revenue + stmt.excluded.revenue,
+                    "updated_at": stmt.excluded.updated_at,
+                },
+            )
+        )
+
+    @staticmethod
+    def _upsert_product_days(rows: List[dict]) -> None:
+        if not rows:
+            return
+        stmt = insert_for_dialect()(SellerProductDailySales).values(rows)
+        db.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[
+                    SellerProductDailySales.seller_id,
+                    SellerProductDailySales.day,
+                    SellerProductDailySales.product_id,
+                ],
+                set_={
+                    "units_sold": SellerProductDailySales.units_sold + stmt.excluded.units_sold,
+                    "revenue": SellerProductDailySales.revenue + stmt.excluded.revenue,
+                    "updated_at": stmt.excluded.updated_at,
+                },
+            )
+        )
+
+    @staticmethod
+    def _daily_sales_query(seller_id: int, start: date, end: date):
+        return select(
+            SellerDailySales.day,
+            SellerDailySales.order_count,
+            SellerDailySales.units_sold,
+            SellerDailySales.revenue,
+        ).where(
+            SellerDailySales.seller_id == seller_id,
+            SellerDailySales.day >= start,
+            SellerDailySales.day <= end,
+        )
+
+    @staticmethod
+    def _product_sales_query(
+        seller_id: int, start: date, end: date, sort: str, limit: Optional[int]
+    ):
+        units = func.sum(SellerProductDailySales.units_sold).label("units_sold")
+        revenue = func.sum(SellerProductDailySales.revenue).label("revenue")
+        query = (
+            select(SellerProductDailySales.product_id, units, revenue)
+            .where(
+                SellerProductDailySales.seller_id == seller_id,
+                SellerProductDailySales.day >= start,
+                SellerProductDailySales.day <= end,
+            )
+            .group_by(SellerProductDailySales.product_id)
+            .order_by(
+                (revenue if sort == "revenue" else units).desc(),
+                SellerProductDailySales.product_id,
+            )
+        )
+        if limit:
+            query = query.limit(limit)
+        return query
+
+    @staticmethod
+    def get_daily_sales(seller_id: int, start: date, end: date) -> List[DailySalesResponse]:
+        """
+        Pendapatan, jumlah order, dan unit terjual per hari untuk rentang
+        tanggal (termasuk hari tanpa penjualan), dibaca dari rollup.
+        """
+        _check_range(start, end)
+        rows = {
+            row.day: row
+            for row in db.session.execute(
+                SalesService._daily_sales_query(seller_id, start, end)
+            )
+        }
+
+        days = []
+        day = start
+        while day <= end:
+            row = rows.get(day)
+            days.append(
+                DailySalesResponse(
+                    day=day,
+                    order_count=row.order_count if row else 0,
+                    units_sold=row.units_sold if row else 0,
+                    revenue=row.revenue if row else 0,
+                )
+            )
+            day += timedelta(days=1)
+        return days
+
+    @staticmethod
+    def get_product_sales(
+        seller_id: int,
+        start: date,
+        end: date,
+        sort: str = "revenue",
+        limit: Optional[int] = None,
+    ) -> List[ProductSalesResponse]:
+        """
+        Unit terjual dan pendapatan per produk untuk rentang tanggal,
+        diurutkan dari yang terlaris (sort "revenue" atau "units"),
+        dibaca dari rollup.
+        """
+        _check_range(start, end)
+        if sort not in PRODUCT_SALES_SORTS:
+            raise ValueError(f"Urutan {sort} tidak dikenal")
+
+        query = SalesService._product_sales_query(seller_id, start, end, sort, limit)
+        rows = db.session.execute(query).all()
+
+        names = dict(
+            db.session.execute(
+                select(Product.id, Product.name).where(
+                    Product.id.in_([row.product_id for row in rows])
+                )
+            ).all()
+        )
+        return [
+            ProductSalesResponse(
+                product_id=row.product_id,
+                product_name=names.get(row.product_id),
+                units_sold=row.units_sold,
+                revenue=row.revenue,
+            )
+            for row in rows
+        ]
+
+    @staticmethod
+    def rebuild(
+        seller_ids: Optional[Iterable[int]] = None, batch_size: int = REBUILD_BATCH_SIZE
+    ) -> int:
+        """
+        Menghitung ulang rollup penjualan dari orders dan order_items per
+        batch seller (semua seller atau seller tertentu), commit per batch.
+        Order paid/done lama yang belum tercatat dicatat pada tanggal
+        dibuatnya. Mengembalikan jumlah seller yang dihitung ulang.
+        """
+        processed = 0
+        last_id = 0
+        selected = sorted(set(seller_ids)) if seller_ids is not None else None
+        while True:
+            query = (
+                select(SellerProfile.id)
+                .where(SellerProfile.id > last_id)
+                .order_by(SellerProfile.id)
+                .limit(batch_size)
+                .with_for_update()
+            )
+            if selected is not None:
+                query = query.where(SellerProfile.id.in_(selected))
+            ids = db.session.scalars(query).all()
+            if not ids:
+                return processed
+
+            db.session.execute(
+                update(Order)
+                .where(
+                    Order.seller_id.in_(ids),
+                    Order.status.in_(SALES_STATUSES),
+                    Order.sales_recorded_at.is_(None),
+                )
+                .values(sales_recorded_at=Order.created_at)
+                .execution_options(synchronize_session=False)
+            )
+
+            day = func.date(Order.sales_recorded_at)
+            recorded = (
+                Order.seller_id.in_(ids),
+                Order.sales_recorded_at.is_not(None),
+            )
+            seller_rows = db.session.execute(
+                select(Order.seller_id, day, func.count(Order.id))
+                .where(*recorded)
+                .group_by(Order.seller_id, day)
+            ).all()
+            product_rows = db.session.execute(
+                select(
+                    Order.seller_id,
+                    day,
+                    OrderItem.product_id,
+                    func.sum(OrderItem.quantity),
+                    func.sum(OrderItem.quantity * OrderItem.price),
+                )
+                .join(OrderItem, OrderItem.order_id == Order.id)
+                .where(*recorded)
+                .group_by(Order.seller_id, day, OrderItem.product_id)
+            ).all()
+
+            now = chrono.now()
+            seller_days = {
+                (seller_id, _as_date(sales_day)): {
+                    "seller_id": seller_id,
+                    "day": _as_date(sales_day),
+                    "order_count": count,
+                    "units_sold": 0,
+                    "revenue": 0,
+                    "updated_at": now,
+                }
+                for seller_id, sales_day, count in seller_rows
+            }
+            product_days = []
+            for seller_id, sales_day, product_id, units, revenue in product_rows:
+                sales_day = _as_date(sales_day)
+                seller_day = seller_days[(seller_id, sales_day)]
+                seller_day["units_sold"] += units
+                seller_day["revenue"] += to_money(revenue)
+                product_days.append(
+                    {
+                        "seller_id": seller_id,
+                        "product_id": product_id,
+                        "day": sales_day,
+                        "units_sold": units,
+                        "revenue": to_money(revenue),
+                        "updated_at": now,
+                    }
+                )
+
+            db.session.execute(
+                delete(SellerDailySales).where(SellerDailySales.seller_id.in_(ids))
+            )
+            db.session.execute(
+                delete(SellerProductDailySales).where(
+                    SellerProductDailySales.seller_id.in_(ids)
+                )
+            )
+            if seller_days:
+                db.session.execute(insert(SellerDailySales), list(seller_days.values()))
+            if product_days:
+                db.session.execute(insert(SellerProductDailySales), product_days)
+            db.session.commit()
+
+            processed += len(ids)
+            last_id = ids[-1]
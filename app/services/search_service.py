@@ -0,0 +1,277 @@
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from flask import current_app
+from sqlalchemy import (
+    bindparam,
+    cast,
+    column,
+    event,
+    func,
+    literal,
+    literal_column,
+    or_,
+    table,
+    text,
+)
+from sqlalchemy.dialects.postgresql import REGCONFIG
+
+from app.models.product import Product
+from app.schemas.product_schema import DEFAULT_PRODUCT_LIST_FIELDS
+from app.utils.extensions import db
+from app.utils.pagination import (
+    decode_cursor,
+    encode_cursor,
+    keyset_condition,
+    parse_limit,
+)
+
+SEARCH_SORT = "relevance"
+REINDEX_BATCH_SIZE = 1000
+
+
+def _search_terms(q: str) -> List[str]:
+    """Memecah kata kunci menjadi token alfanumerik (aman untuk sintaks FTS)"""
+    return re.findall(r"\w+", q.lower(), re.UNICODE)
+
+
+class LikeSearchBackend:
+    """
+    Fallback tanpa index full-text: ILIKE pada nama dan deskripsi.
+    Dipakai untuk database selain Postgres dan SQLite.
+    """
+
+    def apply(self, query, terms: List[str]):
+        conditions = []
+        for term in terms:
+            pattern = f"%{term}%"
+            conditions.append(
+                or_(Product.name.ilike(pattern), Product.description.ilike(pattern))
+            )
+        return query.filter(*conditions), literal(0.0)
+
+    CREATE_DDL: Tuple[str, ...] = ()
+    DROP_DDL: Tuple[str, ...] = ()
+
+    def index_products(self, product_ids: Iterable[int]) -> None:
+        pass
+
+    def ensure_index(self) -> None:
+        pass
+
+
+class PostgresSearchBackend:
+    """
+    Kolom products.search_vector (tsvector, index GIN) dengan bobot nama A
+    dan deskripsi B, diranking dengan ts_rank_cd.
+    """
+
+    search_vector = literal_column("products.search_vector")
+
+    CREATE_DDL = (
+        "ALTER TABLE products ADD COLUMN IF NOT EXISTS search_vector tsvector",
+        "CREATE INDEX IF NOT EXISTS ix_products_search_vector "
+        "ON products USING GIN (search_vector)",
+    )
+    # Kolom dan index ikut terhapus bersama tabel products
+    DROP_DDL: Tuple[str, ...] = ()
+
+    def __init__(self, ts_config: str = "simple"):
+        self.ts_config = ts_config
+
+    def apply(self, query, terms: List[str]):
+        # Setiap kata dicocokkan sebagai prefix, semua kata harus ada
+        ts_query = func.to_tsquery(
+            cast(self.ts_config, REGCONFIG),
+            " & ".join(f"{term}:*" for term in terms),
+        )
+        score = func.ts_rank_cd(self.search_vector, ts_query)
+        return query.filter(self.search_vector.op("@@")(ts_query)), score
+
+    def index_products(self, product_ids: Iterable[int]) -> None:
+        db.session.execute(
+            text(
+                "UPDATE products SET search_vector = "
+                "setweight(to_tsvector(CAST(:cfg AS regconfig), coalesce(name, '')), 'A') || "
+                "setweight(to_tsvector(CAST(:cfg AS regconfig), coalesce(description, '')), 'B') "
+                "WHERE id IN :ids"
+            ).bindparams(bindparam("ids", expanding=True)),
+            {"cfg": self.ts_config, "ids": list(product_ids)},
+        )
+
+    def ensure_index(self) -> None:
+        for statement in self.CREATE_DDL:
+            db.session.execute(text(statement))
+
+
+class SqliteSearchBackend:
+    """
+    Virtual table FTS5 products_fts (rowid = products.id) untuk development,
+    diranking dengan bm25 (nama berbobot lebih tinggi dari deskripsi).
+    """
+
+    fts = table("products_fts", column("rowid"), column("name"), column("description"))
+
+    CREATE_DDL = (
+        "CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING "
+        "fts5(name, description, tokenize = 'unicode61 remove_diacritics 2')",
+    )
+    DROP_DDL = ("DROP TABLE IF EXISTS products_fts",)
+
+    def apply(self, query, terms: List[str]):
+        match = " ".join(f'"{term}"*' for term in terms)
+        # bm25 makin kecil makin relevan, dibalik supaya urutannya menurun
+        score = -func.bm25(literal_column("products_fts"), 10.0, 1.0)
+        query = query.join(self.fts, self.fts.c.rowid == Product.id).filter(
+            text("products_fts MATCH :fts_match").bindparams(fts_match=match)
+        )
+        return query, score
+
+    def index_products(self, product_ids: Iterable[int]) -> None:
+        params = {"ids": list(product_ids)}
+        db.session.execute(
+            text("DELETE FROM products_fts WHERE rowid IN :ids").bindparams(
+                bindparam("ids", expanding=True)
+            ),
+            params,
+        )
+        db.session.execute(
+            text(
+                "INSERT INTO products_fts (rowid, name, description) "
+                "SELECT id, coalesce(name, ''), coalesce(description, '') "
+                "FROM products WHERE id IN :ids"
+            ).bindparams(bindparam("ids", expanding=True)),
+            params,
+        )
+
+    def ensure_index(self) -> None:
+        for statement in self.CREATE_DDL:
+            db.session.execute(text(statement))
+
+
+def _backend_class(dialect: str):
+    if dialect == "postgresql":
+        return PostgresSearchBackend
+    if dialect == "sqlite":
+        return SqliteSearchBackend
+    return LikeSearchBackend
+
+
+def get_search_backend():
+    """Memilih backend pencarian sesuai dialect database"""
+    backend_class = _backend_class(db.session.get_bind().dialect.name)
+    if backend_class is PostgresSearchBackend:
+        return PostgresSearchBackend(current_app.config.get("SEARCH_TS_CONFIG", "simple"))
+    return backend_class()
+
+
+# Di production index pencarian dibuat oleh migrasi 2e43a32c15c2; database
+# dari db.create_all() (test, development) mendapatkannya lewat event DDL
+@event.listens_for(Product.__table__, "after_create")
+def _create_search_index(target, connection, **kw):
+    for statement in _backend_class(connection.dialect.name).CREATE_DDL:
+        connection.exec_driver_sql(statement)
+
+
+@event.listens_for(Product.__table__, "before_drop")
+def _drop_search_index(target, connection, **kw):
+    for statement in _backend_class(connection.dialect.name).DROP_DDL:
+        connection.exec_driver_sql(statement)
+
+
+class SearchService:
+    @staticmethod
+    def search_products(
+        q: str,
+        category_id: Optional[int] = None,
+        price_min: Optional[float] = None,
+        price_max: Optional[float] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        include_total: bool = False,
+        fields: Tuple[str, ...] = DEFAULT_PRODUCT_LIST_FIELDS,
+    ) -> Dict[str, Any]:
+        """
+        Mencari produk berdasarkan nama dan deskripsi, diurutkan berdasarkan
+        relevansi dan dipaginasi dengan cursor.
+        """
+        # Import di sini untuk menghindari circular import
+        from app.services.product_service import ProductService
+
+        limit = parse_limit(limit)
+        terms = _search_terms(q)
+        if not terms:
+            return {"items": [], "next_cursor": None, "total": 0 if include_total else None}
+
+        query = ProductService._filtered_query(
+            category_id=category_id, price_min=price_min, price_max=price_max
+        )
+        query, score = get_search_backend().apply(query, terms)
+
+        total = None
+        if include_total:
+            total = query.with_entities(func.count(Product.id)).scalar()
+
+        if cursor:
+            values = decode_cursor(cursor, SEARCH_SORT, (literal(0.0), Product.id))
+            query = query.filter(keyset_condition((score, Product.id), values, True))
+
+        rows = (
+            query.with_entities(
+                *ProductService.list_columns(fields, (Product.id,)), score.label("score")
+            )
+            .order_by(score.desc(), Product.id.desc())
+            .limit(limit + 1)
+            .all()
+        )
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_cursor(SEARCH_SORT, [last.score, last.id])
+
+        return {
+            "items": rows,
+            "next_cursor": next_cursor,
+            "total": total,
+        }
+
+    @staticmethod
+    def index_products(product_ids: Iterable[int]) -> None:
+        """
+        Menyinkronkan index pencarian untuk produk tertentu. Dipanggil dalam
+        transaksi yang sama dengan perubahan produk (commit oleh pemanggil).
+        """
+        product_ids = list(product_ids)
+        if product_ids:
+            get_search_backend().index_products(product_ids)
+
+    @staticmethod
+    def rebuild_index(batch_size: int = REINDEX_BATCH_SIZE) -> int:
+        """
+        Membuat index (jika belum ada) dan mengindeks ulang semua produk
+        secara bertahap. Mengembalikan jumlah produk yang diindeks.
+        """
+        backend = get_search_backend()
+        backend.ensure_index()
+        db.session.commit()
+
+        indexed = 0
+        last_id = 0
+        while True:
+            ids = [
+                product_id
+                for (product_id,) in db.session.query(Product.id)
+                .filter(Product.id > last_id)
+                .order_by(Product.id)
+                .limit(batch_size)
+                .all()
+            ]
+            if not ids:
+                break
+            backend.index_products(ids)
+            db.session.commit()
+            indexed += len(ids)
+            last_id = ids[-1]
+        return indexed
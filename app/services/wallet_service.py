@@ -0,0 +1,611 @@
+import random
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import case, delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError, OperationalError, SQLAlchemyError
+
+from app.models.wallet import Wallet
+from app.models.wallet_monthly_total import WalletMonthlyTotal
+from app.models.wallet_snapshot import WalletSnapshot
+from app.models.wallet_transaction import WalletTransaction
+from app.schemas.wallet_schema import (
+    WalletMonthlySummary,
+    WalletResponse,
+    WalletStatementResponse,
+    WalletTransactionResponse,
+    WalletTypeTotal,
+)
+from app.utils import chrono
+from app.utils.extensions import db
+from app.utils.money import to_money
+from app.utils.pagination import (
+    decode_cursor,
+    encode_cursor,
+    keyset_condition,
+    keyset_order_by,
+    parse_limit,
+)
+from app.utils.upsert import insert_for_dialect
+
+# Jenis transaksi yang menambah dan mengurangi saldo
+CREDIT_TYPES = ("topup", "refund")
+DEBIT_TYPES = ("withdraw", "payment")
+
+# Percobaan ulang saat versi wallet sudah diubah transaksi lain
+MAX_RETRIES = 20
+RETRY_BASE_DELAY = 0.002
+RETRY_MAX_DELAY = 0.05
+
+# Jumlah wallet per transaksi saat membuat snapshot / menghitung ulang rollup
+SNAPSHOT_BATCH_SIZE = 500
+ROLLUP_BATCH_SIZE = 200
+# Rentang maksimum ringkasan statement
+MAX_STATEMENT_MONTHS = 24
+
+HISTORY_SORT = "newest"
+_HISTORY_SORT_COLUMNS = (WalletTransaction.created_at, WalletTransaction.id)
+
+
+class InsufficientBalanceError(ValueError):
+    """Saldo wallet tidak cukup untuk transaksi yang diminta"""
+
+    def __init__(self):
+        super().__init__("Saldo wallet tidak mencukupi")
+
+
+class WalletConflictError(Exception):
+    """Saldo wallet terus berubah bersamaan sampai batas percobaan ulang"""
+
+    def __init__(self):
+        super().__init__("Wallet sedang sibuk, silakan coba lagi")
+
+
+def _signed_amount():
+    # Nominal transaksi dengan tanda: debit negatif, kredit positif
+    return case(
+        (WalletTransaction.transaction_type.in_(DEBIT_TYPES), -WalletTransaction.amount),
+        else_=WalletTransaction.amount,
+    )
+
+
+def _month_of(value: datetime) -> date:
+    return date(value.year, value.month, 1)
+
+
+def _next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+class WalletService:
+    @staticmethod
+    def get_wallet(user_id: int, at: Optional[datetime] = None) -> WalletResponse:
+        """
+        Mendapatkan saldo wallet user saat ini, atau saldo pada waktu `at`
+        (lihat balance_at). User tanpa wallet bersaldo 0.
+        """
+        wallet = db.session.execute(
+            select(Wallet.id, Wallet.balance, Wallet.version).where(Wallet.user_id == user_id)
+        ).one_or_none()
+        if wallet is None:
+            return WalletResponse(user_id=user_id, balance=0, version=0, as_of=at)
+        if at is None:
+            return WalletResponse(
+                user_id=user_id, balance=wallet.balance or 0, version=wallet.version
+            )
+        return WalletResponse(
+            user_id=user_id,
+            balance=WalletService.balance_at(wallet.id, at),
+            version=wallet.version,
+            as_of=at,
+        )
+
+    @staticmethod
+    def _transactions_query(
+        wallet_id: int,
+        limit: int,
+        cursor: Optional[str],
+        transaction_type: Optional[str],
+        status: Optional[str],
+    ):
+        """Query satu halaman riwayat transaksi (limit + 1 baris), terbaru dulu"""
+        query = select(WalletTransaction).where(WalletTransaction.wallet_id == wallet_id)
+        if transaction_type:
+            query = query.where(WalletTransaction.transaction_type == transaction_type)
+        if status:
+            query = query.where(WalletTransaction.status == status)
+        if cursor:
+            values = decode_cursor(cursor, HISTORY_SORT, _HISTORY_SORT_COLUMNS)
+            query = query.where(keyset_condition(_HISTORY_SORT_COLUMNS, values, True))
+        return query.order_by(*keyset_order_by(_HISTORY_SORT_COLUMNS, True)).limit(limit + 1)
+
+    @staticmethod
+    def _monthly_totals_query(wallet_id: int, start_month: date, end_month: date):
+        return select(
+            WalletMonthlyTotal.month,
+            WalletMonthlyTotal.transaction_type,
+            WalletMonthlyTotal.transaction_count,
+            WalletMonthlyTotal.total_amount,
+        ).where(
+            WalletMonthlyTotal.wallet_id == wallet_id,
+            WalletMonthlyTotal.month >= start_month,
+            WalletMonthlyTotal.month <= end_month,
+        )
+
+    @staticmethod
+    def _snapshot_at_query(wallet_id: int, at: datetime):
+        # Snapshot terakhir sebelum `at`
+        return (
+            select(WalletSnapshot.balance, WalletSnapshot.as_of)
+            .where(WalletSnapshot.wallet_id == wallet_id, WalletSnapshot.as_of <= at)
+            .order_by(WalletSnapshot.as_of.desc())
+            .limit(1)
+        )
+
+    @staticmethod
+    def _balance_after_at_query(wallet_id: int, at: datetime):
+        # Transaksi ledger terakhir sebelum `at` yang mencatat balance_after
+        return (
+            select(WalletTransaction.balance_after, WalletTransaction.created_at)
+            .where(
+                WalletTransaction.wallet_id == wallet_id,
+                WalletTransaction.created_at <= at,
+                WalletTransaction.balance_after.is_not(None),
+            )
+            .order_by(WalletTransaction.created_at.desc(), WalletTransaction.id.desc())
+            .limit(1)
+        )
+
+    @staticmethod
+    def get_transactions(
+        user_id: int,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        transaction_type: Optional[str] = None,
+        status: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Mendapatkan riwayat transaksi wallet user (terbaru dulu) dengan
+        cursor pagination pada (wallet_id, created_at, id), sehingga setiap
+        halaman dibaca langsung dari index berapa pun panjang riwayatnya.
+        """
+        limit = parse_limit(limit)
+        if transaction_type and transaction_type not in CREDIT_TYPES + DEBIT_TYPES:
+            raise ValueError(f"Jenis transaksi {transaction_type} tidak dikenal")
+
+        wallet_id = WalletService._wallet_id(user_id)
+        if wallet_id is None:
+            return {"items": [], "next_cursor": None}
+
+        transactions = db.session.scalars(
+            WalletService._transactions_query(
+                wallet_id, limit, cursor, transaction_type, status
+            )
+        ).all()
+
+        next_cursor = None
+        if len(transactions) > limit:
+            transactions = transactions[:limit]
+            last = transactions[-1]
+            next_cursor = encode_cursor(HISTORY_SORT, [last.created_at, last.id])
+
+        return {
+            "items": [
+                WalletTransactionResponse.model_validate(transaction)
+                for transaction in transactions
+            ],
+            "next_cursor": next_cursor,
+        }
+
+    @staticmethod
+    def get_statement(user_id: int, start_month: date, end_month: date) -> WalletStatementResponse:
+        """
+        Ringkasan statement per bulan (UTC) dari tabel rollup
+        wallet_monthly_totals, ditambah saldo awal dan akhir periode dari
+        balance_at. Tidak membaca riwayat transaksi.
+        """
+        start_month, end_month = _month_of(start_month), _month_of(end_month)
+        if start_month > end_month:
+            raise ValueError("Bulan awal harus sebelum bulan akhir")
+        months: List[date] = [start_month]
+        while months[-1] < end_month:
+            months.append(_next_month(months[-1]))
+        if len(months) > MAX_STATEMENT_MONTHS:
+            raise ValueError(f"Rentang statement maksimal {MAX_STATEMENT_MONTHS} bulan")
+
+        summaries = {month: WalletMonthlySummary(month=month) for month in months}
+        wallet_id = WalletService._wallet_id(user_id)
+        if wallet_id is None:
+            return WalletStatementResponse(
+                user_id=user_id,
+                start_month=start_month,
+                end_month=end_month,
+                opening_balance=0,
+                closing_balance=0,
+                months=list(summaries.values()),
+            )
+
+        rows = db.session.execute(
+            WalletService._monthly_totals_query(wallet_id, start_month, end_month)
+        )
+        for row in rows:
+            summary = summaries[row.month]
+            amount = to_money(row.total_amount)
+            summary.by_type[row.transaction_type] = WalletTypeTotal(
+                transaction_count=row.transaction_count, total_amount=amount
+            )
+            if row.transaction_type in DEBIT_TYPES:
+                summary.debit = float(to_money(summary.debit) + amount)
+            else:
+                summary.credit = float(to_money(summary.credit) + amount)
+
+        # Kolom created_at tanpa timezone, batas bulan dalam UTC
+        period_start = datetime(start_month.year, start_month.month, 1)
+        period_end = datetime.combine(_next_month(end_month), datetime.min.time())
+        return WalletStatementResponse(
+            user_id=user_id,
+            start_month=start_month,
+            end_month=end_month,
+            opening_balance=WalletService.balance_at(
+                wallet_id, period_start - timedelta(microseconds=1)
+            ),
+            closing_balance=WalletService.balance_at(
+                wallet_id, period_end - timedelta(microseconds=1)
+            ),
+            months=list(summaries.values()),
+        )
+
+    @staticmethod
+    def apply(
+        user_id: int, transaction_type: str, amount, commit: bool = True
+    ) -> WalletTransactionResponse:
+        """
+        Mengubah saldo wallet user dengan satu transaksi ledger (append-only).
+        Saldo diubah dengan UPDATE bersyarat: versi wallet harus sama dengan
+        yang dibaca dan saldo tidak boleh negatif. Jika versi sudah diubah
+        transaksi lain, saldo dibaca ulang dan dicoba lagi dengan jeda acak.
+
+        Dengan commit=False transaksi menjadi bagian dari transaksi pemanggil
+        (misalnya checkout) dan percobaan ulang dilakukan tanpa rollback.
+        """
+        if transaction_type not in CREDIT_TYPES + DEBIT_TYPES:
+            raise ValueError(f"Jenis transaksi {transaction_type} tidak dikenal")
+        amount = to_money(amount)
+        if amount <= 0:
+            raise ValueError("Nominal transaksi harus lebih dari 0")
+        delta = amount if transaction_type in CREDIT_TYPES else -amount
+
+        try:
+            for attempt in range(MAX_RETRIES):
+                try:
+                    result = WalletService._try_apply(user_id, transaction_type, amount, delta)
+                except OperationalError:
+                    # Konflik serialisasi / database terkunci: ulangi dari awal
+                    if not commit:
+                        raise
+                    result = None
+
+                if result is not None:
+                    if commit:
+                        db.session.commit()
+                    return result
+
+                if commit:
+                    # Transaksi baru supaya pembacaan berikutnya melihat versi terbaru
+                    db.session.rollback()
+                delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2**attempt)
+                time.sleep(random.uniform(0, delay))
+            raise WalletConflictError()
+        except (ValueError, WalletConflictError):
+            if commit:
+                db.session.rollback()
+            raise
+        except SQLAlchemyError as e:
+            if not commit:
+                raise
+            db.session.rollback()
+            raise Exception(f"Gagal memproses transaksi wallet: {str(e)}")
+
+    @staticmethod
+    def _try_apply(
+        user_id: int, transaction_type: str, amount: Decimal, delta: Decimal
+    ) -> Optional[WalletTransactionResponse]:
+        # Satu percobaan: None jika versi wallet berubah sejak dibaca
+        wallet_id = WalletService._wallet_id(user_id, create=delta > 0)
+        if wallet_id is None:
+            raise InsufficientBalanceError()
+
+        current = db.session.execute(
+            select(Wallet.balance, Wallet.version).where(Wallet.id == wallet_id)
+        ).one()
+        if to_money(current.balance or 0) + delta < 0:
+            raise InsufficientBalanceError()
+
+        balance = func.coalesce(Wallet.balance, 0)
+        updated = db.session.execute(
+            update(Wallet)
+            .where(
+                Wallet.id == wallet_id,
+                Wallet.version == current.version,
+                balance + delta >= 0,
+            )
+            .values(balance=balance + delta, version=Wallet.version + 1)
+            .returning(Wallet.balance)
+            .execution_options(synchronize_session=False)
+        ).one_or_none()
+        if updated is None:
+            return None
+
+        # Waktu diambil setelah baris wallet terkunci, sehingga urutan
+        # created_at per wallet sama dengan urutan perubahan saldo
+        row = {
+            "wallet_id": wallet_id,
+            "transaction_type": transaction_type,
+            "amount": amount,
+            "status": "verified",
+            "balance_after": updated.balance,
+            "created_at": chrono.now(),
+        }
+        transaction_id = db.session.scalar(
+            insert(WalletTransaction).returning(WalletTransaction.id), row
+        )
+        WalletService._add_to_monthly_total(
+            wallet_id, _month_of(row["created_at"]), transaction_type, 1, amount
+        )
+        return WalletTransactionResponse(id=transaction_id, **row)
+
+    @staticmethod
+    def _add_to_monthly_total(
+        wallet_id: int, month: date, transaction_type: str, count: int, amount: Decimal
+    ) -> None:
+        # Upsert atomik: baris bulan baru dibuat, baris yang ada ditambah
+        insert_stmt = insert_for_dialect()(WalletMonthlyTotal).values(
+            wallet_id=wallet_id,
+            month=month,
+            transaction_type=transaction_type,
+            transaction_count=count,
+            total_amount=amount,
+            updated_at=chrono.now(),
+        )
+        db.session.execute(
+            insert_stmt.on_conflict_do_update(
+                index_elements=[
+                    WalletMonthlyTotal.wallet_id,
+                    WalletMonthlyTotal.month,
+                    WalletMonthlyTotal.transaction_type,
+                ],
+                set_={
+                    "transaction_count": WalletMonthlyTotal.transaction_count
+                    + insert_stmt.excluded.transaction_count,
+                    "total_amount": WalletMonthlyTotal.total_amount
+                    + insert_stmt.excluded.total_amount,
+                    "updated_at": insert_stmt.excluded.updated_at,
+                },
+            )
+        )
+
+    @staticmethod
+    def _wallet_id(user_id: int, create: bool = False) -> Optional[int]:
+        query = select(Wallet.id).where(Wallet.user_id == user_id)
+        wallet_id = db.session.scalar(query)
+        if wallet_id is not None or not create:
+            return wallet_id
+
+        try:
+            with db.session.begin_nested():
+                wallet = Wallet(user_id=user_id, balance=0, version=0)
+                db.session.add(wallet)
+            return wallet.id
+        except IntegrityError:
+            # Wallet dibuat bersamaan oleh request lain
+            return db.session.scalar(query)
+
+    @staticmethod
+    def balance_at(wallet_id: int, at: datetime) -> Decimal:
+        """
+        Saldo wallet pada waktu tertentu dari dua index seek: snapshot
+        terakhir sebelum `at` dan transaksi ledger terakhir sebelum `at`
+        (balance_after), mana yang lebih baru. Tidak menjumlahkan riwayat.
+        """
+        snapshot = db.session.execute(
+            WalletService._snapshot_at_query(wallet_id, at)
+        ).one_or_none()
+        transaction = db.session.execute(
+            WalletService._balance_after_at_query(wallet_id, at)
+        ).one_or_none()
+
+        if transaction is not None and (
+            snapshot is None or transaction.created_at > snapshot.as_of
+        ):
+            return to_money(transaction.balance_after)
+        if snapshot is not None:
+            return to_money(snapshot.balance)
+        return Decimal("0.00")
+
+    @staticmethod
+    def take_snapshots(batch_size: int = SNAPSHOT_BATCH_SIZE) -> int:
+        """
+        Menyimpan snapshot saldo untuk semua wallet yang berubah sejak
+        snapshot terakhirnya, per batch wallet, commit per batch. Baris
+        wallet dikunci (FOR SHARE) selama batch supaya saldo, versi, dan
+        transaksi terakhir yang dicatat konsisten. Mengembalikan jumlah
+        snapshot yang dibuat.
+        """
+        created = 0
+        last_id = 0
+        while True:
+            wallets = db.session.execute(
+                select(Wallet.id, Wallet.balance, Wallet.version)
+                .where(Wallet.id > last_id)
+                .order_by(Wallet.id)
+                .limit(batch_size)
+                .with_for_update(read=True)
+            ).all()
+            if not wallets:
+                return created
+            ids = [wallet.id for wallet in wallets]
+            last_id = ids[-1]
+
+            snapshot_versions = dict(
+                db.session.execute(
+                    select(WalletSnapshot.wallet_id, func.max(WalletSnapshot.version))
+                    .where(WalletSnapshot.wallet_id.in_(ids))
+                    .group_by(WalletSnapshot.wallet_id)
+                ).all()
+            )
+            changed = [
+                wallet
+                for wallet in wallets
+                if snapshot_versions.get(wallet.id, -1) != wallet.version
+            ]
+            if not changed:
+                db.session.commit()
+                continue
+
+            last_transactions = dict(
+                db.session.execute(
+                    select(WalletTransaction.wallet_id, func.max(WalletTransaction.id))
+                    .where(WalletTransaction.wallet_id.in_([w.id for w in changed]))
+                    .group_by(WalletTransaction.wallet_id)
+                ).all()
+            )
+            as_of = chrono.now()
+            db.session.execute(
+                insert(WalletSnapshot),
+                [
+                    {
+                        "wallet_id": wallet.id,
+                        "transaction_id": last_transactions.get(wallet.id),
+                        "balance": wallet.balance or 0,
+                        "version": wallet.version,
+                        "as_of": as_of,
+                    }
+                    for wallet in changed
+                ],
+            )
+            db.session.commit()
+            created += len(changed)
+
+    @staticmethod
+    def audit(user_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Memeriksa saldo wallet terhadap ledger: snapshot terakhir ditambah
+        transaksi sesudahnya harus sama dengan saldo saat ini, dan
+        balance_after setiap transaksi harus sama dengan saldo berjalan.
+        Hanya transaksi sejak snapshot terakhir yang dibaca.
+        Mengembalikan None jika user tidak punya wallet.
+        """
+        wallet = db.session.execute(
+            select(Wallet.id, Wallet.balance)
+            .where(Wallet.user_id == user_id)
+            .with_for_update(read=True)
+        ).one_or_none()
+        if wallet is None:
+            return None
+
+        snapshot = db.session.execute(
+            select(WalletSnapshot.balance, WalletSnapshot.transaction_id)
+            .where(WalletSnapshot.wallet_id == wallet.id)
+            .order_by(WalletSnapshot.as_of.desc(), WalletSnapshot.id.desc())
+            .limit(1)
+        ).one_or_none()
+
+        query = select(
+            WalletTransaction.id, _signed_amount().label("delta"), WalletTransaction.balance_after
+        ).where(
+            WalletTransaction.wallet_id == wallet.id,
+            WalletTransaction.status == "verified",
+        )
+        running = Decimal("0.00")
+        if snapshot is not None:
+            running = to_money(snapshot.balance)
+            if snapshot.transaction_id is not None:
+                query = query.where(WalletTransaction.id > snapshot.transaction_id)
+
+        checked = 0
+        mismatched = []
+        for row in db.session.execute(
+            query.order_by(WalletTransaction.created_at, WalletTransaction.id)
+        ):
+            running += to_money(row.delta)
+            checked += 1
+            if row.balance_after is not None and to_money(row.balance_after) != running:
+                mismatched.append(row.id)
+        db.session.commit()
+
+        balance = to_money(wallet.balance or 0)
+        return {
+            "wallet_id": wallet.id,
+            "balance": float(balance),
+            "expected_balance": float(running),
+            "checked_transactions": checked,
+            "mismatched_transaction_ids": mismatched,
+            "ok": balance == running and not mismatched,
+        }
+
+    @staticmethod
+    def rebuild_monthly_totals(batch_size: int = ROLLUP_BATCH_SIZE) -> int:
+        """
+        Menghitung ulang tabel rollup wallet_monthly_totals dari riwayat
+        transaksi per batch wallet, commit per batch. Wallet dalam batch
+        dikunci selama dihitung supaya transaksi baru tidak terlewat atau
+        terhitung dua kali. Mengembalikan jumlah wallet yang dihitung ulang.
+        """
+        processed = 0
+        last_id = 0
+        while True:
+            ids = db.session.scalars(
+                select(Wallet.id)
+                .where(Wallet.id > last_id)
+                .order_by(Wallet.id)
+                .limit(batch_size)
+                .with_for_update()
+            ).all()
+            if not ids:
+                return processed
+
+            totals: Dict[tuple, List] = defaultdict(lambda: [0, Decimal("0.00")])
+            rows = db.session.execute(
+                select(
+                    WalletTransaction.wallet_id,
+                    WalletTransaction.created_at,
+                    WalletTransaction.transaction_type,
+                    WalletTransaction.amount,
+                )
+                .where(
+                    WalletTransaction.wallet_id.in_(ids),
+                    WalletTransaction.status == "verified",
+                )
+                .execution_options(yield_per=5000)
+            )
+            for wallet_id, created_at, transaction_type, amount in rows:
+                total = totals[(wallet_id, _month_of(created_at), transaction_type)]
+                total[0] += 1
+                total[1] += to_money(amount)
+
+            db.session.execute(
+                delete(WalletMonthlyTotal).where(WalletMonthlyTotal.wallet_id.in_(ids))
+            )
+            if totals:
+                now = chrono.now()
+                db.session.execute(
+                    insert(WalletMonthlyTotal),
+                    [
+                        {
+                            "wallet_id": wallet_id,
+                            "month": month,
+                            "transaction_type": transaction_type,
+                            "transaction_count": count,
+                            "total_amount": amount,
+                            "updated_at": now,
+                        }
+                        for (wallet_id, month, transaction_type), (count, amount) in totals.items()
+                    ],
+                )
+            db.session.commit()
+
+            processed += len(ids)
+            last_id = ids[-1]
@@ -0,0 +1,38 @@
+import threading
+from typing import List
+
+from flask import current_app
+
+from app.utils.supabase_client import supabase_client
+
+
+class LocalAuthAdmin:
+    """
+    Pengganti admin API Supabase Auth untuk development dan testing.
+    Hanya mencatat user yang dihapus, tanpa network call.
+    """
+
+    def __init__(self):
+        self.deleted_users: List[str] = []
+        self._lock = threading.Lock()
+
+    def delete_user(self, id: str, should_soft_delete: bool = False) -> None:
+        with self._lock:
+            self.deleted_users.append(id)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.deleted_users.clear()
+
+
+local_auth_admin = LocalAuthAdmin()
+
+
+def get_auth_admin():
+    """
+    Mengembalikan admin API sesuai konfigurasi AUTH_ADMIN_BACKEND
+    ("supabase" atau "local")
+    """
+    if current_app.config.get("AUTH_ADMIN_BACKEND") == "local":
+        return local_auth_admin
+    return supabase_client.auth.admin
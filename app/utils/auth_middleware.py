@@ -1,7 +1,33 @@
+import uuid
 from functools import wraps
-from flask import request, jsonify
-from app.utils.supabase_client import supabase_client
-from app.models.user import User
+import jwt
+from flask import request, jsonify, current_app
+from app.utils.supabase_client import supabase_client, SupabaseUnavailableError
+from app.utils.token_verifier import get_token_verifier, UnknownSigningKeyError
+from app.utils.identity_cache import CurrentUser, load_principal
+
+
+def resolve_supabase_uid(token):
+    """
+    Mengembalikan UUID user Supabase pemilik token, atau None jika token tidak valid.
+
+    Pada mode "local" token diverifikasi tanpa network round trip; panggilan
+    auth.get_user ke Supabase hanya dilakukan jika kunci penanda tangan
+    token tidak dikenal.
+    """
+    if current_app.config.get("SUPABASE_JWT_VERIFICATION") == "local":
+        try:
+            claims = get_token_verifier().verify(token)
+            return uuid.UUID(claims["sub"])
+        except UnknownSigningKeyError:
+            pass
+        except (jwt.InvalidTokenError, ValueError):
+            return None
+
+    user = supabase_client.auth.get_user(token)
+    if not user or not user.user:
+        return None
+    return uuid.UUID(str(user.user.id))
 
 
 def token_required(f):
@@ -22,26 +48,28 @@ def token_required(f):
             return jsonify({"success": False, "message": "Token tidak ditemukan"}), 401
 
         try:
-            # Verifikasi token dengan Supabase
-            user = supabase_client.auth.get_user(token)
+            # Verifikasi token (lokal, atau ke Supabase sebagai fallback)
+            supabase_uid = resolve_supabase_uid(token)
 
-            if not user or not user.user:
+            if not supabase_uid:
                 return jsonify({"success": False, "message": "Token tidak valid"}), 401
 
-            # Ambil user dari database lokal
-            current_user = User.query.filter_by(supabase_uid=user.user.id).first()
+            # Ambil identitas user (dari cache, atau database lokal)
+            principal = load_principal(supabase_uid)
 
-            if not current_user:
+            if not principal:
                 return (
                     jsonify({"success": False, "message": "User tidak ditemukan"}),
                     404,
                 )
 
             # Tambahkan user ke request
-            kwargs["current_user"] = current_user
+            kwargs["current_user"] = CurrentUser(principal)
 
             return f(*args, **kwargs)
 
+        except SupabaseUnavailableError as e:
+            return jsonify({"success": False, "message": str(e)}), 503
         except Exception as e:
             return (
                 jsonify({"success": False, "message": f"Terjadi kesalahan: {str(e)}"}),
@@ -1,5 +1,22 @@
 from datetime import datetime, timezone
 
+_WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+_MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
 
 def now():
     return datetime.now(timezone.utc)
+
+
+def http_date(dt: datetime) -> str:
+    """
+    Format tanggal HTTP (RFC 822) seperti output jsonify Flask, misalnya
+    "Thu, 01 Jan 2026 00:00:00 GMT". Datetime tanpa timezone dianggap UTC.
+    Lebih cepat dari werkzeug.http.http_date untuk serialisasi banyak baris.
+    """
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc)
+    return (
+        f"{_WEEKDAYS[dt.weekday()]}, {dt.day:02d} {_MONTHS[dt.month - 1]} {dt.year:04d} "
+        f"{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d} GMT"
+    )
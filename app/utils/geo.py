@@ -0,0 +1,115 @@
+import math
+from typing import List, Optional, Tuple
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = 111.32
+
+# Panjang geohash yang disimpan (presisi 9 ~ 5 meter)
+GEOHASH_PRECISION = 9
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def encode_geohash(lat: float, lng: float, precision: int = GEOHASH_PRECISION) -> str:
+    """Menghitung geohash untuk satu titik koordinat"""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True  # bit genap untuk longitude
+
+    while len(chars) < precision:
+        value_range, value = (lng_range, lng) if even else (lat_range, lat)
+        middle = (value_range[0] + value_range[1]) / 2
+        if value >= middle:
+            bits = (bits << 1) | 1
+            value_range[0] = middle
+        else:
+            bits <<= 1
+            value_range[1] = middle
+        even = not even
+
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits = 0
+            bit_count = 0
+
+    return "".join(chars)
+
+
+def geohash_for(lat: Optional[float], lng: Optional[float]) -> Optional[str]:
+    """Geohash untuk lokasi profil, None jika lokasi belum diisi"""
+    if lat is None or lng is None:
+        return None
+    return encode_geohash(lat, lng)
+
+
+def _cell_size(precision: int) -> Tuple[float, float]:
+    # Ukuran satu sel geohash dalam derajat (lat, lng)
+    total_bits = precision * 5
+    lng_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lng_bits
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Jarak lingkaran besar antara dua titik (km)"""
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box(lat: float, lng: float, radius_km: float) -> Tuple[float, float, float, float]:
+    """
+    Kotak (min_lat, max_lat, min_lng, max_lng) yang memuat lingkaran radius_km.
+    Tidak menangani wrap garis tanggal 180 derajat.
+    """
+    lat_delta = radius_km / KM_PER_DEGREE
+    cos_lat = max(math.cos(math.radians(lat)), 1e-6)
+    lng_delta = min(radius_km / (KM_PER_DEGREE * cos_lat), 180.0)
+    return (
+        max(lat - lat_delta, -90.0),
+        min(lat + lat_delta, 90.0),
+        max(lng - lng_delta, -180.0),
+        min(lng + lng_delta, 180.0),
+    )
+
+
+def covering_cells(lat: float, lng: float, radius_km: float) -> List[str]:
+    """
+    Prefix geohash (sel pusat + 8 tetangganya) yang menutupi lingkaran
+    radius_km di sekitar titik. Presisi dipilih sebesar mungkin dengan
+    ukuran sel tetap lebih besar dari radius.
+    """
+    cos_lat = max(math.cos(math.radians(lat)), 1e-6)
+    precision = 1
+    for candidate in range(GEOHASH_PRECISION, 0, -1):
+        lat_size, lng_size = _cell_size(candidate)
+        if (
+            lat_size * KM_PER_DEGREE >= radius_km
+            and lng_size * KM_PER_DEGREE * cos_lat >= radius_km
+        ):
+            precision = candidate
+            break
+
+    lat_size, lng_size = _cell_size(precision)
+    cells = set()
+    for d_lat in (-1, 0, 1):
+        for d_lng in (-1, 0, 1):
+            cell_lat = min(max(lat + d_lat * lat_size, -90.0), 90.0)
+            cell_lng = (lng + d_lng * lng_size + 180.0) % 360.0 - 180.0
+            cells.add(encode_geohash(cell_lat, cell_lng, precision))
+    return sorted(cells)
+
+
+def prefix_range(prefix: str) -> Tuple[str, str]:
+    """
+    Rentang (inklusif) geohash lengkap yang diawali prefix, untuk filter
+    BETWEEN yang bisa memakai index B-tree biasa
+    """
+    padding = GEOHASH_PRECISION - len(prefix)
+    return prefix + _BASE32[0] * padding, prefix + _BASE32[-1] * padding
@@ -2,6 +2,7 @@ import re
 from datetime import datetime
 from flask import jsonify
 from functools import wraps
+from app.utils.supabase_client import SupabaseUnavailableError
 
 
 def format_datetime(dt):
@@ -20,6 +21,8 @@ def handle_errors(f):
     def decorated(*args, **kwargs):
         try:
             return f(*args, **kwargs)
+        except SupabaseUnavailableError as e:
+            return jsonify({"success": False, "message": str(e)}), 503
         except ValueError as e:
             return jsonify({"success": False, "message": str(e)}), 400
         except Exception as e:
@@ -0,0 +1,229 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Set
+from uuid import UUID
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+from app.models.buyer import BuyerProfile
+from app.models.seller import SellerProfile
+from app.models.user import User, UserRole
+from app.utils.extensions import db
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Identitas pemanggil yang sudah di-resolve dari token"""
+
+    user_id: int
+    supabase_uid: UUID
+    role: Optional[UserRole]
+    is_suspended: bool
+    buyer_profile_id: Optional[int] = None
+    seller_profile_id: Optional[int] = None
+
+
+class CurrentUser:
+    """
+    Pengganti objek User untuk handler yang dilindungi token_required.
+
+    Atribut identitas (id, role, is_suspended, profile id) dibaca dari
+    Principal tanpa query; atribut lain memuat User dari database saat
+    pertama kali diakses.
+    """
+
+    def __init__(self, principal: Principal):
+        self._principal = principal
+        self._user = None
+
+    @property
+    def id(self):
+        return self._principal.user_id
+
+    @property
+    def supabase_uid(self):
+        return self._principal.supabase_uid
+
+    @property
+    def role(self):
+        return self._principal.role
+
+    @property
+    def is_suspended(self):
+        return self._principal.is_suspended
+
+    @property
+    def buyer_profile_id(self):
+        return self._principal.buyer_profile_id
+
+    @property
+    def seller_profile_id(self):
+        return self._principal.seller_profile_id
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        if self._user is None:
+            self._user = db.session.get(User, self._principal.user_id)
+        return getattr(self._user, name)
+
+
+class IdentityCache:
+    """
+    Cache LRU + TTL per worker untuk Principal, dengan key supabase_uid.
+
+    Entri di-invalidate setelah commit yang mengubah role/is_suspended user
+    atau profil buyer/seller-nya. Perubahan lewat bulk UPDATE (tanpa ORM)
+    tidak terdeteksi dan baru terlihat setelah TTL habis.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: int = 300):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+
+        self._entries: "OrderedDict[UUID, tuple]" = OrderedDict()
+        self._uid_by_user_id: Dict[int, UUID] = {}
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.max_size = app.config.get("IDENTITY_CACHE_MAX_SIZE", self.max_size)
+        self.ttl_seconds = app.config.get(
+            "IDENTITY_CACHE_TTL_SECONDS", self.ttl_seconds
+        )
+
+    def get(self, supabase_uid: UUID) -> Optional[Principal]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(supabase_uid)
+            if entry is None or entry[0] < now:
+                if entry is not None:
+                    self._remove(supabase_uid)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(supabase_uid)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, principal: Principal) -> None:
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._entries[principal.supabase_uid] = (expires_at, principal)
+            self._entries.move_to_end(principal.supabase_uid)
+            self._uid_by_user_id[principal.user_id] = principal.supabase_uid
+
+            while len(self._entries) > self.max_size:
+                _, (_, oldest) = self._entries.popitem(last=False)
+                self._uid_by_user_id.pop(oldest.user_id, None)
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            supabase_uid = self._uid_by_user_id.get(user_id)
+            if supabase_uid is not None:
+                self._remove(supabase_uid)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._uid_by_user_id.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def _remove(self, supabase_uid: UUID) -> None:
+        _, principal = self._entries.pop(supabase_uid)
+        self._uid_by_user_id.pop(principal.user_id, None)
+
+
+identity_cache = IdentityCache()
+
+
+def principal_query(supabase_uid: UUID):
+    """Query user + id profil buyer/seller untuk supabase_uid"""
+    return (
+        select(
+            User.id,
+            User.role,
+            User.is_suspended,
+            BuyerProfile.id,
+            SellerProfile.id,
+        )
+        .outerjoin(BuyerProfile, BuyerProfile.user_id == User.id)
+        .outerjoin(SellerProfile, SellerProfile.user_id == User.id)
+        .where(User.supabase_uid == supabase_uid)
+    )
+
+
+def load_principal(supabase_uid: UUID) -> Optional[Principal]:
+    """
+    Resolve Principal untuk supabase_uid: dari cache, atau dengan satu query
+    (user + id profil buyer/seller) jika belum ada di cache.
+    """
+    principal = identity_cache.get(supabase_uid)
+    if principal is not None:
+        return principal
+
+    row = db.session.execute(principal_query(supabase_uid).limit(1)).first()
+    if row is None:
+        return None
+
+    user_id, role, is_suspended, buyer_profile_id, seller_profile_id = row
+    principal = Principal(
+        user_id=user_id,
+        supabase_uid=supabase_uid,
+        role=role,
+        is_suspended=bool(is_suspended),
+        buyer_profile_id=buyer_profile_id,
+        seller_profile_id=seller_profile_id,
+    )
+    identity_cache.set(principal)
+    return principal
+
+
+# Invalidasi: kumpulkan user_id yang berubah saat flush, buang dari cache
+# setelah commit supaya request lain tidak mengisi ulang dengan data lama
+_PENDING_KEY = "identity_cache_invalidations"
+
+
+def _changed_user_ids(session: Session) -> Set[int]:
+    user_ids = set()
+    for instance in session.new | session.dirty | session.deleted:
+        if isinstance(instance, User):
+            state = inspect(instance)
+            if instance in session.deleted or any(
+                state.attrs[attr].history.has_changes()
+                for attr in ("role", "is_suspended")
+            ):
+                user_ids.add(instance.id)
+        elif isinstance(instance, (BuyerProfile, SellerProfile)):
+            user_ids.add(instance.user_id)
+    user_ids.discard(None)
+    return user_ids
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_identity_changes(session, flush_context, instances):
+    changed = _changed_user_ids(session)
+    if changed:
+        session.info.setdefault(_PENDING_KEY, set()).update(changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_identity_invalidations(session):
+    for user_id in session.info.pop(_PENDING_KEY, set()):
+        identity_cache.invalidate_user(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_identity_invalidations(session):
+    session.info.pop(_PENDING_KEY, None)
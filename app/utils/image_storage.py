@@ -0,0 +1,77 @@
+import os
+import tempfile
+
+from flask import current_app
+from storage3.utils import StorageException
+
+from app.utils.supabase_client import supabase_client
+
+
+class SupabaseImageStorage:
+    """
+    Penyimpanan gambar produk di bucket Supabase Storage
+    """
+
+    def __init__(self, bucket: str):
+        self.bucket = bucket
+
+    def exists(self, path: str) -> bool:
+        try:
+            return supabase_client.storage.from_(self.bucket).exists(path)
+        except StorageException:
+            # HEAD untuk file yang tidak ada dijawab 4xx
+            return False
+
+    def put(self, path: str, data: bytes, content_type: str) -> None:
+        supabase_client.storage.from_(self.bucket).upload(
+            path,
+            data,
+            {
+                "content-type": content_type,
+                # Nama file berisi hash konten, aman di-cache selamanya
+                "cache-control": "31536000",
+                "upsert": "true",
+            },
+        )
+
+    def public_url(self, path: str) -> str:
+        return supabase_client.storage.from_(self.bucket).get_public_url(path)
+
+
+class LocalImageStorage:
+    """
+    Pengganti Supabase Storage untuk development dan testing: file disimpan
+    di direktori lokal, URL dibentuk dari base_url.
+    """
+
+    def __init__(self, root: str, base_url: str):
+        self.root = root
+        self.base_url = base_url.rstrip("/")
+
+    def exists(self, path: str) -> bool:
+        return os.path.exists(os.path.join(self.root, path))
+
+    def put(self, path: str, data: bytes, content_type: str) -> None:
+        target = os.path.join(self.root, path)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        # Tulis ke file sementara lalu rename, supaya tidak ada file setengah jadi
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(target))
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, target)
+
+    def public_url(self, path: str) -> str:
+        return f"{self.base_url}/{path}"
+
+
+def get_image_storage():
+    """
+    Mengembalikan penyimpanan gambar sesuai konfigurasi IMAGE_STORAGE_BACKEND
+    ("supabase" atau "local")
+    """
+    config = current_app.config
+    if config.get("IMAGE_STORAGE_BACKEND") == "local":
+        return LocalImageStorage(
+            config["IMAGE_LOCAL_STORAGE_DIR"], config["IMAGE_LOCAL_BASE_URL"]
+        )
+    return SupabaseImageStorage(config["IMAGE_STORAGE_BUCKET"])
@@ -0,0 +1,12 @@
+from decimal import Decimal
+
+CENT = Decimal("0.01")
+
+
+def to_money(value) -> Decimal:
+    """
+    Nilai uang sebagai Decimal dengan dua angka desimal. Harga produk
+    disimpan sebagai Float, total dan saldo sebagai Numeric; Float diubah
+    lewat str supaya 0.1 tidak menjadi 0.1000000000000000055...
+    """
+    return Decimal(str(value)).quantize(CENT)
@@ -0,0 +1,108 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence
+
+from sqlalchemy import or_, tuple_
+
+DEFAULT_PAGE_LIMIT = 20
+MAX_PAGE_LIMIT = 100
+
+
+class InvalidCursorError(ValueError):
+    """Cursor pagination rusak atau tidak cocok dengan urutan yang diminta"""
+
+
+def parse_limit(limit: Optional[int]) -> int:
+    """Membatasi limit halaman ke rentang 1..MAX_PAGE_LIMIT"""
+    if not limit or limit < 1:
+        return DEFAULT_PAGE_LIMIT
+    return min(limit, MAX_PAGE_LIMIT)
+
+
+def parse_bool(value: Optional[str]) -> bool:
+    return (value or "").lower() in ("1", "true", "yes")
+
+
+def encode_cursor(sort: str, values: Sequence[Any]) -> str:
+    """
+    Membuat cursor opaque dari nilai kunci urutan baris terakhir
+    """
+    payload = {
+        "s": sort,
+        "v": [v.isoformat() if isinstance(v, (datetime, date)) else v for v in values],
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, columns: Sequence[Any]) -> List[Any]:
+    """
+    Membaca cursor dan mengembalikan nilai kunci urutan sesuai tipe kolomnya
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values = payload["v"]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise InvalidCursorError("Cursor tidak valid")
+
+    if payload.get("s") != sort or len(values) != len(columns):
+        raise InvalidCursorError("Cursor tidak cocok dengan urutan yang diminta")
+
+    result = []
+    for column, value in zip(columns, values):
+        if value is not None and column.type.python_type is datetime:
+            value = datetime.fromisoformat(value)
+        result.append(value)
+    return result
+
+
+def _nullable(column) -> bool:
+    # Atribut ORM (Product.price) maupun Column; ekspresi lain dianggap NOT NULL
+    return bool(getattr(getattr(column, "expression", column), "nullable", False))
+
+
+def _after(columns: Sequence[Any], values: Sequence[Any], descending: bool):
+    if descending:
+        return tuple_(*columns) < tuple(values)
+    return tuple_(*columns) > tuple(values)
+
+
+def keyset_condition(columns: Sequence[Any], values: Sequence[Any], descending: bool):
+    """
+    Kondisi WHERE untuk mengambil baris setelah cursor, misalnya
+    (created_at, id) < (:created_at, :id) untuk urutan menurun.
+
+    Jika kolom pertama nullable, NULL dianggap lebih besar dari nilai apa
+    pun (NULLS LAST untuk urutan naik, NULLS FIRST untuk urutan menurun,
+    seperti default Postgres), sehingga baris NULL tidak hilang dari
+    perbandingan tuple. ORDER BY harus memakai keyset_order_by.
+    """
+    first, rest = columns[0], columns[1:]
+    if not rest or not _nullable(first):
+        return _after(columns, values, descending)
+
+    if values[0] is None:
+        after_null = first.is_(None) & _after(rest, values[1:], descending)
+        # Urutan menurun: semua baris bernilai datang setelah blok NULL
+        return or_(after_null, first.is_not(None)) if descending else after_null
+    if descending:
+        # Blok NULL sudah terlewati sebelum baris bernilai
+        return _after(columns, values, descending)
+    return or_(_after(columns, values, descending), first.is_(None))
+
+
+def keyset_order_by(columns: Sequence[Any], descending: bool) -> List[Any]:
+    """
+    ORDER BY untuk kolom keyset, dengan posisi NULL yang sama seperti
+    keyset_condition di semua database
+    """
+    order_by = []
+    for index, column in enumerate(columns):
+        clause = column.desc() if descending else column.asc()
+        if index == 0 and len(columns) > 1 and _nullable(column):
+            clause = clause.nulls_first() if descending else clause.nulls_last()
+        order_by.append(clause)
+    return order_by
@@ -0,0 +1,196 @@
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import text
+
+from app.models.order import Order
+from app.models.stock_reservation import StockReservation
+from app.services.auth_service import AuthService
+from app.services.job_service import JobService
+from app.services.nearby_service import NearbyService
+from app.services.order_service import OrderService
+from app.services.product_service import ProductService
+from app.schemas.product_schema import DEFAULT_PRODUCT_LIST_FIELDS
+from app.services.rating_service import RatingService
+from app.services.reservation_service import SWEEP_BATCH_SIZE, ReservationService
+from app.services.sales_service import SalesService
+from app.services.wallet_service import WalletService
+from app.utils.extensions import db
+from app.utils.identity_cache import principal_query
+from app.utils.pagination import DEFAULT_PAGE_LIMIT, encode_cursor
+
+# Contoh nilai filter, cukup bertipe sederhana supaya bisa dirender literal
+SAMPLE_ID = 1
+SAMPLE_TIME = datetime(2026, 1, 1)
+SAMPLE_START = date(2026, 1, 1)
+SAMPLE_END = date(2026, 1, 31)
+
+
+@dataclass
+class PlanCheck:
+    name: str
+    sequential_scans: List[str]
+    plan: List[str]
+
+    @property
+    def ok(self) -> bool:
+        return not self.sequential_scans
+
+
+def _product_page(sort: str = "newest", cursor_values=None, **filters):
+    # Query halaman yang sama persis dengan ProductService.get_products_page
+    cursor = encode_cursor(sort, cursor_values) if cursor_values else None
+    query, _ = ProductService._page_query(
+        ProductService._filtered_query(**filters),
+        sort,
+        cursor,
+        DEFAULT_PRODUCT_LIST_FIELDS,
+        DEFAULT_PAGE_LIMIT,
+    )
+    return query.statement
+
+
+def _orders_page(owner_condition, status: Optional[str] = None, next_page: bool = False):
+    cursor = encode_cursor("newest", [SAMPLE_TIME, SAMPLE_ID]) if next_page else None
+    return OrderService._orders_query(owner_condition, DEFAULT_PAGE_LIMIT, cursor, status)
+
+
+# Query panas yang harus selalu dilayani index, dibangun oleh service yang
+# menjalankannya
+HOT_QUERIES = {
+    "products.newest": lambda: _product_page(),
+    "products.newest.next_page": lambda: _product_page(
+        cursor_values=[SAMPLE_TIME, SAMPLE_ID]
+    ),
+    "products.price_asc": lambda: _product_page("price_asc"),
+    "products.price_asc.next_page": lambda: _product_page(
+        "price_asc", cursor_values=[1000.0, SAMPLE_ID]
+    ),
+    "products.by_category": lambda: _product_page(category_id=SAMPLE_ID),
+    "products.by_category_price": lambda: _product_page(
+        "price_asc", category_id=SAMPLE_ID
+    ),
+    "products.by_seller": lambda: _product_page(seller_id=SAMPLE_ID),
+    "products.price_range": lambda: _product_page(
+        "price_asc", price_min=1000.0, price_max=5000.0
+    ),
+    "products.top_rated": lambda: _product_page("top_rated"),
+    "products.by_category_top_rated": lambda: _product_page(
+        "top_rated", category_id=SAMPLE_ID
+    ),
+    "users.by_supabase_uid": lambda: principal_query(uuid.UUID(int=SAMPLE_ID)).limit(1),
+    "users.by_email": lambda: AuthService._user_by_email("user@example.com").statement,
+    "orders.by_buyer": lambda: _orders_page(Order.buyer_id == SAMPLE_ID),
+    "orders.by_buyer.next_page": lambda: _orders_page(
+        Order.buyer_id == SAMPLE_ID, next_page=True
+    ),
+    "orders.by_seller": lambda: _orders_page(Order.seller_id == SAMPLE_ID),
+    "orders.by_buyer_and_status": lambda: _orders_page(Order.buyer_id == SAMPLE_ID, "paid"),
+    "orders.by_seller_and_status": lambda: _orders_page(
+        Order.seller_id == SAMPLE_ID, "paid"
+    ),
+    # Titik contoh: Jakarta, radius 10 km
+    "sellers.nearby": lambda: NearbyService._candidates_query(-6.2, 106.8, 10),
+    "products.nearby": lambda: NearbyService._products_query(
+        [SAMPLE_ID, SAMPLE_ID + 1], None, DEFAULT_PAGE_LIMIT
+    ),
+    "seller_daily_sales.range": lambda: SalesService._daily_sales_query(
+        SAMPLE_ID, SAMPLE_START, SAMPLE_END
+    ),
+    "seller_product_daily_sales.range": lambda: SalesService._product_sales_query(
+        SAMPLE_ID, SAMPLE_START, SAMPLE_END, "revenue", None
+    ),
+    "jobs.due": lambda: JobService._due_query(SAMPLE_TIME, 20),
+    "jobs.recent_done": lambda: JobService._recent_done_query(SAMPLE_TIME),
+    "ratings.by_product": lambda: RatingService._product_ratings_query(
+        SAMPLE_ID, DEFAULT_PAGE_LIMIT, None
+    ),
+    "stock_reservations.expired": lambda: ReservationService._expired_query(
+        SAMPLE_TIME, SWEEP_BATCH_SIZE
+    ),
+    "stock_reservations.by_reference": lambda: ReservationService._release_statement(
+        StockReservation.reference == "sample", "released"
+    ),
+    "wallet_transactions.by_wallet": lambda: WalletService._transactions_query(
+        SAMPLE_ID, DEFAULT_PAGE_LIMIT, None, None, None
+    ),
+    "wallet_transactions.by_wallet_and_type": lambda: WalletService._transactions_query(
+        SAMPLE_ID, DEFAULT_PAGE_LIMIT, None, "payment", None
+    ),
+    "wallet_monthly_totals.statement": lambda: WalletService._monthly_totals_query(
+        SAMPLE_ID, SAMPLE_START, date(2026, 12, 1)
+    ),
+    "wallet_transactions.balance_at": lambda: WalletService._balance_after_at_query(
+        SAMPLE_ID, SAMPLE_TIME
+    ),
+    "wallet_snapshots.balance_at": lambda: WalletService._snapshot_at_query(
+        SAMPLE_ID, SAMPLE_TIME
+    ),
+}
+
+
+def _compile(stmt) -> str:
+    dialect = db.session.get_bind().dialect
+    return str(stmt.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+
+
+def _execute(sql: str, params):
+    # Tanpa params: SQL literal hasil _compile; dengan params: statement
+    # DBAPI apa adanya (misalnya yang ditangkap dari before_cursor_execute)
+    if params is None:
+        return db.session.execute(text(sql)).all()
+    return db.session.connection().exec_driver_sql(sql, params).all()
+
+
+def _sqlite_plan(sql: str, params):
+    rows = _execute(f"EXPLAIN QUERY PLAN {sql}", params)
+    plan = [row[-1] for row in rows]
+    # "SCAN <tabel>" tanpa "USING ... INDEX" berarti full table scan
+    seq_scans = [
+        detail
+        for detail in plan
+        if detail.startswith("SCAN ") and "USING" not in detail
+    ]
+    return plan, seq_scans
+
+
+def _postgres_plan(sql: str, params):
+    # Tabel hasil seed biasanya kecil sehingga planner lebih memilih Seq Scan;
+    # dengan enable_seqscan = off, Seq Scan yang tersisa berarti tidak ada
+    # index yang bisa dipakai
+    db.session.execute(text("SET LOCAL enable_seqscan = off"))
+    rows = _execute(f"EXPLAIN {sql}", params)
+    plan = [row[0] for row in rows]
+    seq_scans = [line.strip() for line in plan if "Seq Scan" in line]
+    return plan, seq_scans
+
+
+def explain(sql: str, params: Any = None) -> Tuple[List[str], List[str]]:
+    """
+    Menjalankan EXPLAIN untuk satu statement SQL dan mengembalikan
+    (plan, sequential_scans). Hanya mendukung Postgres dan SQLite.
+    """
+    dialect = db.session.get_bind().dialect.name
+    if dialect == "postgresql":
+        return _postgres_plan(sql, params)
+    if dialect == "sqlite":
+        return _sqlite_plan(sql, params)
+    raise RuntimeError(f"EXPLAIN untuk database {dialect} belum didukung")
+
+
+def check_statement(name: str, stmt) -> PlanCheck:
+    plan, seq_scans = explain(_compile(stmt))
+    return PlanCheck(name, seq_scans, plan)
+
+
+def check_query_plans() -> List[PlanCheck]:
+    """
+    Menjalankan EXPLAIN untuk setiap query panas dan mencatat sequential
+    scan yang muncul.
+    """
+    try:
+        return [check_statement(name, build()) for name, build in HOT_QUERIES.items()]
+    finally:
+        db.session.rollback()
@@ -0,0 +1,196 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import wraps
+from typing import Dict, Optional, Tuple
+
+from flask import make_response, request
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models.category import Category
+from app.models.product import Product
+from app.models.seller import SellerProfile
+from app.utils.extensions import db
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: bytes
+    status: int
+    mimetype: str
+    etag: str
+
+
+class ResponseCache:
+    """
+    Cache LRU + TTL per worker untuk response GET katalog publik, dengan key
+    path + query string yang dinormalisasi.
+
+    Seluruh isi cache dibuang setelah commit yang mengubah produk, kategori
+    atau profil seller. Setiap worker punya cache sendiri, jadi perubahan
+    dari worker lain (atau lewat bulk UPDATE tanpa ORM) baru terlihat
+    setelah TTL habis.
+    """
+
+    def __init__(self, max_size: int = 2000, ttl_seconds: int = 30, max_age: int = 30):
+        self.enabled = True
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+        self._generation = 0
+        self._entries: "OrderedDict[Tuple, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.enabled = app.config.get("RESPONSE_CACHE_ENABLED", self.enabled)
+        self.max_size = app.config.get("RESPONSE_CACHE_MAX_SIZE", self.max_size)
+        self.ttl_seconds = app.config.get("RESPONSE_CACHE_TTL_SECONDS", self.ttl_seconds)
+        self.max_age = app.config.get("RESPONSE_CACHE_MAX_AGE", self.max_age)
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, key: Tuple) -> Optional[CachedResponse]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Tuple, cached: CachedResponse, generation: int) -> None:
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            # Response dihitung sebelum ada commit baru, jangan disimpan
+            if generation != self._generation:
+                return
+            self._entries[key] = (expires_at, cached)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "generation": self._generation,
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+        }
+
+
+response_cache = ResponseCache()
+
+
+def _cache_key() -> Tuple:
+    # Urutan parameter query tidak mempengaruhi key
+    args = tuple(sorted(request.args.items(multi=True)))
+    return (request.path, args)
+
+
+def _from_cache(cached: CachedResponse):
+    response = make_response(cached.body, cached.status)
+    response.mimetype = cached.mimetype
+    response.set_etag(cached.etag)
+    return response
+
+
+def _finalize(response):
+    response.headers["Cache-Control"] = f"public, max-age={response_cache.max_age}"
+    response.make_conditional(request)
+    if response.status_code == 304:
+        response_cache.not_modified += 1
+    return response
+
+
+def cached_response(f):
+    """
+    Decorator untuk endpoint GET publik: response 200 disimpan di cache,
+    diberi ETag kuat dan Cache-Control, serta dijawab 304 jika ETag pada
+    If-None-Match masih sama.
+    """
+
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        if not response_cache.enabled or request.method != "GET":
+            return f(*args, **kwargs)
+
+        key = _cache_key()
+        cached = response_cache.get(key)
+        if cached is not None:
+            return _finalize(_from_cache(cached))
+
+        generation = response_cache.generation
+        response = make_response(f(*args, **kwargs))
+
+        # Hanya response sukses yang sudah utuh di memori yang di-cache
+        if response.status_code != 200 or response.is_streamed:
+            return response
+
+        body = response.get_data()
+        cached = CachedResponse(
+            body=body,
+            status=response.status_code,
+            mimetype=response.mimetype,
+            etag=hashlib.sha256(body).hexdigest(),
+        )
+        response_cache.set(key, cached, generation)
+        response.set_etag(cached.etag)
+        return _finalize(response)
+
+    return decorated
+
+
+# Invalidasi: tandai session yang mengubah katalog saat flush, kosongkan
+# cache setelah commit
+_PENDING_KEY = "response_cache_invalidate"
+
+
+def invalidate_after_commit() -> None:
+    """
+    Menandai transaksi aktif supaya cache dikosongkan setelah commit.
+    Dipakai untuk penulisan katalog lewat Core (bulk insert/update) yang
+    tidak terdeteksi saat flush.
+    """
+    db.session.info[_PENDING_KEY] = True
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_catalog_changes(session, flush_context, instances):
+    if any(
+        isinstance(instance, (Product, Category, SellerProfile))
+        for instance in session.new | session.dirty | session.deleted
+    ):
+        session.info[_PENDING_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_catalog_invalidation(session):
+    if session.info.pop(_PENDING_KEY, False):
+        response_cache.clear()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_catalog_invalidation(session):
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,51 @@
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from flask import current_app
+from pydantic import TypeAdapter
+from sqlalchemy.engine import Row
+
+
+def dump_list_json(adapter: TypeAdapter, rows: Sequence[Row]) -> bytes:
+    """
+    Validasi dan serialisasi satu list Core row ke JSON bytes dalam satu
+    panggilan adapter. Row diubah ke dict dulu karena validasi dari dict
+    jauh lebih cepat daripada dari atribut (from_attributes).
+    """
+    if not rows:
+        return b"[]"
+    keys = rows[0]._fields
+    return adapter.dump_json(adapter.validate_python([dict(zip(keys, row)) for row in rows]))
+
+
+def parse_fields(
+    value: Optional[str], allowed: Tuple[str, ...], default: Tuple[str, ...]
+) -> Tuple[str, ...]:
+    """
+    Membaca parameter fields (dipisah koma) menjadi tuple field sesuai urutan
+    allowed. "id" selalu disertakan, "all" memilih semua field.
+    """
+    if not value:
+        return default
+    if value == "all":
+        return allowed
+
+    requested = {field.strip() for field in value.split(",") if field.strip()}
+    unknown = requested - set(allowed)
+    if unknown:
+        raise ValueError(
+            f"Field tidak dikenal: {', '.join(sorted(unknown))}. "
+            f"Pilihan: {', '.join(allowed)}"
+        )
+    requested.add("id")
+    return tuple(field for field in allowed if field in requested)
+
+
+def json_envelope_response(envelope: Dict[str, Any], data_json: bytes, status: int = 200):
+    """
+    Response JSON berisi envelope biasa dengan field "data" yang sudah
+    berupa JSON bytes (tidak diserialisasi ulang)
+    """
+    head = current_app.json.dumps(envelope).encode()
+    separator = b", " if envelope else b""
+    body = head[:-1] + separator + b'"data": ' + data_json + b"}"
+    return current_app.response_class(body, status=status, mimetype="application/json")
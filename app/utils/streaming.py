@@ -0,0 +1,58 @@
+import json
+from typing import Iterable, Iterator
+
+from flask import Response, stream_with_context
+from pydantic import BaseModel
+
+# Nilai parameter format untuk response streaming
+STREAM_FORMATS = ("ndjson", "json-stream")
+# Jumlah baris yang digabung per chunk yang dikirim ke client
+STREAM_CHUNK_ROWS = 100
+
+
+def _buffered(parts: Iterable[str]) -> Iterator[str]:
+    # Menggabungkan beberapa baris per write supaya tidak ada satu syscall per baris
+    buffer = []
+    for part in parts:
+        buffer.append(part)
+        if len(buffer) >= STREAM_CHUNK_ROWS:
+            yield "".join(buffer)
+            buffer = []
+    if buffer:
+        yield "".join(buffer)
+
+
+def _ndjson(items: Iterable[BaseModel]) -> Iterator[str]:
+    for item in items:
+        yield item.model_dump_json() + "\n"
+
+
+def _json_array(items: Iterable[BaseModel], message: str) -> Iterator[str]:
+    # Envelope sama dengan response biasa, array data dikirim bertahap
+    head = json.dumps({"success": True, "message": message})
+    yield head[:-1] + ', "data": ['
+    separator = ""
+    for item in items:
+        yield separator + item.model_dump_json()
+        separator = ","
+    yield "]}"
+
+
+def stream_response(items: Iterable[BaseModel], output_format: str, message: str) -> Response:
+    """
+    Membuat response streaming dari iterator model Pydantic, baris demi baris.
+
+    output_format "ndjson" menghasilkan satu object JSON per baris,
+    "json-stream" menghasilkan envelope JSON biasa dengan array data yang
+    dikirim secara chunked.
+    """
+    if output_format == "ndjson":
+        parts, mimetype = _ndjson(items), "application/x-ndjson"
+    elif output_format == "json-stream":
+        parts, mimetype = _json_array(items, message), "application/json"
+    else:
+        raise ValueError(
+            f"Format streaming tidak valid, pilih salah satu: {', '.join(STREAM_FORMATS)}"
+        )
+
+    return Response(stream_with_context(_buffered(parts)), mimetype=mimetype)
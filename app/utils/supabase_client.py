@@ -1,6 +1,15 @@
-from supabase import create_client
+import logging
 import os
+import threading
+import time
+
+import httpx
 from dotenv import load_dotenv
+from gotrue.errors import AuthRetryableError
+from gotrue.http_clients import SyncClient
+from supabase import ClientOptions, create_client
+
+logger = logging.getLogger(__name__)
 
 # Load environment variables
 load_dotenv()
@@ -9,5 +18,205 @@ load_dotenv()
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 
-# Initialize Supabase client
-supabase_client = create_client(SUPABASE_URL, SUPABASE_KEY)
\ No newline at end of file
+# Timeout per jenis operasi (detik)
+SUPABASE_AUTH_TIMEOUT = float(os.getenv("SUPABASE_AUTH_TIMEOUT") or 5)
+SUPABASE_ADMIN_TIMEOUT = float(os.getenv("SUPABASE_ADMIN_TIMEOUT") or 10)
+SUPABASE_STORAGE_TIMEOUT = float(os.getenv("SUPABASE_STORAGE_TIMEOUT") or 30)
+SUPABASE_CONNECT_TIMEOUT = float(os.getenv("SUPABASE_CONNECT_TIMEOUT") or 2)
+
+# Connection pool keep-alive per worker
+SUPABASE_MAX_CONNECTIONS = int(os.getenv("SUPABASE_MAX_CONNECTIONS") or 20)
+SUPABASE_KEEPALIVE_SECONDS = float(os.getenv("SUPABASE_KEEPALIVE_SECONDS") or 60)
+
+# Circuit breaker: buka setelah N kegagalan beruntun, coba lagi setelah jeda
+SUPABASE_BREAKER_FAILURES = int(os.getenv("SUPABASE_BREAKER_FAILURES") or 5)
+SUPABASE_BREAKER_RESET_SECONDS = float(
+    os.getenv("SUPABASE_BREAKER_RESET_SECONDS") or 30
+)
+
+
+class SupabaseUnavailableError(Exception):
+    """Supabase sedang bermasalah dan circuit breaker menolak panggilan"""
+
+    def __init__(self, service: str):
+        super().__init__(
+            f"Layanan {service} Supabase sedang tidak tersedia, silakan coba lagi nanti"
+        )
+        self.service = service
+
+
+def is_outage_error(error: Exception) -> bool:
+    """
+    Error yang menandakan Supabase bermasalah (network, timeout, 5xx),
+    bukan kesalahan input user seperti password salah
+    """
+    if isinstance(error, (httpx.TransportError, AuthRetryableError)):
+        return True
+    try:
+        return int(getattr(error, "status", 0)) >= 500
+    except (TypeError, ValueError):
+        return False
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self.state = "closed"  # closed, open, half_open
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def before_call(self) -> None:
+        with self._lock:
+            if self.state == "closed":
+                return
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+                # Izinkan satu panggilan percobaan
+                self.state = "half_open"
+                return
+            raise SupabaseUnavailableError(self.name)
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    logger.warning("Circuit breaker Supabase %s terbuka", self.name)
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+    def stats(self):
+        return {"state": self.state, "failures": self.failures}
+
+
+class _GuardedApi:
+    """
+    Membungkus API client Supabase (auth, auth.admin, storage bucket) supaya
+    setiap method call melewati circuit breaker.
+    """
+
+    def __init__(self, target, breaker: CircuitBreaker, nested=None, chained=()):
+        self._target = target
+        self._breaker = breaker
+        self._nested = nested or {}
+        self._chained = chained
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+
+        if name in self._nested:
+            return self._nested[name](attr)
+
+        if not callable(attr):
+            return attr
+
+        if name in self._chained:
+            # Contoh: storage.from_("bucket") hanya membuat objek bucket,
+            # panggilan network-nya ada pada method bucket tersebut
+            def chained(*args, **kwargs):
+                return _GuardedApi(attr(*args, **kwargs), self._breaker)
+
+            return chained
+
+        def guarded(*args, **kwargs):
+            self._breaker.before_call()
+            try:
+                result = attr(*args, **kwargs)
+            except Exception as e:
+                if is_outage_error(e):
+                    self._breaker.record_failure()
+                else:
+                    self._breaker.record_success()
+                raise
+            self._breaker.record_success()
+            return result
+
+        return guarded
+
+
+class SupabaseGateway:
+    """
+    Akses ke Supabase untuk satu proses worker: connection pool keep-alive,
+    timeout per operasi (auth, admin, storage), dan circuit breaker per
+    layanan yang langsung menolak panggilan saat Supabase sedang bermasalah.
+    """
+
+    def __init__(self, url, key):
+        self.url = url
+        self.key = key
+        self.breakers = {
+            name: CircuitBreaker(
+                name, SUPABASE_BREAKER_FAILURES, SUPABASE_BREAKER_RESET_SECONDS
+            )
+            for name in ("auth", "admin", "storage")
+        }
+        self._client = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    @property
+    def auth(self):
+        client = self._get_client()
+        return _GuardedApi(
+            client.auth,
+            self.breakers["auth"],
+            nested={"admin": lambda admin: _GuardedApi(admin, self.breakers["admin"])},
+        )
+
+    @property
+    def storage(self):
+        return _GuardedApi(
+            self._get_client().storage, self.breakers["storage"], chained=("from_",)
+        )
+
+    def stats(self):
+        return {name: breaker.stats() for name, breaker in self.breakers.items()}
+
+    def _get_client(self):
+        # Connection pool tidak aman dibawa melewati fork, buat ulang per proses
+        pid = os.getpid()
+        if self._client is not None and self._pid == pid:
+            return self._client
+
+        with self._lock:
+            if self._client is None or self._pid != pid:
+                self._client = self._create_client()
+                self._pid = pid
+        return self._client
+
+    def _create_client(self):
+        client = create_client(
+            self.url,
+            self.key,
+            options=ClientOptions(storage_client_timeout=SUPABASE_STORAGE_TIMEOUT),
+        )
+
+        # Ganti HTTP client auth dan admin dengan pool yang punya timeout eksplisit
+        client.auth._http_client = self._http_client(SUPABASE_AUTH_TIMEOUT)
+        client.auth.admin._http_client = self._http_client(SUPABASE_ADMIN_TIMEOUT)
+        return client
+
+    @staticmethod
+    def _http_client(timeout: float) -> SyncClient:
+        return SyncClient(
+            timeout=httpx.Timeout(timeout, connect=SUPABASE_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=SUPABASE_MAX_CONNECTIONS,
+                max_keepalive_connections=SUPABASE_MAX_CONNECTIONS,
+                keepalive_expiry=SUPABASE_KEEPALIVE_SECONDS,
+            ),
+            follow_redirects=True,
+            http2=True,
+        )
+
+
+# Initialize Supabase gateway (client dibuat saat pertama kali dipakai)
+supabase_client = SupabaseGateway(SUPABASE_URL, SUPABASE_KEY)
@@ -0,0 +1,171 @@
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+import jwt
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+# Jeda minimum antar refresh JWKS yang dipicu oleh kid tidak dikenal,
+# supaya token sampah tidak membuat kita membanjiri endpoint JWKS
+UNKNOWN_KID_REFRESH_INTERVAL = 30
+
+
+class UnknownSigningKeyError(Exception):
+    """Kunci penanda tangan token tidak ada di cache, perlu verifikasi remote"""
+
+
+class SupabaseTokenVerifier:
+    """
+    Verifikasi access token Supabase secara lokal.
+
+    Token HS256 diverifikasi dengan JWT secret project, token asimetris
+    (RS256/ES256) diverifikasi dengan kunci dari JWKS yang di-cache dan
+    diperbarui berkala oleh thread background.
+    """
+
+    def __init__(
+        self,
+        jwks_url: Optional[str],
+        jwt_secret: Optional[str] = None,
+        audience: str = "authenticated",
+        refresh_seconds: int = 600,
+        api_key: Optional[str] = None,
+    ):
+        self.jwks_url = jwks_url
+        self.jwt_secret = jwt_secret
+        self.audience = audience
+        self.refresh_seconds = refresh_seconds
+        self.api_key = api_key
+
+        self._keys: Dict[str, jwt.PyJWK] = {}
+        self._lock = threading.Lock()
+        self._last_refresh = 0.0
+        self._refresher_pid: Optional[int] = None
+
+    def verify(self, token: str) -> Dict[str, Any]:
+        """
+        Memverifikasi token dan mengembalikan claims-nya.
+
+        Raises:
+            UnknownSigningKeyError: kid token tidak dikenal (fallback ke remote)
+            jwt.InvalidTokenError: token tidak valid
+        """
+        header = jwt.get_unverified_header(token)
+        algorithm = header.get("alg")
+
+        if algorithm == "HS256":
+            if not self.jwt_secret:
+                raise UnknownSigningKeyError("JWT secret tidak dikonfigurasi")
+            key = self.jwt_secret
+        else:
+            self._ensure_refresher()
+            signing_key = self._get_signing_key(header.get("kid"))
+            if signing_key.algorithm_name != algorithm:
+                raise jwt.InvalidAlgorithmError("Algoritma token tidak sesuai")
+            key = signing_key.key
+
+        return jwt.decode(
+            token,
+            key,
+            algorithms=[algorithm],
+            audience=self.audience,
+            options={"require": ["exp", "sub"]},
+        )
+
+    def refresh(self) -> None:
+        """Mengambil ulang JWKS dan mengganti cache kunci"""
+        if not self.jwks_url:
+            return
+
+        headers = {"apikey": self.api_key} if self.api_key else {}
+        response = httpx.get(self.jwks_url, headers=headers, timeout=5)
+        response.raise_for_status()
+
+        keys = {}
+        for jwk_data in response.json().get("keys", []):
+            try:
+                jwk = jwt.PyJWK(jwk_data)
+            except jwt.PyJWKError as e:
+                logger.warning("Melewati JWK yang tidak didukung: %s", e)
+                continue
+            if jwk.key_id:
+                keys[jwk.key_id] = jwk
+
+        with self._lock:
+            self._keys = keys
+            self._last_refresh = time.monotonic()
+
+    def _get_signing_key(self, kid: Optional[str]) -> jwt.PyJWK:
+        signing_key = self._keys.get(kid) if kid else None
+        if signing_key is not None:
+            return signing_key
+
+        # Kid belum dikenal: mungkin kunci baru saja dirotasi
+        if kid and time.monotonic() - self._last_refresh > UNKNOWN_KID_REFRESH_INTERVAL:
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning("Gagal memperbarui JWKS: %s", e)
+                # Tahan refresh berikutnya walaupun gagal
+                self._last_refresh = time.monotonic()
+            signing_key = self._keys.get(kid)
+
+        if signing_key is None:
+            raise UnknownSigningKeyError(f"Kunci dengan kid {kid} tidak dikenal")
+        return signing_key
+
+    def _ensure_refresher(self) -> None:
+        # Thread tidak ikut ter-fork, jadi setiap worker gunicorn memulai sendiri
+        pid = os.getpid()
+        if self._refresher_pid == pid or not self.jwks_url:
+            return
+
+        with self._lock:
+            if self._refresher_pid == pid:
+                return
+            self._refresher_pid = pid
+
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.warning("Gagal mengambil JWKS awal: %s", e)
+
+        thread = threading.Thread(
+            target=self._refresh_loop, name="jwks-refresher", daemon=True
+        )
+        thread.start()
+
+    def _refresh_loop(self) -> None:
+        while True:
+            time.sleep(self.refresh_seconds)
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning("Gagal memperbarui JWKS: %s", e)
+
+
+_verifier: Optional[SupabaseTokenVerifier] = None
+
+
+def get_token_verifier() -> SupabaseTokenVerifier:
+    """Mengembalikan verifier per proses, dibuat dari konfigurasi app"""
+    global _verifier
+    if _verifier is None:
+        config = current_app.config
+        supabase_url = os.getenv("SUPABASE_URL")
+        jwks_url = config.get("SUPABASE_JWKS_URL") or (
+            f"{supabase_url}/auth/v1/.well-known/jwks.json" if supabase_url else None
+        )
+        _verifier = SupabaseTokenVerifier(
+            jwks_url=jwks_url,
+            jwt_secret=config.get("SUPABASE_JWT_SECRET"),
+            audience=config.get("SUPABASE_JWT_AUDIENCE", "authenticated"),
+            refresh_seconds=config.get("SUPABASE_JWKS_REFRESH_SECONDS", 600),
+            api_key=os.getenv("SUPABASE_KEY"),
+        )
+    return _verifier
@@ -0,0 +1,16 @@
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.utils.extensions import db
+
+
+def insert_for_dialect():
+    """
+    Konstruktor INSERT milik dialect database aktif, yang mendukung
+    on_conflict_do_update / on_conflict_do_nothing (Postgres dan SQLite)
+    """
+    dialect = db.session.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert
+    if dialect == "sqlite":
+        return sqlite.insert
+    raise RuntimeError(f"Upsert belum didukung untuk database {dialect}")
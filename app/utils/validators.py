@@ -1,15 +1,76 @@
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Optional, Set, Tuple
+from sqlalchemy import literal, select, union_all
+from sqlalchemy.exc import IntegrityError
 from app.models.user import User
 from app.models.buyer import BuyerProfile
 from app.models.seller import SellerProfile
+from app.utils.extensions import db
 import logging
 
 # Konfigurasi logging
 logger = logging.getLogger(__name__)
 
+# Pesan untuk setiap field unik; dipakai oleh pengecekan awal dan
+# oleh pemetaan IntegrityError supaya pesan ke user tetap sama
+DUPLICATE_MESSAGES = {
+    "email": "Email sudah terdaftar di sistem",
+    "username": "Username sudah digunakan, silakan pilih username lain",
+    "shop_name": "Nama toko sudah digunakan, silakan pilih nama toko lain",
+}
+
+# Potongan nama constraint/kolom pada pesan error Postgres dan SQLite
+_CONSTRAINT_FIELDS = [
+    ("users_email", "email"),
+    ("users.email", "email"),
+    ("buyer_profiles_username", "username"),
+    ("buyer_profiles.username", "username"),
+    ("seller_profiles_shop_name", "shop_name"),
+    ("seller_profiles.shop_name", "shop_name"),
+]
+
 
 class UserValidator:
 
+    @staticmethod
+    def find_taken_fields(
+        email: Optional[str],
+        username: Optional[str] = None,
+        shop_name: Optional[str] = None,
+    ) -> Set[str]:
+        """
+        Mengecek keunikan email, username, dan nama toko dalam satu query
+
+        Returns:
+            Set nama field yang nilainya sudah dipakai
+        """
+        checks = []
+        if email:
+            checks.append(select(literal("email")).where(User.email == email))
+        if username:
+            checks.append(
+                select(literal("username")).where(BuyerProfile.username == username)
+            )
+        if shop_name:
+            checks.append(
+                select(literal("shop_name")).where(SellerProfile.shop_name == shop_name)
+            )
+
+        if not checks:
+            return set()
+
+        return set(db.session.execute(union_all(*checks)).scalars())
+
+    @staticmethod
+    def duplicate_field_from_error(error: IntegrityError) -> Optional[str]:
+        """
+        Memetakan IntegrityError dari unique constraint ke nama field-nya
+        """
+        message = str(error.orig)
+        for marker, field in _CONSTRAINT_FIELDS:
+            if marker in message:
+                return field
+        return None
+
     @staticmethod
     def validate_buyer_data(data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -23,21 +84,16 @@ class UserValidator:
         """
         validation_errors = []
 
-        # Cek apakah email sudah terdaftar di database lokal
-        existing_user = User.query.filter_by(email=data.get("email")).first()
-        if existing_user:
-            validation_errors.append("Email sudah terdaftar di sistem")
+        # Cek apakah email dan username sudah digunakan (satu query)
+        taken = UserValidator.find_taken_fields(
+            data.get("email"), username=data.get("username")
+        )
+        if "email" in taken:
+            validation_errors.append(DUPLICATE_MESSAGES["email"])
             return {"valid": False, "errors": validation_errors}
 
-        # Cek apakah username sudah digunakan
-        if data.get("username"):
-            existing_username = BuyerProfile.query.filter_by(
-                username=data.get("username")
-            ).first()
-            if existing_username:
-                validation_errors.append(
-                    "Username sudah digunakan, silakan pilih username lain"
-                )
+        if "username" in taken:
+            validation_errors.append(DUPLICATE_MESSAGES["username"])
 
         # Validasi field-field wajib
         required_fields = ["email", "password", "username"]
@@ -95,21 +151,16 @@ class UserValidator:
         """
         validation_errors = []
 
-        # Cek apakah email sudah terdaftar di database lokal
-        existing_user = User.query.filter_by(email=data.get("email")).first()
-        if existing_user:
-            validation_errors.append("Email sudah terdaftar di sistem")
+        # Cek apakah email dan nama toko sudah digunakan (satu query)
+        taken = UserValidator.find_taken_fields(
+            data.get("email"), shop_name=data.get("shop_name")
+        )
+        if "email" in taken:
+            validation_errors.append(DUPLICATE_MESSAGES["email"])
             return {"valid": False, "errors": validation_errors}
 
-        # Cek apakah nama toko sudah digunakan
-        if data.get("shop_name"):
-            existing_shop = SellerProfile.query.filter_by(
-                shop_name=data.get("shop_name")
-            ).first()
-            if existing_shop:
-                validation_errors.append(
-                    "Nama toko sudah digunakan, silakan pilih nama toko lain"
-                )
+        if "shop_name" in taken:
+            validation_errors.append(DUPLICATE_MESSAGES["shop_name"])
 
         # Validasi field-field wajib
         required_fields = [
@@ -0,0 +1,167 @@
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import func, insert, select
+
+from app import create_app
+from app.config import TestingConfig
+from app.models import Category, Product, SellerProfile
+from app.utils import chrono
+from app.utils.extensions import db
+from app.utils.geo import geohash_for
+
+VEGETABLES = (
+    "bayam", "kangkung", "sawi", "selada", "brokoli", "kubis", "wortel", "kentang",
+    "tomat", "cabai", "bawang", "terong", "timun", "labu", "buncis", "kacang",
+    "jagung", "singkong", "ubi", "talas", "pakcoy", "kemangi", "seledri", "daun",
+    "jahe", "kunyit", "lengkuas", "serai", "jeruk", "pisang", "mangga", "pepaya",
+    "nanas", "semangka", "melon", "salak", "durian", "rambutan", "manggis", "apel",
+)
+VARIETIES = (
+    "hijau", "merah", "kuning", "ungu", "putih", "organik", "hidroponik", "lokal",
+    "jumbo", "mini", "muda", "tua", "segar", "manis", "pedas", "super",
+    "premium", "kampung", "impor", "baby", "keriting", "rawit", "besar", "kecil",
+    "madu", "harum", "renyah", "lembut", "liar", "pilihan",
+)
+REGIONS = (
+    "brastagi", "lembang", "dieng", "malang", "batu", "garut", "cianjur", "bogor",
+    "sukabumi", "wonosobo", "magelang", "temanggung", "boyolali", "karanganyar",
+    "bedugul", "kintamani", "tabanan", "enrekang", "sinjai", "minahasa", "tomohon",
+    "alahan", "solok", "kerinci", "pagaralam", "lampung", "banyuwangi", "jember",
+    "probolinggo", "pasuruan", "kediri", "blitar", "tulungagung", "ponorogo",
+    "madiun", "ngawi", "brebes", "tegal", "pemalang", "kuningan", "majalengka",
+    "sumedang", "subang", "karawang", "bekasi", "tangerang", "serang", "pandeglang",
+    "lebak", "toba",
+)
+
+PRODUCTS_PER_BRAND = 20
+
+
+def create_benchmark_app(database_url: Optional[str] = None):
+    """
+    App untuk benchmark dengan database kosong: database_url (isinya
+    dihapus!) atau SQLite sementara jika tidak diisi.
+    """
+    if database_url is None:
+        database_url = f"sqlite:///{Path(tempfile.mkdtemp()) / 'benchmark.db'}"
+
+    class Config(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = database_url
+        RESPONSE_CACHE_ENABLED = False
+
+    app = create_app(Config)
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+    return app
+
+
+def timed(fn: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """Median dan p95 waktu eksekusi fn (ms) dari `repeat` kali percobaan"""
+    samples: List[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        "median_ms": statistics.median(samples),
+        "p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+    }
+
+
+def seed_sellers(
+    count: int,
+    lat_range=(-8.5, -6.0),
+    lng_range=(105.5, 114.5),
+    batch_size: int = 10000,
+    seed: int = 0,
+) -> List[int]:
+    """
+    Menambahkan `count` seller tanpa user dengan lokasi acak (default
+    sekitar Pulau Jawa), commit per batch. Mengembalikan ID seller baru.
+    """
+    rng = random.Random(seed)
+    offset = db.session.scalar(select(func.count(SellerProfile.id)))
+    ids: List[int] = []
+    for start in range(0, count, batch_size):
+        rows = []
+        for index in range(start, min(start + batch_size, count)):
+            lat = rng.uniform(*lat_range)
+            lng = rng.uniform(*lng_range)
+            rows.append(
+                {
+                    "shop_name": f"Toko {offset + index + 1}",
+                    "location_lat": lat,
+                    "location_lng": lng,
+                    # Bulk insert melewati event ORM SellerProfile
+                    "geohash": geohash_for(lat, lng),
+                    "is_supports_cod": True,
+                }
+            )
+        ids += db.session.scalars(
+            insert(SellerProfile).returning(SellerProfile.id, sort_by_parameter_order=True),
+            rows,
+        ).all()
+        db.session.commit()
+    return ids
+
+
+def product_name(rng: random.Random, brand: str) -> str:
+    return f"{rng.choice(VEGETABLES)} {rng.choice(VARIETIES)} {rng.choice(REGIONS)} {brand}"
+
+
+def brand_name(seed: int, index: int) -> str:
+    """Nama merek petani; tiap pemanggilan seed_products memakai merek baru"""
+    return f"tani{seed}x{index:06d}"
+
+
+def seed_products(
+    count: int,
+    seller_ids: List[int],
+    batch_size: int = 10000,
+    seed: int = 0,
+) -> List[int]:
+    """
+    Menambahkan `count` produk acak (bulk insert per batch, commit per
+    batch). Kata pada nama diambil dari kosakata tetap, kecuali merek
+    (brand_name(seed, i)) yang masing-masing dipakai sekitar
+    PRODUCTS_PER_BRAND produk, seperti katalog sungguhan yang kosakatanya
+    ikut tumbuh. Mengembalikan ID produk baru.
+    """
+    rng = random.Random(seed)
+    category_ids = list(db.session.scalars(select(Category.id)))
+    if not category_ids:
+        categories = [{"name": name, "product_count": 0} for name in ("Sayur", "Buah", "Bumbu")]
+        db.session.execute(insert(Category), categories)
+        category_ids = list(db.session.scalars(select(Category.id)))
+
+    brands = max(1, count // PRODUCTS_PER_BRAND)
+    now = chrono.now()
+    ids: List[int] = []
+    for start in range(0, count, batch_size):
+        rows = []
+        for _ in range(min(batch_size, count - start)):
+            name = product_name(rng, brand_name(seed, rng.randrange(brands)))
+            rows.append(
+                {
+                    "name": name,
+                    "description": f"{name} dari petani {rng.choice(REGIONS)}, "
+                    f"{rng.choice(VARIETIES)} dan {rng.choice(VARIETIES)}",
+                    "price": float(rng.randrange(1000, 100000, 500)),
+                    "stock": rng.randrange(0, 200),
+                    "category_id": rng.choice(category_ids),
+                    "seller_id": rng.choice(seller_ids),
+                    "created_at": now,
+                    "updated_at": now,
+                }
+            )
+        ids += db.session.scalars(
+            insert(Product).returning(Product.id, sort_by_parameter_order=True), rows
+        ).all()
+        db.session.commit()
+    return ids
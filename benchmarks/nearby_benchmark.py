@@ -0,0 +1,125 @@
+"""
+Benchmark pencarian seller/produk terdekat (NearbyService) pada jumlah
+seller yang tumbuh bertahap sampai --sellers seller (default 100 ribu).
+
+Jalankan dari root repo:
+
+    python -m benchmarks.nearby_benchmark [--sellers 100000] [--database-url URL]
+
+Tanpa --database-url dipakai SQLite sementara. Isi database tersebut dihapus.
+
+Seller tersebar acak di sekitar Pulau Jawa dan setiap seller punya
+--products-per-seller produk. Untuk setiap ukuran dicetak median/p95
+latensi dari titik-titik acak, rata-rata jumlah hasil, dan rasio latensi
+terhadap ukuran terkecil. Sebagai pembanding, "scan" menghitung jarak ke
+semua seller (tanpa index geohash) untuk radius yang sama. Hasil
+find_sellers dicek sama dengan hasil scan.
+"""
+
+import argparse
+import itertools
+import random
+
+from sqlalchemy import select
+
+from app.models import SellerProfile
+from app.services.nearby_service import NearbyService
+from app.utils.extensions import db
+from app.utils.geo import haversine_km
+from benchmarks.common import create_benchmark_app, seed_products, seed_sellers, timed
+
+POINTS = 50
+
+
+def _scan(lat: float, lng: float, radius_km: float, limit: int):
+    # Pencarian tanpa index: jarak ke setiap seller dihitung satu per satu
+    rows = db.session.execute(
+        select(SellerProfile.id, SellerProfile.location_lat, SellerProfile.location_lng)
+    ).all()
+    distances = sorted(
+        (haversine_km(lat, lng, row.location_lat, row.location_lng), row.id) for row in rows
+    )
+    return [seller_id for distance, seller_id in distances if distance <= radius_km][:limit]
+
+
+def _report(size, label, hits, result, baseline):
+    baseline.setdefault(label, result["median_ms"])
+    ratio = result["median_ms"] / baseline[label]
+    print(
+        f"{size:>10} {label:>10} {hits:>8.1f} {result['median_ms']:>10.2f} "
+        f"{result['p95_ms']:>8.2f} {ratio:>5.1f}x"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sellers", type=int, default=100_000)
+    parser.add_argument("--products-per-seller", type=int, default=2)
+    parser.add_argument("--radius-km", type=float, default=10.0)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--database-url")
+    args = parser.parse_args()
+
+    app = create_benchmark_app(args.database_url)
+    sizes = sorted({max(1, args.sellers // 100), max(1, args.sellers // 10), args.sellers})
+    rng = random.Random(0)
+    points = [(rng.uniform(-8.5, -6.0), rng.uniform(105.5, 114.5)) for _ in range(POINTS)]
+    baseline = {}
+
+    def run(fn):
+        # Setiap percobaan memakai titik berikutnya; dikembalikan rata-rata jumlah hasil
+        cycle = itertools.cycle(points)
+        hits = [len(fn(*point)) for point in points]
+        return sum(hits) / len(hits), timed(lambda: fn(*next(cycle)), args.repeat)
+
+    with app.app_context():
+        print(
+            f"{'seller':>10} {'query':>10} {'hasil':>8} {'median ms':>10} "
+            f"{'p95 ms':>8} {'rasio':>6}"
+        )
+        seeded = 0
+        for stage, size in enumerate(sizes):
+            seller_ids = seed_sellers(size - seeded, seed=stage)
+            seed_products(len(seller_ids) * args.products_per_seller, seller_ids, seed=stage)
+            seeded = size
+
+            for lat, lng in points:
+                found = NearbyService.find_sellers(lat, lng, args.radius_km, args.limit)
+                assert [seller.id for seller in found] == _scan(
+                    lat, lng, args.radius_km, args.limit
+                )
+
+            _report(
+                size,
+                "sellers",
+                *run(
+                    lambda lat, lng: NearbyService.find_sellers(
+                        lat, lng, args.radius_km, args.limit
+                    )
+                ),
+                baseline,
+            )
+            _report(
+                size,
+                "products",
+                *run(
+                    lambda lat, lng: NearbyService.find_products(
+                        lat, lng, args.radius_km, limit=args.limit
+                    )
+                ),
+                baseline,
+            )
+            _report(
+                size,
+                "scan",
+                *run(lambda lat, lng: _scan(lat, lng, args.radius_km, args.limit)),
+                baseline,
+            )
+            db.session.rollback()
+
+        print(f"Jumlah seller tumbuh {sizes[-1] / sizes[0]:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Benchmark pencarian produk (SearchService.search_products) pada katalog
+yang tumbuh bertahap sampai --products produk (default 1 juta).
+
+Jalankan dari root repo:
+
+    python -m benchmarks.search_benchmark [--products 1000000] [--database-url URL]
+
+Tanpa --database-url dipakai SQLite sementara (FTS5); dengan URL Postgres
+dipakai tsvector + GIN. Isi database tersebut dihapus.
+
+Untuk setiap ukuran katalog dicetak median/p95 latensi halaman pertama
+untuk beberapa kata kunci, jumlah hasilnya, dan rasio latensi terhadap
+ukuran terkecil. Sub-linear berarti rasio latensi jauh di bawah rasio
+ukuran katalog. Sebagai pembanding, "ilike" adalah pencarian lama
+(Product.name ILIKE '%q%') untuk kata kunci merek yang sama.
+
+Kata kunci "merek" cocok dengan jumlah produk yang hampir tetap. Kata
+kunci dari kosakata tetap ("sayur+asal", "prefix", "umum") cocok dengan
+bagian katalog yang tetap, sehingga jumlah hasil yang harus diranking,
+dan latensinya, ikut tumbuh.
+"""
+
+import argparse
+
+from app.schemas.product_schema import DEFAULT_PRODUCT_LIST_FIELDS
+from app.services.product_service import ProductService
+from app.services.search_service import REINDEX_BATCH_SIZE, SearchService
+from app.utils.extensions import db
+from benchmarks.common import (
+    brand_name,
+    create_benchmark_app,
+    seed_products,
+    seed_sellers,
+    timed,
+)
+
+BRAND = brand_name(0, 1)
+QUERIES = {
+    "merek": BRAND,
+    "sayur+asal": "bayam brastagi",
+    "prefix": "kangk",
+    "umum": "bayam",
+}
+
+
+def _index(product_ids):
+    for start in range(0, len(product_ids), REINDEX_BATCH_SIZE):
+        SearchService.index_products(product_ids[start : start + REINDEX_BATCH_SIZE])
+        db.session.commit()
+
+
+def _ilike_page(q: str, limit: int):
+    # Pencarian sebelum ada index full-text: filter name pada listing produk
+    query, _ = ProductService._page_query(
+        ProductService._filtered_query(name=q),
+        "newest",
+        None,
+        DEFAULT_PRODUCT_LIST_FIELDS,
+        limit,
+    )
+    return query.all()
+
+
+def _report(size, label, total, result, baseline):
+    baseline.setdefault(label, result["median_ms"])
+    ratio = result["median_ms"] / baseline[label]
+    print(
+        f"{size:>10} {label:>10} {total:>8} {result['median_ms']:>10.2f} "
+        f"{result['p95_ms']:>8.2f} {ratio:>5.1f}x"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--products", type=int, default=1_000_000)
+    parser.add_argument("--sellers", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--database-url")
+    args = parser.parse_args()
+
+    app = create_benchmark_app(args.database_url)
+    sizes = sorted({max(1, args.products // 100), max(1, args.products // 10), args.products})
+    baseline = {}
+
+    with app.app_context():
+        seller_ids = seed_sellers(args.sellers)
+        print(f"{'produk':>10} {'query':>10} {'hasil':>8} {'median ms':>10} {'p95 ms':>8} {'rasio':>6}")
+        seeded = 0
+        for stage, size in enumerate(sizes):
+            _index(seed_products(size - seeded, seller_ids, seed=stage))
+            seeded = size
+
+            for label, q in QUERIES.items():
+                total = SearchService.search_products(q, limit=args.limit, include_total=True)[
+                    "total"
+                ]
+                result = timed(
+                    lambda: SearchService.search_products(q, limit=args.limit), args.repeat
+                )
+                _report(size, label, total, result, baseline)
+
+            total = len(_ilike_page(BRAND, size))
+            result = timed(lambda: _ilike_page(BRAND, args.limit), args.repeat)
+            _report(size, "ilike", total, result, baseline)
+            db.session.rollback()
+
+        print(f"Ukuran katalog tumbuh {sizes[-1] / sizes[0]:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Benchmark serialisasi listing produk ke JSON untuk --products produk
+(default 10 ribu) dalam satu response.
+
+Jalankan dari root repo:
+
+    python -m benchmarks.serialization_benchmark [--products 10000] [--database-url URL]
+
+Tanpa --database-url dipakai SQLite sementara. Isi database tersebut dihapus.
+
+Dibandingkan:
+- "per-row": cara lama, objek ORM divalidasi satu per satu dengan
+  ProductResponse.model_validate lalu model_dump dan jsonify;
+- "batch": Core row semua field listing diserialisasi sekaligus dengan
+  dump_list_json(product_list_adapter(...));
+- "default": seperti "batch" dengan DEFAULT_PRODUCT_LIST_FIELDS.
+
+Untuk setiap cara dicetak median/p95 waktu serialisasi saja (data sudah
+dimuat) dan waktu query + serialisasi, serta ukuran response.
+"""
+
+import argparse
+import json
+
+from flask import jsonify
+
+from app.models import Product
+from app.schemas.product_schema import (
+    DEFAULT_PRODUCT_LIST_FIELDS,
+    PRODUCT_LIST_FIELDS,
+    ProductResponse,
+    product_list_adapter,
+)
+from app.services.product_service import ProductService
+from app.utils.extensions import db
+from app.utils.serialization import dump_list_json
+from benchmarks.common import create_benchmark_app, seed_products, seed_sellers, timed
+
+
+def _load_objects():
+    db.session.expunge_all()
+    return Product.query.order_by(Product.id).all()
+
+
+def _load_rows(fields):
+    return db.session.execute(
+        db.select(*ProductService.list_columns(fields)).order_by(Product.id)
+    ).all()
+
+
+def _per_row(products) -> bytes:
+    return jsonify(
+        [ProductResponse.model_validate(product).model_dump() for product in products]
+    ).get_data()
+
+
+def _batch(fields):
+    adapter = product_list_adapter(fields)
+    return lambda rows: dump_list_json(adapter, rows)
+
+
+def _report(label, body, serialize, end_to_end, baseline):
+    baseline.setdefault("serialize", serialize["median_ms"])
+    speedup = baseline["serialize"] / serialize["median_ms"]
+    print(
+        f"{label:>10} {serialize['median_ms']:>10.2f} {serialize['p95_ms']:>8.2f} "
+        f"{end_to_end['median_ms']:>10.2f} {len(body) / 1024:>8.0f} {speedup:>6.1f}x"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--products", type=int, default=10_000)
+    parser.add_argument("--sellers", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--database-url")
+    args = parser.parse_args()
+
+    app = create_benchmark_app(args.database_url)
+    with app.app_context():
+        seed_products(args.products, seed_sellers(args.sellers))
+
+        cases = [
+            ("per-row", _load_objects, _per_row),
+            ("batch", lambda: _load_rows(PRODUCT_LIST_FIELDS), _batch(PRODUCT_LIST_FIELDS)),
+            (
+                "default",
+                lambda: _load_rows(DEFAULT_PRODUCT_LIST_FIELDS),
+                _batch(DEFAULT_PRODUCT_LIST_FIELDS),
+            ),
+        ]
+        bodies = {label: serialize(load()) for label, load, serialize in cases}
+
+        # Isi response batch sama dengan cara lama untuk field yang ada di keduanya
+        per_row = json.loads(bodies["per-row"])
+        batch = json.loads(bodies["batch"])
+        shared = set(per_row[0]) & set(batch[0])
+        assert len(per_row) == len(batch) == args.products
+        assert all(
+            all(old[key] == new[key] for key in shared) for old, new in zip(per_row, batch)
+        )
+
+        print(
+            f"{'cara':>10} {'median ms':>10} {'p95 ms':>8} {'query+ ms':>10} "
+            f"{'KiB':>8} {'speedup':>7}"
+        )
+        baseline = {}
+        for label, load, serialize in cases:
+            data = load()
+            _report(
+                label,
+                bodies[label],
+                timed(lambda: serialize(data), args.repeat),
+                timed(lambda: serialize(load()), args.repeat),
+                baseline,
+            )
+
+
+if __name__ == "__main__":
+    main()
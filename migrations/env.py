@@ -51,6 +51,20 @@ def get_metadata():
     return target_db.metadata
 
 
+# Index full-text dibuat oleh migrasi 2e43a32c15c2, bukan oleh model:
+# jangan sampai autogenerate menghapusnya
+SEARCH_INDEX_OBJECTS = {
+    ('column', 'search_vector'),
+    ('index', 'ix_products_search_vector'),
+}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    if type_ == 'table' and name.startswith('products_fts'):
+        return False
+    return (type_, name) not in SEARCH_INDEX_OBJECTS
+
+
 def run_migrations_offline():
     """Run migrations in 'offline' mode.
 
@@ -65,7 +79,10 @@ def run_migrations_offline():
     """
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
-        url=url, target_metadata=get_metadata(), literal_binds=True
+        url=url,
+        target_metadata=get_metadata(),
+        literal_binds=True,
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -93,6 +110,7 @@ def run_migrations_online():
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    conf_args.setdefault("include_object", include_object)
 
     connectable = get_engine()
 
@@ -0,0 +1,55 @@
+"""product full text search
+
+Revision ID: 2e43a32c15c2
+Revises: 9128d9e5943c
+Create Date: 2026-10-17 12:40:55.318270
+
+"""
+from alembic import op
+from flask import current_app
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2e43a32c15c2'
+down_revision = '9128d9e5943c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Index full-text tidak dikelola lewat model: tsvector + GIN di Postgres,
+    # virtual table FTS5 di SQLite (lihat app/services/search_service.py)
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'postgresql':
+        op.execute("ALTER TABLE products ADD COLUMN search_vector tsvector")
+        # Konfigurasi text search sama dengan PostgresSearchBackend
+        op.get_bind().execute(
+            sa.text(
+                "UPDATE products SET search_vector = "
+                "setweight(to_tsvector(CAST(:cfg AS regconfig), coalesce(name, '')), 'A') || "
+                "setweight(to_tsvector(CAST(:cfg AS regconfig), coalesce(description, '')), 'B')"
+            ),
+            {"cfg": current_app.config.get("SEARCH_TS_CONFIG", "simple")},
+        )
+        op.execute("CREATE INDEX ix_products_search_vector ON products USING GIN (search_vector)")
+    elif dialect == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE products_fts USING "
+            "fts5(name, description, tokenize = 'unicode61 remove_diacritics 2')"
+        )
+        op.execute(
+            "INSERT INTO products_fts (rowid, name, description) "
+            "SELECT id, coalesce(name, ''), coalesce(description, '') FROM products"
+        )
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_products_search_vector")
+        op.execute("ALTER TABLE products DROP COLUMN IF EXISTS search_vector")
+    elif dialect == 'sqlite':
+        op.execute("DROP TABLE IF EXISTS products_fts")
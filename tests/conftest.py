@@ -0,0 +1,101 @@
+import os
+import time
+import uuid
+
+import jwt
+import pytest
+
+from app import create_app
+from app.config import TestingConfig
+from app.models import BuyerProfile, Category, Product, SellerProfile, User
+from app.models.user import UserRole
+from app.utils.extensions import db
+
+
+JWT_SECRET = "test-secret-test-secret-test-secret"
+
+
+@pytest.fixture
+def app(tmp_path):
+    # Database file (bukan :memory:) supaya bisa dipakai beberapa thread;
+    # TEST_DATABASE_URL dipakai jika diisi, misalnya untuk Postgres
+    database_url = os.environ.get("TEST_DATABASE_URL")
+
+    class Config(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = database_url or f"sqlite:///{tmp_path / 'test.db'}"
+        # Thread di test konkurensi menunggu lock SQLite, bukan langsung gagal
+        SQLALCHEMY_ENGINE_OPTIONS = {} if database_url else {"connect_args": {"timeout": 30}}
+        SUPABASE_JWT_VERIFICATION = "local"
+        SUPABASE_JWT_SECRET = JWT_SECRET
+
+    app = create_app(Config)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def make_buyer(app):
+    def make(name="buyer"):
+        user = User(email=f"{name}@example.com", supabase_uid=uuid.uuid4(), role=UserRole.BUYER)
+        user.buyer_profile = BuyerProfile(username=name)
+        db.session.add(user)
+        db.session.commit()
+        return user
+
+    return make
+
+
+@pytest.fixture
+def make_seller(app):
+    def make(name="toko"):
+        user = User(email=f"{name}@example.com", supabase_uid=uuid.uuid4(), role=UserRole.SELLER)
+        user.seller_profile = SellerProfile(
+            shop_name=name, location_lat=-6.2, location_lng=106.8
+        )
+        db.session.add(user)
+        db.session.commit()
+        return user.seller_profile
+
+    return make
+
+
+@pytest.fixture
+def make_product(app):
+    category = Category(name="Sayur")
+    db.session.add(category)
+    db.session.commit()
+
+    def make(seller, name="Bayam", price=5000, stock=10):
+        product = Product(
+            name=name,
+            description=f"{name} segar",
+            price=price,
+            stock=stock,
+            category_id=category.id,
+            seller_id=seller.id,
+        )
+        db.session.add(product)
+        db.session.commit()
+        return product
+
+    return make
+
+
+@pytest.fixture
+def auth_headers():
+    def make(user):
+        token = jwt.encode(
+            {
+                "sub": str(user.supabase_uid),
+                "aud": "authenticated",
+                "exp": int(time.time()) + 3600,
+            },
+            JWT_SECRET,
+            "HS256",
+        )
+        return {"Authorization": f"Bearer {token}"}
+
+    return make
@@ -0,0 +1,89 @@
+import time
+import uuid
+from types import SimpleNamespace
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from app.utils import auth_middleware, token_verifier
+from app.utils.token_verifier import SupabaseTokenVerifier, UnknownSigningKeyError
+from tests.conftest import JWT_SECRET
+
+
+def make_token(audience="authenticated", expires_in=3600, sub=None):
+    return jwt.encode(
+        {
+            "sub": sub or str(uuid.uuid4()),
+            "aud": audience,
+            "exp": int(time.time()) + expires_in,
+        },
+        JWT_SECRET,
+        "HS256",
+    )
+
+
+def make_rs256_token(sub, kid="kunci-baru"):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    return jwt.encode(
+        {"sub": sub, "aud": "authenticated", "exp": int(time.time()) + 3600},
+        private_key,
+        "RS256",
+        headers={"kid": kid},
+    )
+
+
+def fake_supabase(get_user):
+    return SimpleNamespace(auth=SimpleNamespace(get_user=get_user))
+
+
+def test_valid_token_returns_claims():
+    sub = str(uuid.uuid4())
+    verifier = SupabaseTokenVerifier(jwks_url=None, jwt_secret=JWT_SECRET)
+
+    assert verifier.verify(make_token(sub=sub))["sub"] == sub
+
+
+def test_expired_token_is_rejected():
+    verifier = SupabaseTokenVerifier(jwks_url=None, jwt_secret=JWT_SECRET)
+
+    with pytest.raises(jwt.ExpiredSignatureError):
+        verifier.verify(make_token(expires_in=-60))
+
+
+def test_wrong_audience_is_rejected():
+    verifier = SupabaseTokenVerifier(jwks_url=None, jwt_secret=JWT_SECRET)
+
+    with pytest.raises(jwt.InvalidAudienceError):
+        verifier.verify(make_token(audience="anon"))
+
+
+def test_unknown_kid_falls_back_to_get_user(app, monkeypatch):
+    sub = str(uuid.uuid4())
+    token = make_rs256_token(sub)
+    calls = []
+
+    def get_user(jwt_token):
+        calls.append(jwt_token)
+        return SimpleNamespace(user=SimpleNamespace(id=sub))
+
+    verifier = SupabaseTokenVerifier(jwks_url=None, jwt_secret=JWT_SECRET)
+    monkeypatch.setattr(token_verifier, "_verifier", verifier)
+    monkeypatch.setattr(auth_middleware, "supabase_client", fake_supabase(get_user))
+
+    with pytest.raises(UnknownSigningKeyError):
+        verifier.verify(token)
+    assert auth_middleware.resolve_supabase_uid(token) == uuid.UUID(sub)
+    # Hanya kid yang tidak dikenal yang memanggil Supabase
+    assert calls == [token]
+
+
+def test_invalid_local_token_does_not_call_get_user(app, monkeypatch):
+    def get_user(jwt_token):
+        raise AssertionError("auth.get_user tidak boleh dipanggil")
+
+    verifier = SupabaseTokenVerifier(jwks_url=None, jwt_secret=JWT_SECRET)
+    monkeypatch.setattr(token_verifier, "_verifier", verifier)
+    monkeypatch.setattr(auth_middleware, "supabase_client", fake_supabase(get_user))
+
+    assert auth_middleware.resolve_supabase_uid(make_token(expires_in=-60)) is None
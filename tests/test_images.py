@@ -0,0 +1,92 @@
+import io
+import os
+
+import pytest
+from PIL import Image
+
+from app.models import Job, Product
+from app.services.job_service import JobService
+from app.utils.extensions import db
+
+
+@pytest.fixture
+def image_dirs(app, tmp_path, monkeypatch):
+    monkeypatch.setitem(app.config, "IMAGE_LOCAL_STORAGE_DIR", str(tmp_path / "media"))
+    monkeypatch.setitem(app.config, "IMAGE_SPOOL_DIR", str(tmp_path / "spool"))
+    return tmp_path
+
+
+def _png(color="green", size=(1600, 900)):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def _upload(client, product, data, headers):
+    return client.post(
+        f"/products/{product.id}/image",
+        data={"file": (io.BytesIO(data), "produk.png")},
+        headers=headers,
+        content_type="multipart/form-data",
+    )
+
+
+def test_upload_is_processed_in_background(
+    app, image_dirs, make_seller, make_product, auth_headers
+):
+    seller = make_seller()
+    product = make_product(seller)
+    client = app.test_client()
+
+    response = _upload(client, product, _png(), auth_headers(seller.user))
+
+    assert response.status_code == 202
+    assert response.get_json()["data"]["image_status"] == "pending"
+    assert JobService.process_due() == 1
+
+    db.session.expire_all()
+    product = db.session.get(Product, product.id)
+    assert product.image_status == "ready"
+    assert set(product.image_variants) == {"large", "medium", "thumb"}
+    assert product.image_url == product.image_variants["large"]
+    large = image_dirs / "media" / product.image_variants["large"].removeprefix("/media/")
+    with Image.open(large) as image:
+        assert image.format == "WEBP"
+        assert max(image.size) == 1200
+    # File upload sementara dihapus setelah diproses
+    assert os.listdir(image_dirs / "spool") == []
+
+
+def test_same_content_reuses_processed_variants(
+    app, image_dirs, make_seller, make_product, auth_headers
+):
+    seller = make_seller()
+    first = make_product(seller, name="Bayam")
+    second = make_product(seller, name="Kangkung")
+    client = app.test_client()
+    headers = auth_headers(seller.user)
+    data = _png()
+
+    _upload(client, first, data, headers)
+    JobService.process_due()
+    response = _upload(client, second, data, headers)
+
+    assert response.status_code == 200
+    body = response.get_json()["data"]
+    assert body["image_status"] == "ready"
+    assert body["image_variants"] == db.session.get(Product, first.id).image_variants
+    # Tidak ada job baru untuk konten yang sama
+    assert Job.query.count() == 1
+
+
+def test_non_image_upload_is_rejected(
+    app, image_dirs, make_seller, make_product, auth_headers
+):
+    seller = make_seller()
+    product = make_product(seller)
+
+    response = _upload(app.test_client(), product, b"bukan gambar", auth_headers(seller.user))
+
+    assert response.status_code == 400
+    assert Job.query.count() == 0
+    assert db.session.get(Product, product.id).image_status is None
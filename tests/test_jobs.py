@@ -0,0 +1,146 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select
+
+from app.models import Job
+from app.services.job_service import RETRY_BASE_SECONDS, JobService
+from app.utils import chrono
+from app.utils.extensions import db
+
+
+class Clock:
+    def __init__(self):
+        self.current = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    def now(self):
+        return self.current
+
+    def advance(self, seconds):
+        self.current += timedelta(seconds=seconds)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(chrono, "now", clock.now)
+    return clock
+
+
+@pytest.fixture
+def calls(app, monkeypatch):
+    # Registry job terpisah per test
+    monkeypatch.setattr(JobService, "_jobs", dict(JobService._jobs))
+    calls = []
+
+    @JobService.job("test.record", timeout_seconds=60)
+    def record(label):
+        calls.append(label)
+
+    @JobService.job("test.fail", max_attempts=3)
+    def fail(label):
+        calls.append(label)
+        raise RuntimeError("gagal")
+
+    return calls
+
+
+def _job(job_id):
+    db.session.expire_all()
+    return db.session.get(Job, job_id)
+
+
+def test_due_jobs_run_highest_priority_first(app, clock, calls):
+    JobService.enqueue("test.record", {"label": "rendah"}, priority=0)
+    JobService.enqueue("test.record", {"label": "tinggi"}, priority=10)
+    JobService.enqueue("test.record", {"label": "nanti"}, priority=20, delay_seconds=30)
+    JobService.enqueue("test.record", {"label": "sedang"}, priority=5)
+
+    assert JobService.process_due(limit=10) == 3
+    assert calls == ["tinggi", "sedang", "rendah"]
+
+    clock.advance(30)
+    assert JobService.process_due() == 1
+    assert calls[-1] == "nanti"
+    assert Job.query.filter_by(status="done").count() == 4
+
+
+def test_claim_skips_jobs_taken_by_another_worker(app, clock, calls, monkeypatch):
+    ids = [JobService.enqueue("test.record", {"label": str(i)}).id for i in range(3)]
+
+    first = JobService.claim("worker-a", limit=2)
+    assert [job["id"] for job in first] == ids[:2]
+
+    # Seolah SELECT worker B terjadi sebelum UPDATE worker A: semua job
+    # terlihat, tapi UPDATE bersyarat hanya mengambil yang masih queued
+    monkeypatch.setattr(
+        JobService,
+        "_due_query",
+        staticmethod(lambda now, limit: select(Job.id, Job.timeout_seconds).order_by(Job.id)),
+    )
+    second = JobService.claim("worker-b", limit=3)
+
+    assert [job["id"] for job in second] == ids[2:]
+    assert [_job(job_id).locked_by for job_id in ids] == ["worker-a", "worker-a", "worker-b"]
+    assert all(_job(job_id).attempts == 1 for job_id in ids)
+
+
+def test_expired_job_is_reclaimed_and_stale_result_discarded(app, clock, calls):
+    job_id = JobService.enqueue("test.record", {"label": "gambar"}).id
+    [stale] = JobService.claim("worker-a")
+
+    # Masih dalam visibility timeout: tidak bisa diambil worker lain
+    clock.advance(59)
+    assert JobService.claim("worker-b") == []
+
+    clock.advance(2)
+    [fresh] = JobService.claim("worker-b")
+    assert fresh["id"] == job_id
+    assert fresh["attempts"] == 2
+    assert _job(job_id).last_error == "Melewati batas waktu proses"
+
+    # Worker A selesai terlambat: hasilnya dibuang, job tetap milik B
+    assert JobService.run(stale, "worker-a") is False
+    job = _job(job_id)
+    assert (job.status, job.locked_by) == ("running", "worker-b")
+
+    assert JobService.run(fresh, "worker-b") is True
+    assert _job(job_id).status == "done"
+
+
+def test_failed_job_retries_with_backoff_then_fails(app, clock, calls):
+    job_id = JobService.enqueue("test.fail", {"label": "kirim"}).id
+
+    for attempt in (1, 2):
+        assert JobService.process_due() == 1
+        job = _job(job_id)
+        assert (job.status, job.attempts, job.last_error) == ("queued", attempt, "gagal")
+        # SQLite mengembalikan datetime naive
+        delay = (job.run_at.replace(tzinfo=None) - clock.now().replace(tzinfo=None)).total_seconds()
+        base = RETRY_BASE_SECONDS * 2 ** (attempt - 1)
+        assert base * 0.8 <= delay <= base * 1.2
+        # Belum jatuh tempo selama backoff
+        assert JobService.process_due() == 0
+        clock.advance(delay)
+
+    assert JobService.process_due() == 1
+    job = _job(job_id)
+    assert (job.status, job.attempts) == ("failed", 3)
+    assert job.finished_at is not None
+    assert calls == ["kirim"] * 3
+
+    clock.advance(3600)
+    assert JobService.process_due() == 0
+
+
+def test_expired_job_out_of_attempts_is_failed(app, clock, calls):
+    job = JobService.enqueue("test.record", {"label": "macet"})
+    job.max_attempts = 1
+    db.session.commit()
+    job_id = job.id
+    JobService.claim("worker-a")
+
+    clock.advance(61)
+    assert JobService.claim("worker-b") == []
+    job = _job(job_id)
+    assert (job.status, job.attempts, job.locked_by) == ("failed", 1, None)
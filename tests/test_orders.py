@@ -0,0 +1,135 @@
+from contextlib import contextmanager
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event
+
+from app.models import Order, OrderItem, Product
+from app.services.cart_service import CartService
+from app.services.order_service import OrderService
+from app.services.reservation_service import InsufficientStockError
+from app.services.wallet_service import InsufficientBalanceError, WalletService
+from app.utils.extensions import db
+
+ORDERS = 12
+ITEMS_PER_ORDER = 3
+
+
+@contextmanager
+def count_queries():
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.mark.parametrize("limit", [3, 100])
+def test_buyer_order_history_query_count_is_constant(
+    app, make_buyer, make_seller, make_product, limit
+):
+    buyer_id = make_buyer().id
+    seller = make_seller()
+    products = [make_product(seller, name=f"Sayur {index}") for index in range(ITEMS_PER_ORDER)]
+    for _ in range(ORDERS):
+        order = Order(
+            buyer_id=buyer_id,
+            seller_id=seller.id,
+            total_price=sum(product.price for product in products),
+            status="pending",
+            payment_method="cod",
+        )
+        for product in products:
+            order.order_items.append(
+                OrderItem(product_id=product.id, quantity=1, price=product.price)
+            )
+        db.session.add(order)
+    db.session.commit()
+
+    with count_queries() as statements:
+        page = OrderService.get_buyer_orders(buyer_id, limit=limit)
+
+    # Satu query untuk halaman order, satu untuk item + produknya
+    assert len(statements) == 2
+    assert len(page["items"]) == min(limit, ORDERS)
+    assert all(len(order.items) == ITEMS_PER_ORDER for order in page["items"])
+    assert all(item.product_name for order in page["items"] for item in order.items)
+
+
+def test_checkout_splits_cart_into_one_order_per_seller(
+    app, make_buyer, make_seller, make_product
+):
+    buyer_id = make_buyer().id
+    budi, sari = make_seller("budi"), make_seller("sari")
+    bayam = make_product(budi, name="Bayam", price=5000, stock=10)
+    kangkung = make_product(budi, name="Kangkung", price=3500.5, stock=10)
+    tomat = make_product(sari, name="Tomat", price=12000, stock=10)
+    CartService.add_items(buyer_id, [(bayam.id, 2), (kangkung.id, 1), (tomat.id, 3)])
+
+    orders = OrderService.checkout(buyer_id)
+
+    assert [order.seller_id for order in orders] == sorted([budi.id, sari.id])
+    totals = {order.seller_id: order.total_price for order in orders}
+    assert totals == {budi.id: Decimal("13500.50"), sari.id: Decimal("36000.00")}
+    assert all(order.status == "pending" and not order.is_paid for order in orders)
+    assert CartService.get_cart(buyer_id).item_count == 0
+    db.session.expire_all()
+    assert [db.session.get(Product, p.id).stock for p in (bayam, kangkung, tomat)] == [8, 9, 7]
+
+
+def test_checkout_with_insufficient_stock_changes_nothing(
+    app, make_buyer, make_seller, make_product
+):
+    buyer_id = make_buyer().id
+    bayam = make_product(make_seller("budi"), name="Bayam", stock=10)
+    tomat = make_product(make_seller("sari"), name="Tomat", stock=10)
+    CartService.add_items(buyer_id, [(bayam.id, 2), (tomat.id, 3)])
+    # Stok habis setelah masuk keranjang
+    tomat.stock = 1
+    db.session.commit()
+
+    with pytest.raises(InsufficientStockError) as error:
+        OrderService.checkout(buyer_id)
+
+    assert error.value.product_ids == [tomat.id]
+    db.session.expire_all()
+    # Stok produk lain tidak ikut berkurang, order tidak dibuat, keranjang utuh
+    assert db.session.get(Product, bayam.id).stock == 10
+    assert Order.query.count() == 0
+    assert CartService.get_cart(buyer_id).item_count == 2
+
+
+def test_wallet_checkout_pays_orders_from_wallet(app, make_buyer, make_seller, make_product):
+    buyer_id = make_buyer().id
+    bayam = make_product(make_seller("budi"), name="Bayam", price=5000)
+    tomat = make_product(make_seller("sari"), name="Tomat", price=12000)
+    WalletService.apply(buyer_id, "topup", 50000)
+    CartService.add_items(buyer_id, [(bayam.id, 2), (tomat.id, 1)])
+
+    orders = OrderService.checkout(buyer_id, payment_method="wallet")
+
+    assert all(order.status == "paid" and order.is_paid for order in orders)
+    assert WalletService.get_wallet(buyer_id).balance == Decimal("28000.00")
+    assert WalletService.audit(buyer_id)["ok"]
+
+
+def test_wallet_checkout_with_insufficient_balance_changes_nothing(
+    app, make_buyer, make_seller, make_product
+):
+    buyer_id = make_buyer().id
+    bayam = make_product(make_seller(), name="Bayam", price=5000, stock=10)
+    WalletService.apply(buyer_id, "topup", 1000)
+    CartService.add_items(buyer_id, [(bayam.id, 2)])
+
+    with pytest.raises(InsufficientBalanceError):
+        OrderService.checkout(buyer_id, payment_method="wallet")
+
+    db.session.expire_all()
+    assert db.session.get(Product, bayam.id).stock == 10
+    assert Order.query.count() == 0
+    assert WalletService.get_wallet(buyer_id).balance == Decimal("1000.00")
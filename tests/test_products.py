@@ -0,0 +1,37 @@
+import pytest
+
+from app.models import Category
+from app.schemas.product_schema import ProductUpdate
+from app.services.product_service import ProductService
+from app.utils.extensions import db
+
+
+def test_update_product_moves_category_counts(app, make_seller, make_product):
+    product = make_product(make_seller())
+    old_category = db.session.get(Category, product.category_id)
+    old_category.product_count = 1
+    new_category = Category(name="Buah")
+    db.session.add(new_category)
+    db.session.commit()
+
+    ProductService.update_product(product.id, ProductUpdate(category_id=new_category.id))
+
+    db.session.expire_all()
+    assert (old_category.product_count, new_category.product_count) == (0, 1)
+
+
+def test_update_product_rejects_unknown_category(app, make_seller, make_product):
+    product = make_product(make_seller(), name="Bayam")
+    category = db.session.get(Category, product.category_id)
+    category.product_count = 1
+    db.session.commit()
+
+    with pytest.raises(ValueError, match="tidak ditemukan"):
+        ProductService.update_product(
+            product.id, ProductUpdate(name="Kangkung", category_id=999)
+        )
+
+    db.session.expire_all()
+    assert category.product_count == 1
+    assert product.category_id == category.id
+    assert product.name == "Bayam"
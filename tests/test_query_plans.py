@@ -0,0 +1,49 @@
+import pytest
+from sqlalchemy import event
+
+from app.models import Order, OrderItem
+from app.services.order_service import OrderService
+from app.utils.extensions import db
+from app.utils.query_plans import HOT_QUERIES, check_statement, explain
+
+
+@pytest.mark.parametrize("name", list(HOT_QUERIES))
+def test_hot_query_uses_index(app, name):
+    check = check_statement(name, HOT_QUERIES[name]())
+    assert check.ok, "\n".join(check.plan)
+
+
+def test_order_history_queries_use_index(app, make_buyer, make_seller, make_product):
+    buyer = make_buyer()
+    seller = make_seller()
+    product = make_product(seller)
+    order = Order(
+        buyer_id=buyer.id,
+        seller_id=seller.id,
+        total_price=5000,
+        status="pending",
+        payment_method="cod",
+    )
+    order.order_items.append(OrderItem(product_id=product.id, quantity=1, price=5000))
+    db.session.add(order)
+    db.session.commit()
+    buyer_id = buyer.id
+
+    # Statement yang benar-benar dijalankan service, termasuk query item
+    # dari selectinload, di-EXPLAIN dengan parameternya
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(db.engine, "before_cursor_execute", capture)
+    try:
+        page = OrderService.get_buyer_orders(buyer_id)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", capture)
+
+    assert len(page["items"]) == 1
+    assert len(statements) == 2
+    for statement, parameters in statements:
+        plan, seq_scans = explain(statement, parameters)
+        assert not seq_scans, "\n".join(plan)
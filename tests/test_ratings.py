@@ -0,0 +1,80 @@
+import pytest
+
+from app.models import Order, OrderItem, Rating
+from app.schemas.rating_schema import RatingCreate, RatingUpdate
+from app.services.rating_service import RatingService
+from app.utils.extensions import db
+
+
+def _order(buyer, seller, product):
+    order = Order(
+        buyer_id=buyer.id,
+        seller_id=seller.id,
+        total_price=product.price,
+        status="done",
+        payment_method="cod",
+    )
+    order.order_items.append(OrderItem(product_id=product.id, quantity=1, price=product.price))
+    db.session.add(order)
+    db.session.commit()
+    return order
+
+
+def test_second_rating_for_same_product_is_rejected(app, make_buyer, make_seller, make_product):
+    buyer = make_buyer()
+    product = make_product(make_seller())
+    RatingService.create_rating(buyer.id, RatingCreate(product_id=product.id, rating=5))
+
+    with pytest.raises(ValueError, match="sudah memberi rating"):
+        RatingService.create_rating(buyer.id, RatingCreate(product_id=product.id, rating=1))
+
+    db.session.expire_all()
+    assert product.rating_count == 1
+    assert product.rating_avg == 5
+
+
+def test_rating_order_must_belong_to_buyer_and_contain_product(
+    app, make_buyer, make_seller, make_product
+):
+    buyer = make_buyer("budi")
+    other = make_buyer("sari")
+    seller = make_seller()
+    product = make_product(seller)
+    other_product = make_product(seller, name="Kangkung")
+    order = _order(buyer, seller, product)
+
+    with pytest.raises(ValueError, match="tidak ditemukan"):
+        RatingService.create_rating(
+            other.id, RatingCreate(product_id=product.id, order_id=order.id, rating=4)
+        )
+    with pytest.raises(ValueError, match="tidak ditemukan"):
+        RatingService.create_rating(
+            buyer.id, RatingCreate(product_id=other_product.id, order_id=order.id, rating=4)
+        )
+
+    rating = RatingService.create_rating(
+        buyer.id, RatingCreate(product_id=product.id, order_id=order.id, rating=4)
+    )
+    assert rating.order_id == order.id
+
+
+def test_legacy_ratings_outside_stars_do_not_skew_aggregates(
+    app, make_buyer, make_seller, make_product
+):
+    product = make_product(make_seller())
+    buyer = make_buyer("budi")
+    RatingService.create_rating(buyer.id, RatingCreate(product_id=product.id, rating=5))
+    # Data lama sebelum validasi 1-5: tidak pernah dihitung di agregat
+    empty = Rating(product_id=product.id, buyer_id=make_buyer("sari").id, rating=None)
+    invalid = Rating(product_id=product.id, buyer_id=make_buyer("dewi").id, rating=9)
+    db.session.add_all([empty, invalid])
+    db.session.commit()
+
+    RatingService.update_rating(empty.id, RatingUpdate(rating=3))
+    assert RatingService.delete_rating(invalid.id)
+
+    db.session.expire_all()
+    assert product.rating_count == 2
+    assert product.rating_sum == 8
+    assert product.rating_avg == 4
+    assert (product.rating_3, product.rating_5) == (1, 1)
@@ -0,0 +1,122 @@
+import threading
+import time
+
+import pytest
+from sqlalchemy import func, select
+
+from app.models import Product, StockReservation
+from app.services.reservation_service import (
+    HoldExpiredError,
+    InsufficientStockError,
+    ReservationService,
+)
+from app.utils.extensions import db
+from app.utils.response_cache import response_cache
+
+THREADS = 16
+ATTEMPTS_PER_THREAD = 10
+
+
+def test_concurrent_holds_never_oversell(app, make_seller, make_product, record_property):
+    product = make_product(make_seller(), stock=50)
+    product_id = product.id
+    results = {"held": 0, "rejected": 0}
+    lock = threading.Lock()
+
+    def buy():
+        with app.app_context():
+            for _ in range(ATTEMPTS_PER_THREAD):
+                try:
+                    ReservationService.hold([(product_id, 1)])
+                    outcome = "held"
+                except InsufficientStockError:
+                    outcome = "rejected"
+                with lock:
+                    results[outcome] += 1
+            db.session.remove()
+
+    threads = [threading.Thread(target=buy) for _ in range(THREADS)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    db.session.expire_all()
+    held = db.session.scalar(
+        select(func.sum(StockReservation.quantity)).where(
+            StockReservation.product_id == product_id
+        )
+    )
+    assert results == {"held": 50, "rejected": THREADS * ATTEMPTS_PER_THREAD - 50}
+    assert held == 50
+    assert db.session.get(Product, product_id).stock == 0
+    record_property("holds_per_second", round(THREADS * ATTEMPTS_PER_THREAD / elapsed))
+
+
+def test_confirm_expired_hold_raises(app, make_seller, make_product):
+    product = make_product(make_seller(), stock=5)
+    hold = ReservationService.hold([(product.id, 2)], hold_seconds=-1)
+
+    with pytest.raises(HoldExpiredError):
+        ReservationService.confirm(hold["reference"])
+
+    assert ReservationService.sweep_expired() == 1
+    assert db.session.get(Product, product.id).stock == 5
+
+
+def test_checkout_confirms_cart_hold(app, make_buyer, make_seller, make_product, auth_headers):
+    buyer = make_buyer()
+    product = make_product(make_seller(), stock=5)
+    client = app.test_client()
+    headers = auth_headers(buyer)
+
+    client.post("/cart/items", json={"product_id": product.id, "quantity": 2}, headers=headers)
+    response = client.post("/cart/hold", headers=headers)
+    assert response.status_code == 201
+    reference = response.get_json()["data"]["reference"]
+    assert db.session.get(Product, product.id).stock == 3
+
+    response = client.post("/orders", json={"hold_reference": reference}, headers=headers)
+    assert response.status_code == 201
+    db.session.expire_all()
+    # Stok dikurangi sekali saat hold, tidak lagi saat checkout
+    assert db.session.get(Product, product.id).stock == 3
+    assert client.delete(f"/cart/hold/{reference}", headers=headers).status_code == 404
+
+
+def test_checkout_with_expired_hold_fails(
+    app, make_buyer, make_seller, make_product, auth_headers
+):
+    buyer = make_buyer()
+    product = make_product(make_seller(), stock=5)
+    client = app.test_client()
+    headers = auth_headers(buyer)
+    client.post("/cart/items", json={"product_id": product.id, "quantity": 2}, headers=headers)
+    hold = ReservationService.hold([(product.id, 2)], buyer_id=buyer.id, hold_seconds=-1)
+
+    response = client.post("/orders", json={"hold_reference": hold["reference"]}, headers=headers)
+
+    assert response.status_code == 400
+    assert "kedaluwarsa" in response.get_json()["message"]
+    assert client.get("/cart", headers=headers).get_json()["data"]["item_count"] == 1
+
+
+def test_releasing_holds_invalidates_cached_product(app, make_seller, make_product):
+    response_cache.clear()
+    product = make_product(make_seller(), stock=5)
+    client = app.test_client()
+
+    def cached_stock():
+        return client.get(f"/products/{product.id}").get_json()["data"]["stock"]
+
+    hold = ReservationService.hold([(product.id, 2)])
+    assert cached_stock() == 3
+    ReservationService.release(hold["reference"])
+    assert cached_stock() == 5
+
+    ReservationService.hold([(product.id, 4)], hold_seconds=-1)
+    assert cached_stock() == 1
+    assert ReservationService.sweep_expired() == 1
+    assert cached_stock() == 5
@@ -0,0 +1,84 @@
+from decimal import Decimal
+
+from sqlalchemy import select
+
+from app.models import SellerDailySales, SellerProductDailySales
+from app.services.cart_service import CartService
+from app.services.order_service import OrderService
+from app.services.sales_service import SalesService
+from app.services.wallet_service import WalletService
+from app.utils import chrono
+from app.utils.extensions import db
+
+
+def _checkout(buyer_id, items, payment_method="cod"):
+    CartService.add_items(buyer_id, items)
+    return OrderService.checkout(buyer_id, payment_method=payment_method)
+
+
+def _rollups():
+    seller_days = db.session.execute(
+        select(
+            SellerDailySales.seller_id,
+            SellerDailySales.day,
+            SellerDailySales.order_count,
+            SellerDailySales.units_sold,
+            SellerDailySales.revenue,
+        ).order_by(SellerDailySales.seller_id, SellerDailySales.day)
+    ).all()
+    product_days = db.session.execute(
+        select(
+            SellerProductDailySales.seller_id,
+            SellerProductDailySales.day,
+            SellerProductDailySales.product_id,
+            SellerProductDailySales.units_sold,
+            SellerProductDailySales.revenue,
+        ).order_by(SellerProductDailySales.seller_id, SellerProductDailySales.product_id)
+    ).all()
+    return [tuple(row) for row in seller_days], [tuple(row) for row in product_days]
+
+
+def test_each_order_is_recorded_once(app, make_buyer, make_seller, make_product):
+    buyer_id = make_buyer().id
+    seller = make_seller()
+    product = make_product(seller, price=5000, stock=10)
+    [order] = _checkout(buyer_id, [(product.id, 3)])
+
+    # Order pending belum masuk rollup
+    assert SalesService.record_orders([order.id]) == 0
+    OrderService.update_status(order.id, seller.id, "paid")
+    assert SalesService.record_orders([order.id]) == 0
+    OrderService.update_status(order.id, seller.id, "shipped")
+    OrderService.update_status(order.id, seller.id, "done")
+
+    now = chrono.now()
+    [today] = SalesService.get_daily_sales(seller.id, now.date(), now.date())
+    assert (today.order_count, today.units_sold, today.revenue) == (1, 3, 15000)
+    [product_sales] = SalesService.get_product_sales(seller.id, now.date(), now.date())
+    assert (product_sales.product_id, product_sales.units_sold) == (product.id, 3)
+
+
+def test_rebuild_matches_live_rollups(app, make_buyer, make_seller, make_product):
+    buyer_id = make_buyer().id
+    budi, sari = make_seller("budi"), make_seller("sari")
+    bayam = make_product(budi, name="Bayam", price=5000, stock=20)
+    kangkung = make_product(budi, name="Kangkung", price=3500.5, stock=20)
+    tomat = make_product(sari, name="Tomat", price=12000, stock=20)
+
+    for order in _checkout(buyer_id, [(bayam.id, 2), (tomat.id, 1)]):
+        OrderService.update_status(order.id, order.seller_id, "paid")
+    _checkout(buyer_id, [(kangkung.id, 4)])
+    WalletService.apply(buyer_id, "topup", 100000)
+    _checkout(buyer_id, [(bayam.id, 1), (kangkung.id, 1), (tomat.id, 2)], "wallet")
+
+    live = _rollups()
+    assert SalesService.rebuild(batch_size=1) == 2
+    db.session.expire_all()
+
+    assert _rollups() == live
+    seller_days, _ = live
+    # Order pending (kangkung x4) tidak dihitung
+    assert {row[0]: row[2:] for row in seller_days} == {
+        budi.id: (2, 4, Decimal("18500.50")),
+        sari.id: (2, 3, Decimal("36000.00")),
+    }
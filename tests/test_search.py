@@ -0,0 +1,44 @@
+from app.models import Category
+from app.schemas.product_schema import ProductCreate, ProductUpdate
+from app.services.product_service import ProductService
+from app.services.search_service import SearchService
+from app.utils.extensions import db
+
+
+def test_search_index_follows_product_writes(app, make_seller):
+    # Database dibuat dengan db.create_all(), tanpa migrasi
+    seller = make_seller()
+    category = Category(name="Sayur")
+    db.session.add(category)
+    db.session.commit()
+
+    product = ProductService.create_product(
+        ProductCreate(
+            name="Bayam Hijau",
+            description="Dipetik pagi hari",
+            price=5000,
+            stock=10,
+            category_id=category.id,
+            seller_id=seller.id,
+        )
+    )
+    ProductService.create_product(
+        ProductCreate(
+            name="Tomat Merah",
+            description="Cocok untuk sambal bayam",
+            price=8000,
+            stock=10,
+            category_id=category.id,
+            seller_id=seller.id,
+        )
+    )
+
+    result = SearchService.search_products("bayam")
+    # Kecocokan pada nama lebih relevan daripada pada deskripsi
+    assert [row.name for row in result["items"]] == ["Bayam Hijau", "Tomat Merah"]
+
+    ProductService.update_product(product.id, ProductUpdate(name="Kangkung"))
+    assert [row.name for row in SearchService.search_products("bayam")["items"]] == [
+        "Tomat Merah"
+    ]
+    assert SearchService.search_products("kangk")["items"][0].id == product.id
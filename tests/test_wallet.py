@@ -0,0 +1,130 @@
+import threading
+import time
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from app.models import Wallet, WalletTransaction
+from app.services.wallet_service import (
+    InsufficientBalanceError,
+    WalletConflictError,
+    WalletService,
+)
+from app.utils import chrono
+from app.utils.extensions import db
+
+THREADS = 16
+OPERATIONS_PER_THREAD = 30
+
+
+def test_concurrent_ledger_updates_are_not_lost(app, make_buyer, record_property):
+    user_id = make_buyer().id
+    WalletService.apply(user_id, "topup", 100)
+    started_at = chrono.now()
+    results = {"ok": 0, "insufficient": 0, "busy": 0}
+    errors = []
+    lock = threading.Lock()
+
+    def worker(index):
+        with app.app_context():
+            for step in range(OPERATIONS_PER_THREAD):
+                try:
+                    if (index + step) % 3 == 0:
+                        WalletService.apply(user_id, "payment", 7)
+                    else:
+                        WalletService.apply(user_id, "topup", 5)
+                    outcome = "ok"
+                except InsufficientBalanceError:
+                    outcome = "insufficient"
+                except WalletConflictError:
+                    # Batas percobaan ulang habis: ditolak utuh, klien boleh mengulang
+                    outcome = "busy"
+                except Exception as e:
+                    with lock:
+                        errors.append(repr(e))
+                    continue
+                with lock:
+                    results[outcome] += 1
+            db.session.remove()
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(THREADS)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    assert errors == []
+    db.session.expire_all()
+    wallet = Wallet.query.filter_by(user_id=user_id).one()
+    transactions = WalletTransaction.query.filter_by(wallet_id=wallet.id).all()
+    expected = sum(
+        (
+            Decimal(transaction.amount)
+            if transaction.transaction_type == "topup"
+            else -Decimal(transaction.amount)
+            for transaction in transactions
+        ),
+        Decimal("0"),
+    )
+
+    # Setiap perubahan saldo tercatat tepat satu kali di ledger
+    assert len(transactions) == 1 + results["ok"]
+    assert wallet.version == len(transactions)
+    assert wallet.balance == expected
+    assert WalletService.audit(user_id)["ok"]
+    assert WalletService.balance_at(wallet.id, started_at) == Decimal("100.00")
+    record_property("operations_per_second", round(results["ok"] / elapsed))
+
+
+def test_transaction_history_pages_by_cursor_with_type_filter(app, make_buyer):
+    user_id = make_buyer().id
+    for step in range(9):
+        WalletService.apply(user_id, "payment" if step % 3 == 2 else "topup", 10 + step)
+
+    def collect(**filters):
+        pages, cursor = [], None
+        while True:
+            page = WalletService.get_transactions(user_id, limit=2, cursor=cursor, **filters)
+            pages.append([transaction.id for transaction in page["items"]])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                return pages
+
+    transactions = WalletTransaction.query.order_by(WalletTransaction.id.desc()).all()
+    topups = [t.id for t in transactions if t.transaction_type == "topup"]
+
+    pages = collect(transaction_type="topup")
+    assert [len(page) for page in pages] == [2, 2, 2]
+    assert sum(pages, []) == topups
+    assert sum(collect(), []) == [transaction.id for transaction in transactions]
+    assert sum(collect(transaction_type="payment"), []) == [
+        t.id for t in transactions if t.transaction_type == "payment"
+    ]
+    with pytest.raises(ValueError):
+        WalletService.get_transactions(user_id, transaction_type="hadiah")
+
+
+def test_statement_opening_and_closing_balances(app, make_buyer, monkeypatch):
+    user_id = make_buyer().id
+
+    def apply_at(moment, transaction_type, amount):
+        monkeypatch.setattr(chrono, "now", lambda: moment)
+        WalletService.apply(user_id, transaction_type, amount)
+
+    apply_at(datetime(2026, 1, 15, tzinfo=timezone.utc), "topup", 100)
+    apply_at(datetime(2026, 2, 10, tzinfo=timezone.utc), "topup", 50)
+    apply_at(datetime(2026, 2, 20, tzinfo=timezone.utc), "payment", 30)
+    apply_at(datetime(2026, 3, 5, tzinfo=timezone.utc), "payment", 20)
+
+    statement = WalletService.get_statement(user_id, date(2026, 2, 1), date(2026, 2, 1))
+    assert (statement.opening_balance, statement.closing_balance) == (100, 120)
+    [february] = statement.months
+    assert (february.credit, february.debit) == (50, 30)
+    assert february.by_type["payment"].transaction_count == 1
+
+    statement = WalletService.get_statement(user_id, date(2026, 1, 1), date(2026, 3, 1))
+    assert (statement.opening_balance, statement.closing_balance) == (0, 100)
+    assert [month.credit - month.debit for month in statement.months] == [100, 20, -20]